@@ -0,0 +1,220 @@
+"""
+Benchmark solverów na labiryntach o różnych rozmiarach i topologiach.
+
+Przykład użycia:
+    python benchmarks/bench_solvers.py --sizes 50 250 1000 --output wyniki.json
+    python benchmarks/bench_solvers.py --sizes 50 250 --compare wyniki.json
+    python benchmarks/bench_solvers.py --large --solvers astar dial jps hpa
+
+Każdy pomiar uruchamia solver bez GUI (solve()) na labiryncie wygenerowanym
+z podanego ziarna, więc wyniki są powtarzalne między uruchomieniami.
+Domyślny zestaw kończy się w kilka minut: siatki 4000x4000 dochodzą tylko z opcją
+--large, a wolne solvery (SLOW_SOLVERS) bez jawnego --solvers mierzone są tylko
+na siatkach do podanego tam rozmiaru.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Dodajemy ścieżkę źródłową do PYTHONPATH
+src_dir = Path(__file__).parent.parent / "src"
+if str(src_dir) not in sys.path:
+    sys.path.append(str(src_dir))
+
+from maze import Maze, STORAGES
+from generators import GENERATORS, generate
+from headless import SOLVERS
+
+DEFAULT_SIZES = [50, 250, 1000]
+# Rozmiary dołączane opcją --large (pojedynczy pomiar wolnego solvera trwa na nich wiele minut)
+LARGE_SIZES = [4000]
+# Solvery, których czas rośnie najszybciej z rozmiarem siatki, z największym rozmiarem w domyślnym zestawie
+SLOW_SOLVERS = {"lpastar": 250, "random_walk": 250, "monte_carlo": 50}
+DEFAULT_DENSITIES = [0.1, 0.3]
+# Random Walk nie ma gwarancji zakończenia - ograniczamy liczbę kroków (wielokrotność liczby pól)
+RANDOM_WALK_STEP_FACTOR = 10
+
+
+def open_field(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Pusta siatka bez ścian"""
+    return np.zeros((size, size), dtype=bool)
+
+
+def random_obstacles(size: int, rng: np.random.Generator, density: float) -> np.ndarray:
+    """Losowe ściany z podanym prawdopodobieństwem"""
+    return rng.random((size, size)) < density
+
+
+def spiral(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Koncentryczne pierścienie ścian z przejściami na przemian po przeciwnych stronach"""
+    walls = np.zeros((size, size), dtype=bool)
+    for ring, k in enumerate(range(1, size // 2, 2)):
+        low, high = k, size - 1 - k
+        if high - low < 2:
+            break
+        walls[low, low:high + 1] = True
+        walls[high, low:high + 1] = True
+        walls[low:high + 1, low] = True
+        walls[low:high + 1, high] = True
+        # Przejście raz przy lewym górnym, raz przy prawym dolnym rogu
+        if ring % 2 == 0:
+            walls[low, low + 1] = False
+        else:
+            walls[high, high - 1] = False
+    return walls
+
+
+def build_maze(topology: str, size: int, seed: int, storage: str = "uint8") -> Maze:
+    """
+    Buduje labirynt o zadanej topologii z ziarna
+    :param topology: open, perfect (= backtracker), spiral, random_<gęstość>
+                     lub nazwa generatora labiryntu doskonałego (prim, kruskal, ellers)
+    """
+    if topology == "perfect":
+        topology = "backtracker"
+    if topology in GENERATORS and topology != "noise":
+        return generate(Maze(size, size, storage), topology, seed)
+
+    rng = np.random.default_rng(seed)
+    if topology == "open":
+        walls = open_field(size, rng)
+    elif topology == "spiral":
+        walls = spiral(size, rng)
+    elif topology.startswith("random_"):
+        walls = random_obstacles(size, rng, float(topology.split("_", 1)[1]))
+    else:
+        raise ValueError(f"Nieznana topologia: {topology}")
+
+    # Start w rogu, cel w przeciwnym rogu (dla spirali - w środku)
+    start = (0, 0)
+    end = (size // 2, size // 2) if topology == "spiral" else (size - 1, size - 1)
+    walls[start[1], start[0]] = False
+    walls[end[1], end[0]] = False
+    if topology.startswith("random_"):
+        # Otoczenie startu i celu bez ścian, żeby nie były odcięte już na starcie
+        for x, y in (start, end):
+            walls[max(0, y - 1):y + 2, max(0, x - 1):x + 2] = False
+
+    maze = Maze(size, size, storage)
+    maze.grid[:] = walls
+    maze.refresh()
+    maze.set_start(*start)
+    maze.set_end(*end)
+    return maze
+
+
+def run_case(algorithm: str, maze: Maze, measure_memory: bool) -> Dict:
+    """Uruchamia jeden pomiar i zwraca słownik z wynikami"""
+    max_steps = None
+    if algorithm == "random_walk":
+        max_steps = RANDOM_WALK_STEP_FACTOR * maze.width * maze.height
+
+    solver = SOLVERS[algorithm](maze)
+    started = time.perf_counter()
+    result = solver.solve(max_steps)
+    elapsed = time.perf_counter() - started
+
+    peak_memory = None
+    if measure_memory:
+        # Osobne uruchomienie - tracemalloc spowalnia alokacje i zafałszowałby czas
+        solver = SOLVERS[algorithm](maze)
+        tracemalloc.start()
+        solver.solve(max_steps)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "time": elapsed,
+        "expanded": result.expanded,
+        "nodes_per_sec": result.expanded / elapsed if elapsed > 0 else None,
+        "peak_memory": peak_memory,
+        "path_length": len(result.path),
+        "solved": result.solved,
+    }
+
+
+def case_key(record: Dict) -> Tuple:
+    """Klucz identyfikujący pomiar (do porównywania uruchomień)"""
+    return record["solver"], record["topology"], record["size"], record["seed"]
+
+
+def compare(results: List[Dict], baseline_path: str):
+    """Wypisuje stosunek czasów względem wcześniejszego uruchomienia"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case_key(r): r for r in json.load(f)["results"]}
+    print(f"\nPorównanie z {baseline_path} (czas teraz / czas wcześniej):")
+    for record in results:
+        old = baseline.get(case_key(record))
+        if old is None or not old["time"]:
+            continue
+        ratio = record["time"] / old["time"]
+        print(f"{record['solver']:>15} {record['topology']:>12} {record['size']:>6}  x{ratio:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark solverów labiryntu")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--large", action="store_true", help=f"dołącz rozmiary {LARGE_SIZES}")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=None,
+                        help="domyślnie wszystkie (" + ", ".join(f"{name} tylko do rozmiaru {size}"
+                                                                 for name, size in SLOW_SOLVERS.items()) + ")")
+    parser.add_argument("--topologies", nargs="+",
+                        default=["open", "perfect", "spiral"] + [f"random_{d}" for d in DEFAULT_DENSITIES])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--storage", choices=STORAGES, default="uint8", help="sposób przechowywania siatki")
+    parser.add_argument("--no-memory", action="store_true", help="pomiń pomiar szczytowego zużycia pamięci")
+    parser.add_argument("--output", help="plik JSON z wynikami")
+    parser.add_argument("--compare", help="plik JSON z wcześniejszego uruchomienia do porównania")
+    args = parser.parse_args(argv)
+    sizes = args.sizes + [size for size in LARGE_SIZES if args.large and size not in args.sizes]
+
+    results = []
+    print(f"{'solver':>15} {'topologia':>12} {'rozmiar':>7} {'czas [s]':>10} {'węzły':>10} "
+          f"{'węzły/s':>12} {'pamięć [MB]':>12} {'ścieżka':>8}")
+    for size in sizes:
+        if args.solvers is not None:
+            solvers = args.solvers
+        else:
+            solvers = [name for name in sorted(SOLVERS) if size <= SLOW_SOLVERS.get(name, size)]
+        for topology in args.topologies:
+            maze = build_maze(topology, size, args.seed, args.storage)
+            for algorithm in solvers:
+                record = {"solver": algorithm, "topology": topology, "size": size, "seed": args.seed}
+                record.update(run_case(algorithm, maze, not args.no_memory))
+                results.append(record)
+                memory = "-" if record["peak_memory"] is None else f"{record['peak_memory'] / 2 ** 20:.1f}"
+                print(f"{algorithm:>15} {topology:>12} {size:>7} {record['time']:>10.3f} "
+                      f"{record['expanded']:>10} {record['nodes_per_sec'] or 0:>12.0f} {memory:>12} "
+                      f"{record['path_length']:>8}")
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "storage": args.storage,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nZapisano wyniki do {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
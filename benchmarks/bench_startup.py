@@ -0,0 +1,90 @@
+"""
+Pomiar czasu uruchamiania: import rdzenia (maze, solver) i czas do pierwszej klatki GUI.
+
+Przykład użycia:
+    python benchmarks/bench_startup.py --runs 7
+    python benchmarks/bench_startup.py --check --core-target 250 --gui-target 400
+
+Każdy pomiar uruchamia osobny proces Pythona (zimny import modułów), a wynikiem
+jest mediana z podanej liczby uruchomień. Pomiar rdzenia sprawdza też, że import
+maze i solver nie ładuje pygame ani colorama. GUI uruchamiane jest z opcją
+--startup-time (bez okna, sterownik SDL "dummy"), która wypisuje czas do pierwszej
+klatki liczony od początku importów src/main.py.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+src_dir = Path(__file__).parent.parent / "src"
+
+# Domyślne cele (mediana w milisekundach)
+CORE_TARGET_MS = 250.0
+GUI_TARGET_MS = 400.0
+# Moduły, których rdzeń nie może importować
+GUI_MODULES = ("pygame", "colorama")
+
+CORE_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {str(src_dir)!r})
+import maze, solver
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"import_ms": elapsed, "gui_modules": [m for m in {GUI_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_core() -> dict:
+    """Czas importu maze i solver w nowym procesie"""
+    output = subprocess.run([sys.executable, "-c", CORE_SCRIPT], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def measure_gui() -> float:
+    """Czas do pierwszej klatki GUI w nowym procesie (w milisekundach)"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    output = subprocess.run([sys.executable, str(src_dir / "main.py"), "--startup-time"],
+                            capture_output=True, text=True, check=True, env=env)
+    # Wyjście zawiera też logi aplikacji - wynik to linia JSON z polem startup_ms
+    line = next(line for line in output.stdout.splitlines() if line.startswith('{"startup_ms"'))
+    return json.loads(line)["startup_ms"]
+
+
+def report(name: str, times: List[float], target: float) -> bool:
+    """Wypisuje medianę pomiarów i zwraca, czy mieści się w celu"""
+    median = statistics.median(times)
+    ok = median <= target
+    print(f"{name:>10}: mediana {median:7.1f} ms (min {min(times):.1f}, maks {max(times):.1f}), "
+          f"cel {target:.0f} ms - {'OK' if ok else 'PRZEKROCZONY'}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pomiar czasu uruchamiania")
+    parser.add_argument("--runs", type=int, default=5, help="liczba uruchomień każdego pomiaru")
+    parser.add_argument("--core-target", type=float, default=CORE_TARGET_MS, help="cel importu rdzenia [ms]")
+    parser.add_argument("--gui-target", type=float, default=GUI_TARGET_MS, help="cel pierwszej klatki GUI [ms]")
+    parser.add_argument("--no-gui", action="store_true", help="pomiń pomiar GUI")
+    parser.add_argument("--check", action="store_true",
+                        help="kod wyjścia 1, gdy cel jest przekroczony lub rdzeń ładuje moduły GUI")
+    args = parser.parse_args(argv)
+
+    core = [measure_core() for _ in range(args.runs)]
+    ok = report("rdzeń", [run["import_ms"] for run in core], args.core_target)
+    gui_modules = sorted({module for run in core for module in run["gui_modules"]})
+    if gui_modules:
+        print(f"Import rdzenia ładuje moduły GUI: {', '.join(gui_modules)}")
+        ok = False
+
+    if not args.no_gui:
+        ok = report("GUI", [measure_gui() for _ in range(args.runs)], args.gui_target) and ok
+
+    return 0 if ok or not args.check else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,10 @@ def get_abs_path(*paths):
 
 print("Starting build process...")  # Unikamy polskich znaków w komunikatach
 
+# Directory build (onedir) by default: a onefile .exe unpacks everything to a temporary
+# directory on every launch, so its window shows up much later (pass --onefile to build it anyway)
+onefile = '--onefile' in sys.argv[1:]
+
 # Cleanup old build and dist directories
 for dir_name in ['build', 'dist']:
     if os.path.exists(dir_name):
@@ -41,11 +45,19 @@ hidden_imports = [
     'colorama',
 ]
 
+# Modules never used at runtime - fewer files to load on startup
+# (pkg_resources also adds a slow runtime hook and a ~100 ms import; without it
+# pygame.pkgdata reads its default font straight from the bundled package directory)
+excluded_modules = [
+    'tkinter',
+    'pkg_resources',
+]
+
 # PyInstaller arguments
 pyinstaller_args = [
     main_script,
     '--name=%s' % app_name,
-    '--onefile',
+    '--onefile' if onefile else '--onedir',
     '--windowed',
     '--clean',
     '--noconfirm',
@@ -56,6 +68,9 @@ pyinstaller_args = [
 for imp in hidden_imports:
     pyinstaller_args.extend(['--hidden-import', imp])
 
+for module in excluded_modules:
+    pyinstaller_args.extend(['--exclude-module', module])
+
 # Add datas
 for src, dst in datas:
     pyinstaller_args.extend(['--add-data', f'{src};{dst}'])
@@ -65,8 +80,14 @@ icon_path = get_abs_path("assets", "icon.ico")
 if os.path.exists(icon_path):
     pyinstaller_args.extend(['--icon', icon_path])
 
+# Add splash screen if exists (shown until the first frame is drawn)
+splash_path = get_abs_path("assets", "splash.png")
+if os.path.exists(splash_path):
+    pyinstaller_args.extend(['--splash', splash_path])
+
 print("Build configuration:")
 print(f"Main script: {main_script}")
+print(f"Mode: {'onefile' if onefile else 'onedir'}")
 print(f"Python path: {get_abs_path('src')}")
 for src, dst in datas:
     print(f"Data: {src} -> {dst}")
@@ -78,10 +99,17 @@ try:
     # Run PyInstaller
     PyInstaller.__main__.run(pyinstaller_args)
 
-    exe_path = Path('dist') / f'{app_name}.exe'
+    if onefile:
+        exe_path = Path('dist') / f'{app_name}.exe'
+    else:
+        exe_path = Path('dist') / app_name / f'{app_name}.exe'
     if exe_path.exists():
         print(f"Success! Application packed to: {exe_path.absolute()}")
-        print(f"File size: {exe_path.stat().st_size / (1024 * 1024):.2f} MB")
+        if onefile:
+            print(f"File size: {exe_path.stat().st_size / (1024 * 1024):.2f} MB")
+        else:
+            size = sum(f.stat().st_size for f in exe_path.parent.rglob('*') if f.is_file())
+            print(f"Directory size: {size / (1024 * 1024):.2f} MB")
     else:
         print("Error: Executable file not found!")
         sys.exit(1)
@@ -1,4 +1,9 @@
 from .maze import Maze
-from .solver import RandomWalkSolver, AStarSolver
+from .solver import (RandomWalkSolver, AStarSolver, FlatAStarSolver, DistanceFieldSolver, LPAStarSolver,
+                     JumpPointSolver, BidirectionalBFSSolver, DialSolver)
+from .hpa import HPAStarSolver
+from .walkers import MonteCarloWalkSolver
 
-__all__ = ['Maze', 'RandomWalkSolver', 'AStarSolver']
\ No newline at end of file
+__all__ = ['Maze', 'RandomWalkSolver', 'AStarSolver', 'FlatAStarSolver', 'DistanceFieldSolver', 'LPAStarSolver',
+           'JumpPointSolver', 'BidirectionalBFSSolver', 'HPAStarSolver', 'DialSolver',
+           'MonteCarloWalkSolver']
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Równoległe rozwiązywanie wielu labiryntów w puli procesów.
+
+Przykład użycia:
+    python src/batch.py mazes/ -j 8 --algorithm astar --output wyniki.jsonl
+    python src/batch.py gen:prim:1001x1001:0..999 --no-path
+    find mazes -name '*.maze' | python src/batch.py -
+
+Zadanie to plik labiryntu (.maze lub tekstowy), katalog z takimi plikami albo
+specyfikacja generatora 'gen:NAZWA:SZEROKOŚĆxWYSOKOŚĆ:ZIARNO' (ziarno może być
+zakresem 'OD..DO'). Wyniki wypisywane są jako JSON Lines w kolejności ukończenia.
+
+Procesy robocze nie dostają siatek przez pickle: pliki .maze same mapują do
+pamięci, labirynty generowane tworzą na miejscu, a labirynty przekazane
+z procesu głównego (solve_mazes) trafiają do nich przez pamięć współdzieloną.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+# Dodajemy ścieżkę źródłową do PYTHONPATH
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from generators import GENERATORS, generate
+from headless import SOLVERS, parse_text_maze, solve_maze
+from maze import Maze, STORAGES
+from mazefile import load_maze
+from worker import SharedMazeSpec, attach_shared_maze, close_shared, share_maze
+
+# Rozszerzenia plików zbieranych z katalogów
+MAZE_SUFFIXES = (".maze", ".txt")
+
+
+class BatchJob(NamedTuple):
+    """Jedno zadanie wsadowe"""
+    name: str
+    kind: str  # 'file', 'generate', 'shared' lub 'invalid' (błędna linia wejścia - source to opis błędu)
+    source: Union[str, tuple, SharedMazeSpec]
+
+
+def parse_job(text: str) -> List[BatchJob]:
+    """
+    Zamienia ścieżkę lub specyfikację generatora na listę zadań
+    :param text: plik, katalog lub 'gen:NAZWA:SZEROKOŚĆxWYSOKOŚĆ:ZIARNO' (ziarno lub zakres OD..DO)
+    :return: Lista zadań
+    """
+    if text.startswith("gen:"):
+        try:
+            _, name, size, seeds = text.split(":")
+            width, height = (int(v) for v in size.lower().split("x"))
+            first, _, last = seeds.partition("..")
+            seed_range = range(int(first), int(last or first) + 1)
+        except ValueError:
+            raise ValueError(f"Nieprawidłowa specyfikacja generatora: {text}") from None
+        if name not in GENERATORS:
+            raise ValueError(f"Nieznany generator: {name}")
+        return [BatchJob(f"gen:{name}:{width}x{height}:{seed}", "generate", (name, width, height, seed))
+                for seed in seed_range]
+
+    path = Path(text)
+    if path.is_dir():
+        return [BatchJob(str(p), "file", str(p)) for p in sorted(path.rglob("*")) if p.suffix in MAZE_SUFFIXES]
+    return [BatchJob(text, "file", text)]
+
+
+def _load_job_maze(job: BatchJob, storage: Optional[str]) -> Maze:
+    """Wczytuje lub generuje labirynt zadania (w procesie roboczym)"""
+    if job.kind == "generate":
+        name, width, height, seed = job.source
+        return generate(Maze(width, height, storage or "uint8"), name, seed)
+    if job.source.endswith(".maze"):
+        maze = load_maze(job.source, storage=storage)
+    else:
+        with open(job.source, encoding="utf-8") as f:
+            maze = parse_text_maze(f)
+    if not maze.is_complete():
+        raise ValueError("Labirynt musi zawierać punkt startowy i końcowy")
+    return maze
+
+
+def _run_job(task: tuple) -> Dict:
+    """Funkcja procesu roboczego: wczytuje labirynt zadania i rozwiązuje go"""
+    index, job, algorithm, max_steps, include_path, storage = task
+    record = {"index": index, "name": job.name}
+    memory = None
+    try:
+        started = time.perf_counter()
+        if job.kind == "invalid":
+            raise ValueError(job.source)
+        if job.kind == "shared":
+            memory, maze = attach_shared_maze(job.source)
+        else:
+            maze = _load_job_maze(job, storage)
+        record["load_time"] = time.perf_counter() - started
+        record.update(solve_maze(maze, algorithm, max_steps))
+        del maze
+    except (OSError, ValueError) as e:
+        record["error"] = str(e)
+        return record
+    except Exception as e:
+        # Nieoczekiwany błąd jednego labiryntu (np. MemoryError) nie przerywa całej partii
+        record["error"] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        return record
+    finally:
+        if memory is not None:
+            close_shared(memory)
+
+    record["length"] = len(record["path"])
+    if not include_path:
+        del record["path"]
+    return record
+
+
+def _chunksize(jobs: Iterable, processes: int) -> int:
+    """Wielkość paczek zadań - kilka paczek na proces, żeby wyrównać obciążenie"""
+    if not hasattr(jobs, "__len__"):
+        return 1
+    return max(1, len(jobs) // (processes * 4))
+
+
+def solve_batch(jobs: Iterable[BatchJob], algorithm: str = "astar", processes: Optional[int] = None,
+                max_steps: Optional[int] = None, include_path: bool = True,
+                storage: Optional[str] = None, max_pending: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Rozwiązuje zadania w puli procesów
+    :param jobs: zadania (lista lub dowolny iterator, np. czytany ze standardowego wejścia)
+    :param processes: liczba procesów (None - liczba rdzeni)
+    :param storage: sposób przechowywania siatki w procesach roboczych (None - domyślny)
+    :param max_pending: najwięcej zadań pobranych z jobs, a jeszcze bez wyniku (None - dwie paczki na proces);
+                        kolejne zadania pobierane są z iteratora dopiero po otrzymaniu wyników
+    :return: Iterator słowników z wynikami w kolejności ukończenia (pole 'index' - numer zadania)
+    """
+    processes = processes or os.cpu_count() or 1
+    chunksize = _chunksize(jobs, processes)
+    # Pula pobiera zadania z iteratora od razu - bez ograniczenia cały iterator (np. labirynty
+    # w pamięci współdzielonej) zostałby rozwinięty przed pierwszym wynikiem
+    pending = threading.Semaphore(max(max_pending or 2 * processes * chunksize, chunksize))
+    stopped = threading.Event()
+
+    def tasks():
+        iterator = iter(jobs)
+        for index in itertools.count():
+            pending.acquire()
+            job = None if stopped.is_set() else next(iterator, None)
+            if job is None:
+                return
+            yield index, job, algorithm, max_steps, include_path, storage
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes) as pool:
+        try:
+            for record in pool.imap_unordered(_run_job, tasks(), chunksize):
+                pending.release()
+                yield record
+        finally:
+            # Odblokowuje wątek puli czekający na semafor - inaczej zamknięcie puli po przerwanym
+            # odbiorze wyników czekałoby na niego bez końca
+            stopped.set()
+            pending.release()
+
+
+def solve_mazes(mazes: Iterable[Maze], algorithm: str = "astar", processes: Optional[int] = None,
+                max_steps: Optional[int] = None, include_path: bool = True) -> Iterator[Dict]:
+    """
+    Rozwiązuje labirynty z bieżącego procesu w puli procesów.
+    Siatki przekazywane są przez pamięć współdzieloną, zwalnianą po otrzymaniu wyniku; naraz
+    współdzielonych jest najwyżej kilka labiryntów na proces (patrz max_pending w solve_batch).
+    :return: Iterator słowników z wynikami w kolejności ukończenia (pole 'index' - numer labiryntu)
+    """
+    blocks = {}
+
+    def shared_jobs():
+        for index, maze in enumerate(mazes):
+            memory, spec = share_maze(maze)
+            blocks[index] = memory
+            yield BatchJob(f"maze:{index}", "shared", spec)
+
+    try:
+        for record in solve_batch(shared_jobs(), algorithm, processes, max_steps, include_path):
+            memory = blocks.pop(record["index"])
+            memory.close()
+            memory.unlink()
+            yield record
+    finally:
+        for memory in blocks.values():
+            memory.close()
+            memory.unlink()
+
+
+def _read_jobs(inputs: List[str]) -> Iterator[BatchJob]:
+    """Zamienia argumenty wiersza poleceń na zadania ('-' - kolejne linie standardowego wejścia)"""
+    for text in inputs:
+        if text == "-":
+            for line in sys.stdin:
+                if not line.strip():
+                    continue
+                try:
+                    jobs = parse_job(line.strip())
+                except ValueError as e:
+                    # Wejście czytane jest w trakcie pracy puli - błędna linia staje się rekordem z błędem
+                    jobs = [BatchJob(line.strip(), "invalid", str(e))]
+                yield from jobs
+        else:
+            yield from parse_job(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Równoległe rozwiązywanie wielu labiryntów")
+    parser.add_argument("inputs", nargs="+",
+                        help="pliki, katalogi, specyfikacje 'gen:NAZWA:SZxWYS:ZIARNO' lub '-' (lista ze stdin)")
+    parser.add_argument("--algorithm", "-a", choices=sorted(SOLVERS), default="astar")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--max-steps", type=int, default=None, help="limit kroków solvera")
+    parser.add_argument("--storage", choices=STORAGES, default=None,
+                        help="sposób przechowywania siatki w procesach roboczych")
+    parser.add_argument("--no-path", action="store_true", help="nie wypisuj ścieżek")
+    parser.add_argument("--output", "-o", help="plik JSON Lines z wynikami (domyślnie standardowe wyjście)")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = list(_read_jobs(args.inputs)) if "-" not in args.inputs else _read_jobs(args.inputs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    exit_code = 0
+    count = 0
+    started = time.perf_counter()
+    try:
+        for record in solve_batch(jobs, args.algorithm, args.jobs, args.max_steps, not args.no_path, args.storage):
+            if "error" in record:
+                print(f"{record['name']}: {record['error']}", file=sys.stderr)
+                exit_code = 1
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Rozwiązano {count} labiryntów w {elapsed:.2f} s ({count / elapsed:.1f} labiryntów/s)"
+          if elapsed > 0 else f"Rozwiązano {count} labiryntów", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
+from maze import Maze
+from solver import BaseSolver, CellMask
+
+# Przybliżony koszt jednego pola ścieżki w pamięci (krotka + dwie liczby + wskaźnik w liście)
+PATH_CELL_BYTES = 64
+
+
+@dataclass
+class CacheEntry:
+    """Zapamiętane rozwiązanie labiryntu"""
+    path: List[Tuple[int, int]]
+    solved: bool
+    expanded: int
+    visited: np.ndarray  # spakowane bitowo flagi odwiedzonych pól (np.packbits)
+    distances: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Przybliżony rozmiar wpisu w bajtach"""
+        size = len(self.path) * PATH_CELL_BYTES + self.visited.nbytes
+        if self.distances is not None:
+            size += self.distances.nbytes
+        return size
+
+
+class SolutionCache:
+    """
+    Pamięć podręczna rozwiązań (ścieżek i map odległości) z wypieraniem LRU.
+    Kluczem jest skrót zawartości labiryntu, punkty start/koniec i nazwa algorytmu.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param max_entries: maksymalna liczba zapamiętanych rozwiązań
+        :param max_bytes: maksymalny łączny rozmiar wpisów w bajtach
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Ostatni znany skrót zawartości obserwowanych labiryntów (id labiryntu -> skrót)
+        self._watched_hashes: Dict[int, bytes] = {}
+
+    @staticmethod
+    def key(maze: Maze, algorithm: str) -> tuple:
+        """Zwraca klucz wpisu dla labiryntu i algorytmu"""
+        return maze.content_hash(), maze.start_pos, maze.end_pos, algorithm
+
+    def watch(self, maze: Maze):
+        """Unieważnia wpisy labiryntu przy każdej zmianie jego siatki"""
+
+        def on_change(_pos):
+            old_hash = self._watched_hashes.pop(id(maze), None)
+            if old_hash is not None:
+                self.invalidate(old_hash)
+
+        maze.add_change_listener(on_change)
+
+    def get(self, maze: Maze, algorithm: str) -> Optional[CacheEntry]:
+        """
+        Wyszukuje rozwiązanie dla labiryntu
+        :return: Wpis lub None, jeśli rozwiązanie nie jest zapamiętane
+        """
+        key = self.key(maze, algorithm)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, maze: Maze, algorithm: str, solver: BaseSolver) -> bool:
+        """
+        Zapamiętuje wynik zakończonego solvera
+        :return: True, jeśli wynik został zapamiętany
+        """
+        if not solver.deterministic:
+            return False
+
+        visited = np.zeros((maze.height, maze.width), dtype=bool)
+        if isinstance(solver.visited, CellMask):
+            visited |= solver.visited.as_array().astype(bool)
+        elif solver.visited:
+            xs, ys = zip(*solver.visited)
+            visited[list(ys), list(xs)] = True
+
+        distances = getattr(solver, "distances", None)
+        entry = CacheEntry(
+            path=list(solver.path),
+            solved=solver.solved,
+            expanded=solver.expanded,
+            visited=np.packbits(visited, axis=None),
+            distances=None if distances is None else distances.copy()
+        )
+        if entry.nbytes > self.max_bytes:
+            return False
+
+        key = self.key(maze, algorithm)
+        self._discard(key)
+        self.entries[key] = entry
+        self.total_bytes += entry.nbytes
+        self._watched_hashes[id(maze)] = key[0]
+        self._evict()
+        return True
+
+    @staticmethod
+    def restore(solver: BaseSolver, entry: CacheEntry):
+        """Przywraca zapamiętane rozwiązanie do solvera"""
+        maze = solver.maze
+        solver.reset()
+        visited = np.unpackbits(entry.visited, count=maze.width * maze.height).reshape(maze.height, maze.width)
+        if isinstance(solver.visited, CellMask):
+            solver.visited.as_array()[:] = visited
+            solver.visited.count = int(visited.sum())
+        else:
+            ys, xs = np.nonzero(visited)
+            solver.visited.update(zip(xs.tolist(), ys.tolist()))
+        if entry.distances is not None and hasattr(solver, "dist"):
+            solver.dist[:] = entry.distances.ravel()
+        solver.path = list(entry.path)
+        solver.solved = entry.solved
+        solver.expanded = entry.expanded
+
+    def invalidate(self, content_hash: bytes):
+        """Usuwa wszystkie wpisy dotyczące labiryntu o danym skrócie zawartości"""
+        for key in [key for key in self.entries if key[0] == content_hash]:
+            self._discard(key)
+
+    def clear(self):
+        """Usuwa wszystkie wpisy"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def _discard(self, key: tuple):
+        """Usuwa pojedynczy wpis, jeśli istnieje"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+
+    def _evict(self):
+        """Wypiera najdawniej używane wpisy ponad limity"""
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.nbytes
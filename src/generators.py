@@ -0,0 +1,299 @@
+"""
+Generatory labiryntów wypełniające bezpośrednio Maze.grid.
+
+Generatory labiryntów doskonałych pracują na siatce komórek o parzystych
+współrzędnych (0, 2, 4, ...); pola pomiędzy nimi są ścianami albo przejściami.
+Każdy generator przyjmuje ziarno, więc ten sam labirynt można odtworzyć.
+"""
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from maze import Maze
+from solver import distance_field
+
+
+def _cell_dims(width: int, height: int) -> Tuple[int, int]:
+    """Liczba komórek labiryntu doskonałego w poziomie i pionie"""
+    return (width + 1) // 2, (height + 1) // 2
+
+
+def _random_stream(rng: np.random.Generator, chunk: int = 1 << 16) -> Iterator[float]:
+    """Liczby z przedziału [0, 1) losowane paczkami (pojedyncze wywołania rng są wolne)"""
+    while True:
+        yield from rng.random(chunk).tolist()
+
+
+def _cell_neighbors(index: int, cells_w: int, cells_total: int) -> List[int]:
+    """Indeksy sąsiednich komórek (indeks = cy * cells_w + cx)"""
+    neighbors = []
+    x = index % cells_w
+    if x + 1 < cells_w:
+        neighbors.append(index + 1)
+    if x > 0:
+        neighbors.append(index - 1)
+    if index + cells_w < cells_total:
+        neighbors.append(index + cells_w)
+    if index >= cells_w:
+        neighbors.append(index - cells_w)
+    return neighbors
+
+
+class _Carver:
+    """Wycina komórki i przejścia w płaskim buforze siatki (1 - ściana, 0 - wolne pole)"""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cells_w, _ = _cell_dims(width, height)
+        self.cells = bytearray(b"\x01") * (width * height)
+
+    def grid_index(self, cell: int) -> int:
+        """Indeks pola siatki odpowiadającego komórce"""
+        cy, cx = divmod(cell, self.cells_w)
+        return 2 * cy * self.width + 2 * cx
+
+    def carve(self, cell: int, previous: Optional[int] = None):
+        """Otwiera komórkę i (opcjonalnie) przejście do poprzedniej komórki"""
+        index = self.grid_index(cell)
+        self.cells[index] = 0
+        if previous is not None:
+            self.cells[(index + self.grid_index(previous)) // 2] = 0
+
+    def walls(self) -> np.ndarray:
+        """Zwraca tablicę bool ścian o kształcie (height, width)"""
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width).astype(bool)
+
+
+def recursive_backtracker(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Labirynt doskonały metodą recursive backtracker (DFS z powrotami, bez rekurencji)
+    :return: Tablica bool ścian o kształcie (height, width)
+    """
+    cells_w, cells_h = _cell_dims(width, height)
+    total = cells_w * cells_h
+    carver = _Carver(width, height)
+    rand = _random_stream(rng)
+    seen = bytearray(total)
+    seen[0] = 1
+    carver.carve(0)
+    stack = [0]
+    while stack:
+        current = stack[-1]
+        options = [n for n in _cell_neighbors(current, cells_w, total) if not seen[n]]
+        if not options:
+            stack.pop()
+            continue
+        chosen = options[int(next(rand) * len(options))]
+        seen[chosen] = 1
+        carver.carve(chosen, current)
+        stack.append(chosen)
+    return carver.walls()
+
+
+def prim(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Labirynt doskonały losowym algorytmem Prima
+    :return: Tablica bool ścian o kształcie (height, width)
+    """
+    cells_w, cells_h = _cell_dims(width, height)
+    total = cells_w * cells_h
+    carver = _Carver(width, height)
+    rand = _random_stream(rng)
+    # 0 - poza labiryntem, 1 - na froncie, 2 - w labiryncie
+    status = bytearray(total)
+    frontier = []
+
+    def add(cell: int, previous: Optional[int] = None):
+        status[cell] = 2
+        carver.carve(cell, previous)
+        for neighbor in _cell_neighbors(cell, cells_w, total):
+            if status[neighbor] == 0:
+                status[neighbor] = 1
+                frontier.append(neighbor)
+
+    add(0)
+    while frontier:
+        # Losowy element frontu, usuwany przez zamianę z ostatnim
+        index = int(next(rand) * len(frontier))
+        frontier[index], frontier[-1] = frontier[-1], frontier[index]
+        cell = frontier.pop()
+        inside = [n for n in _cell_neighbors(cell, cells_w, total) if status[n] == 2]
+        add(cell, inside[int(next(rand) * len(inside))])
+    return carver.walls()
+
+
+def kruskal(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Labirynt doskonały losowym algorytmem Kruskala (union-find z kompresją ścieżek)
+    :return: Tablica bool ścian o kształcie (height, width)
+    """
+    cells_w, cells_h = _cell_dims(width, height)
+    carver = _Carver(width, height)
+    if cells_w * cells_h == 1:
+        carver.carve(0)
+
+    # Krawędzie między komórkami: poziome i pionowe, w losowej kolejności
+    index = np.arange(cells_w * cells_h).reshape(cells_h, cells_w)
+    first = np.concatenate([index[:, :-1].ravel(), index[:-1, :].ravel()])
+    second = np.concatenate([index[:, 1:].ravel(), index[1:, :].ravel()])
+    order = rng.permutation(first.size)
+    first, second = first[order], second[order]
+
+    parent = list(range(cells_w * cells_h))
+
+    def find(a: int) -> int:
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for a, b in zip(first.tolist(), second.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            carver.carve(a)
+            carver.carve(b, a)
+    return carver.walls()
+
+
+def iter_ellers_rows(width: int, height: int, rng: np.random.Generator) -> Iterator[np.ndarray]:
+    """
+    Labirynt doskonały algorytmem Ellera, generowany wiersz po wierszu.
+    Pamięć zależy tylko od szerokości, więc labirynt można zapisywać strumieniowo.
+    :return: Kolejne wiersze siatki jako tablice bool ścian długości width
+    """
+    cells_w, cells_h = _cell_dims(width, height)
+    sets = np.arange(cells_w, dtype=np.int64)
+    parent: List[int] = []
+
+    def find(a: int) -> int:
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for cy in range(cells_h):
+        last = cy == cells_h - 1
+        row = np.ones(width, dtype=bool)
+        row[0::2] = False
+
+        # Zbiory wiersza przenumerowane na 0..k-1 - łączenie przez union-find zamiast przepisywania etykiet
+        labels = np.unique(sets, return_inverse=True)[1].tolist()
+        parent = list(range(cells_w))
+
+        # Łączenie sąsiednich komórek z różnych zbiorów (w ostatnim wierszu - zawsze)
+        joins = rng.random(cells_w - 1) < 0.5
+        for cx in range(cells_w - 1):
+            root_a, root_b = find(labels[cx]), find(labels[cx + 1])
+            if root_a != root_b and (last or joins[cx]):
+                row[2 * cx + 1] = False
+                parent[root_b] = root_a
+        sets = np.array([find(label) for label in labels], dtype=np.int64)
+        yield row
+
+        if last or 2 * cy + 1 >= height:
+            break
+
+        # Przejścia w dół: każdy zbiór co najmniej raz
+        down = rng.random(cells_w) < 0.5
+        order = rng.permutation(cells_w)
+        covered = set()
+        for cx in order.tolist():
+            if down[cx]:
+                covered.add(int(sets[cx]))
+        for cx in order.tolist():
+            if int(sets[cx]) not in covered:
+                down[cx] = True
+                covered.add(int(sets[cx]))
+
+        below = np.ones(width, dtype=bool)
+        below[0::2][down] = False
+        yield below
+
+        # Komórki bez przejścia z góry dostają nowe zbiory (etykiety wiersza są mniejsze od cells_w)
+        fresh = np.flatnonzero(~down)
+        sets[fresh] = np.arange(cells_w, cells_w + fresh.size)
+
+
+def ellers(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Labirynt doskonały algorytmem Ellera
+    :return: Tablica bool ścian o kształcie (height, width)
+    """
+    walls = np.ones((height, width), dtype=bool)
+    for y, row in enumerate(iter_ellers_rows(width, height, rng)):
+        walls[y] = row
+    return walls
+
+
+def random_noise(width: int, height: int, rng: np.random.Generator, density: float = 0.3) -> np.ndarray:
+    """
+    Losowe ściany z podanym prawdopodobieństwem
+    :return: Tablica bool ścian o kształcie (height, width)
+    """
+    return rng.random((height, width)) < density
+
+
+GENERATORS = {
+    "backtracker": recursive_backtracker,
+    "prim": prim,
+    "kruskal": kruskal,
+    "ellers": ellers,
+    "noise": random_noise,
+}
+
+
+def choose_endpoints(maze: Maze, perfect: bool) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Wybiera punkty start/koniec leżące na wolnych, połączonych polach
+    :param perfect: czy labirynt jest doskonały (wtedy wszystkie komórki są połączone)
+    :return: Para (start, koniec)
+    """
+    if perfect:
+        cells_w, cells_h = _cell_dims(maze.width, maze.height)
+        if cells_w * cells_h < 2:
+            raise ValueError("Labirynt ma mniej niż dwa wolne pola")
+        return (0, 0), (2 * (cells_w - 1), 2 * (cells_h - 1))
+
+    free = np.flatnonzero(maze.grid.ravel() != 1)
+    if free.size < 2:
+        raise ValueError("Labirynt ma mniej niż dwa wolne pola")
+    labels = maze.component_labels()
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    largest = int(np.argmax(sizes))
+    if sizes[largest] < 2:
+        raise ValueError("Żadne wolne pole nie ma połączenia z innym polem")
+    # Start - pierwsze pole największej składowej (pierwsze wolne pole bywa odcięte od reszty szumu)
+    sy, sx = divmod(int(np.argmax(labels.ravel() == largest)), maze.width)
+    # Cel - najdalsze osiągalne pole od startu
+    dist = distance_field(maze.neighbor_mask_array(), [(sx, sy)])
+    ey, ex = divmod(int(np.argmax(dist)), maze.width)
+    return (sx, sy), (ex, ey)
+
+
+def generate(maze: Maze, algorithm: str, seed: Optional[int] = None, **options) -> Maze:
+    """
+    Wypełnia labirynt wygenerowanymi ścianami i ustawia punkty start/koniec
+    :param algorithm: nazwa generatora z GENERATORS
+    :param seed: ziarno generatora liczb losowych
+    :param options: dodatkowe parametry generatora (np. density dla 'noise')
+    :return: Ten sam labirynt
+    """
+    rng = np.random.default_rng(seed)
+    maze.start_pos = None
+    maze.end_pos = None
+    if algorithm == "ellers":
+        # Zapis strumieniowy - bez dodatkowej tablicy całej siatki
+        for y, row in enumerate(iter_ellers_rows(maze.width, maze.height, rng)):
+            maze.grid[y] = row
+        maze.grid[y + 1:] = 1
+    else:
+        maze.grid[:] = GENERATORS[algorithm](maze.width, maze.height, rng, **options)
+    maze.refresh()
+
+    start, end = choose_endpoints(maze, perfect=algorithm != "noise")
+    maze.set_start(*start)
+    maze.set_end(*end)
+    return maze
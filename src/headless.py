@@ -0,0 +1,173 @@
+"""
+Rozwiązywanie labiryntów bez GUI (bez importowania pygame).
+
+Przykład użycia:
+    python src/headless.py maze1.txt maze2.txt --algorithm astar
+    python src/headless.py --generate prim --width 2001 --height 2001 --seed 7 --count 3
+
+Format pliku tekstowego: '#' - ściana, 'S' - start, 'E' - koniec,
+cyfry 2-9 - teren o takim koszcie wejścia, każdy inny znak - wolne pole.
+Plik '-' oznacza standardowe wejście.
+Pliki z rozszerzeniem .maze wczytywane są w formacie binarnym (mazefile).
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# Dodajemy ścieżkę źródłową do PYTHONPATH
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from generators import GENERATORS, generate
+from maze import Maze, STORAGES
+from mazefile import load_maze
+from solver import (BaseSolver, RandomWalkSolver, AStarSolver, FlatAStarSolver, DistanceFieldSolver, LPAStarSolver,
+                    JumpPointSolver, BidirectionalBFSSolver, DialSolver)
+from hpa import HPAStarSolver
+from stats import StatsRecorder
+from walkers import MonteCarloWalkSolver
+
+SOLVERS = {
+    "astar": AStarSolver,
+    "bidirectional": BidirectionalBFSSolver,
+    "astar_flat": FlatAStarSolver,
+    "dial": DialSolver,
+    "distance_field": DistanceFieldSolver,
+    "lpastar": LPAStarSolver,
+    "jps": JumpPointSolver,
+    "hpa": HPAStarSolver,
+    "random_walk": RandomWalkSolver,
+    "monte_carlo": MonteCarloWalkSolver,
+}
+
+
+def parse_text_maze(lines: Iterable[str]) -> Maze:
+    """
+    Tworzy labirynt na podstawie tekstowej reprezentacji
+    :param lines: linie tekstu ('#' - ściana, 'S' - start, 'E' - koniec, cyfry 2-9 - koszt terenu)
+    :return: Labirynt z ustawionymi ścianami, startem i końcem
+    """
+    rows = [line.rstrip("\r\n") for line in lines]
+    rows = [row for row in rows if row]
+    if not rows:
+        raise ValueError("Pusty labirynt")
+
+    width = max(len(row) for row in rows)
+    maze = Maze(width, len(rows))
+    start = end = None
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            if char == "#":
+                maze.set_wall(x, y)
+            elif "2" <= char <= "9":
+                maze.set_cost(x, y, int(char))
+            elif char == "S":
+                start = (x, y)
+            elif char == "E":
+                end = (x, y)
+
+    if start is None or end is None:
+        raise ValueError("Labirynt musi zawierać punkt startowy (S) i końcowy (E)")
+    maze.set_start(*start)
+    maze.set_end(*end)
+    return maze
+
+
+def solve_maze(maze: Maze, algorithm: str = "astar", max_steps: Optional[int] = None, stats: bool = False) -> dict:
+    """
+    Rozwiązuje labirynt wybranym algorytmem
+    :param stats: dołącza statystyki solvera (pole 'stats', jak SolverStats.to_dict)
+    :return: Słownik z wynikiem (ścieżka, koszt, liczba rozwiniętych węzłów, czas; dla monte_carlo
+             także podsumowanie czasów dojścia wędrowców). Pole 'weighted' jest False, gdy labirynt
+             ma teren, a algorytm go pomija - koszt dotyczy wtedy ścieżki najkrótszej, nie najtańszej
+    """
+    solver: BaseSolver = SOLVERS[algorithm](maze)
+    recorder = StatsRecorder(solver, algorithm) if stats else None
+    started = time.perf_counter()
+    result = (recorder or solver).solve(max_steps)
+    elapsed = time.perf_counter() - started
+    record = {
+        "algorithm": algorithm,
+        "solved": result.solved,
+        "cost": result.cost,
+        "weighted": solver.weighted or not maze.has_terrain(),
+        "expanded": result.expanded,
+        "time": elapsed,
+        "path": result.path,
+    }
+    if isinstance(solver, MonteCarloWalkSolver):
+        record["hitting_time"] = solver.hitting_time_summary()
+    if recorder is not None:
+        record["stats"] = recorder.snapshot().to_dict()
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rozwiązywanie labiryntów bez GUI")
+    parser.add_argument("files", nargs="*", help="pliki z labiryntami ('-' - standardowe wejście)")
+    parser.add_argument("--algorithm", "-a", choices=sorted(SOLVERS), default="astar")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="limit kroków solvera (domyślnie bez limitu; brak ścieżki wykrywany jest od razu)")
+    parser.add_argument("--no-path", action="store_true", help="nie wypisuj ścieżki")
+    parser.add_argument("--stats", action="store_true",
+                        help="dołącz statystyki solvera (operacje na kolejce, zbiór otwarty, czasy, pamięć)")
+    parser.add_argument("--generate", "-g", choices=sorted(GENERATORS),
+                        help="zamiast plików rozwiąż wygenerowane labirynty")
+    parser.add_argument("--width", type=int, default=101, help="szerokość generowanego labiryntu")
+    parser.add_argument("--height", type=int, default=101, help="wysokość generowanego labiryntu")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno pierwszego generowanego labiryntu")
+    parser.add_argument("--count", type=int, default=1, help="liczba generowanych labiryntów")
+    parser.add_argument("--storage", choices=STORAGES, default=None,
+                        help="sposób przechowywania siatki (bits - 1 bit na pole, dla bardzo dużych labiryntów)")
+    args = parser.parse_args(argv)
+
+    if not args.files and not args.generate:
+        parser.error("podaj pliki z labiryntami albo --generate")
+
+    exit_code = 0
+    if args.generate:
+        for seed in range(args.seed, args.seed + args.count):
+            try:
+                maze = generate(Maze(args.width, args.height, args.storage or "uint8"), args.generate, seed)
+            except ValueError as e:
+                print(f"{args.generate} (ziarno {seed}): {e}", file=sys.stderr)
+                exit_code = 1
+                continue
+            record = solve_maze(maze, args.algorithm, args.max_steps, args.stats)
+            record["generator"] = args.generate
+            record["seed"] = seed
+            if args.no_path:
+                del record["path"]
+            print(json.dumps(record))
+
+    for name in args.files:
+        try:
+            if name == "-":
+                maze = parse_text_maze(sys.stdin)
+            elif name.endswith(".maze"):
+                maze = load_maze(name, storage=args.storage)
+                if not maze.is_complete():
+                    raise ValueError("Labirynt musi zawierać punkt startowy i końcowy")
+            else:
+                with open(name, encoding="utf-8") as f:
+                    maze = parse_text_maze(f)
+        except (OSError, ValueError) as e:
+            print(f"{name}: {e}", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        record = solve_maze(maze, args.algorithm, args.max_steps, args.stats)
+        record["file"] = name
+        if args.no_path:
+            del record["path"]
+        print(json.dumps(record))
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
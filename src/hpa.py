@@ -0,0 +1,401 @@
+"""
+Hierarchiczne wyszukiwanie ścieżek (HPA*).
+
+Siatka dzielona jest na kwadratowe klastry. Na granicy dwóch klastrów każdy
+ciągły odcinek wolnych par pól tworzy wejście, reprezentowane przez jedną lub
+dwie pary pól (przejścia). Pola przejść są węzłami grafu abstrakcyjnego:
+- krawędzie między klastrami łączą pola pary przejścia (koszt 1),
+- krawędzie wewnątrz klastra mają koszt równy odległości BFS w obrębie klastra.
+
+Zapytanie przeszukuje mały graf abstrakcyjny algorytmem A*, a znalezioną
+ścieżkę rozwija do pojedynczych pól przeszukiwaniami wewnątrz klastrów.
+Wynik jest prawie optymalny (ścieżka nie wychodzi poza wybrane przejścia).
+
+Po zmianie ściany przeliczane są tylko klaster tej ściany i - jeśli ściana
+leży na granicy - wejścia tej granicy oraz klaster po drugiej stronie.
+"""
+import heapq
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from maze import Maze, MASK_OFFSETS, compute_neighbor_mask
+from solver import BaseSolver
+
+# Domyślny bok klastra w polach
+CLUSTER_SIZE = 16
+# Wejścia co najmniej tej długości dostają dwa przejścia (na końcach), krótsze - jedno (w środku)
+ENTRANCE_SPLIT = 6
+
+Position = Tuple[int, int]
+Cluster = Tuple[int, int]
+Border = Tuple[Cluster, Cluster]
+
+
+def _border_runs(free: np.ndarray, size: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Wyszukuje ciągłe odcinki wolnych par pól wzdłuż granic
+    :param free: tablica bool (granice x pozycje wzdłuż granicy); odcinki przerywane są co size pozycji
+    :return: Iterator krotek (numer granicy, pierwsza pozycja, ostatnia pozycja)
+    """
+    positions = np.arange(free.shape[1])
+    before = np.zeros_like(free)
+    before[:, 1:] = free[:, :-1]
+    before[:, positions % size == 0] = False
+    after = np.zeros_like(free)
+    after[:, :-1] = free[:, 1:]
+    after[:, (positions + 1) % size == 0] = False
+    # np.nonzero zwraca indeksy wierszami, więc początki i końce odcinków są w tej samej kolejności
+    rows, first = np.nonzero(free & ~before)
+    _, last = np.nonzero(free & ~after)
+    return zip(rows.tolist(), first.tolist(), last.tolist())
+
+
+def _entrance_offsets(first: int, last: int) -> Tuple[int, ...]:
+    """Pozycje przejść w odcinku wejścia"""
+    if last - first + 1 >= ENTRANCE_SPLIT:
+        return first, last
+    return (first + last) // 2,
+
+
+class ClusterGraph:
+    """
+    Graf abstrakcyjny labiryntu podzielonego na klastry.
+    Wejścia na granicach wyznaczane są dla całej siatki w build(), a odległości
+    wewnątrz klastrów - w precompute() (lub przy pierwszym użyciu klastra);
+    oba wyniki są przechowywane do zmiany ścian w danym klastrze.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = CLUSTER_SIZE):
+        """
+        :param maze: labirynt
+        :param cluster_size: bok klastra w polach
+        """
+        if cluster_size < 2:
+            raise ValueError("Bok klastra musi wynosić co najmniej 2")
+        self.maze = maze
+        self.size = cluster_size
+        self.built = False
+        # Przejścia każdej granicy: (klaster, klaster z prawej lub z dołu) -> pary pól (a, b)
+        self.transitions: Dict[Border, List[Tuple[Position, Position]]] = {}
+        # Krawędzie między klastrami: pole przejścia -> pola po drugiej stronie granicy
+        self.inter: Dict[Position, Set[Position]] = {}
+        # Krawędzie wewnątrz klastrów: klaster -> {węzeł: {węzeł: odległość}}
+        self.intra: Dict[Cluster, Dict[Position, Dict[Position, int]]] = {}
+        # Dane klastra do przeszukiwań lokalnych: klaster -> (x0, y0, szerokość, przesunięcia do sąsiadów)
+        self._local: Dict[Cluster, Tuple[int, int, int, List[List[int]]]] = {}
+        maze.add_change_listener(self._on_maze_change)
+
+    def close(self):
+        """Odłącza graf od labiryntu"""
+        self.maze.remove_change_listener(self._on_maze_change)
+
+    def cluster_of(self, pos: Position) -> Cluster:
+        """Klaster zawierający pole"""
+        return pos[0] // self.size, pos[1] // self.size
+
+    def _passable(self, x0: int, x1: int, y0: int, y1: int) -> np.ndarray:
+        """Przechodniość prostokąta siatki [y0:y1, x0:x1]"""
+        return np.asarray(self.maze.grid[y0:y1, x0:x1]) != 1
+
+    def build(self):
+        """Wyznacza od nowa wejścia na wszystkich granicach klastrów"""
+        size = self.size
+        self.transitions.clear()
+        self.inter.clear()
+        self.intra.clear()
+        self._local.clear()
+        passable = np.asarray(self.maze.grid) != 1
+
+        # Granice pionowe: kolumna x (ostatnia klastra) i x + 1 (pierwsza następnego)
+        columns = np.arange(size - 1, self.maze.width - 1, size)
+        if columns.size:
+            free = (passable[:, columns] & passable[:, columns + 1]).T
+            for k, first, last in _border_runs(free, size):
+                x = int(columns[k])
+                left = (x // size, first // size)
+                for y in _entrance_offsets(first, last):
+                    self._add_transition((left, (left[0] + 1, left[1])), (x, y), (x + 1, y))
+
+        # Granice poziome: wiersz y i y + 1
+        rows = np.arange(size - 1, self.maze.height - 1, size)
+        if rows.size:
+            free = passable[rows, :] & passable[rows + 1, :]
+            for k, first, last in _border_runs(free, size):
+                y = int(rows[k])
+                top = (first // size, y // size)
+                for x in _entrance_offsets(first, last):
+                    self._add_transition((top, (top[0], top[1] + 1)), (x, y), (x, y + 1))
+        self.built = True
+
+    def _add_transition(self, border: Border, a: Position, b: Position):
+        """Dodaje przejście granicy i odpowiadającą mu krawędź między klastrami"""
+        self.transitions.setdefault(border, []).append((a, b))
+        self.inter.setdefault(a, set()).add(b)
+        self.inter.setdefault(b, set()).add(a)
+
+    def _rescan_border(self, border: Border):
+        """Wyznacza od nowa wejścia jednej granicy i unieważnia oba klastry"""
+        for a, b in self.transitions.pop(border, ()):
+            for u, v in ((a, b), (b, a)):
+                partners = self.inter.get(u)
+                if partners is not None:
+                    partners.discard(v)
+                    if not partners:
+                        del self.inter[u]
+
+        size = self.size
+        first_cluster, second_cluster = border
+        if second_cluster[0] != first_cluster[0]:
+            x = second_cluster[0] * size - 1
+            y0 = first_cluster[1] * size
+            passable = self._passable(x, x + 2, y0, min(y0 + size, self.maze.height))
+            free = passable[:, 0] & passable[:, 1]
+            for _, first, last in _border_runs(free[None, :], size):
+                for offset in _entrance_offsets(first, last):
+                    self._add_transition(border, (x, y0 + offset), (x + 1, y0 + offset))
+        else:
+            y = second_cluster[1] * size - 1
+            x0 = first_cluster[0] * size
+            passable = self._passable(x0, min(x0 + size, self.maze.width), y, y + 2)
+            free = passable[0] & passable[1]
+            for _, first, last in _border_runs(free[None, :], size):
+                for offset in _entrance_offsets(first, last):
+                    self._add_transition(border, (x0 + offset, y), (x0 + offset, y + 1))
+
+        for cluster in border:
+            self._invalidate(cluster)
+
+    def _invalidate(self, cluster: Cluster):
+        """Usuwa zapamiętane krawędzie wewnętrzne klastra"""
+        self.intra.pop(cluster, None)
+        self._local.pop(cluster, None)
+
+    def _on_maze_change(self, pos: Optional[Position]):
+        """Po zmianie ściany przelicza tylko dotknięte granice i klastry"""
+        if not self.built:
+            return
+        if pos is None:
+            self.built = False
+            return
+        x, y = pos
+        size = self.size
+        cx, cy = self.cluster_of(pos)
+        self._invalidate((cx, cy))
+        if x % size == size - 1 and x + 1 < self.maze.width:
+            self._rescan_border(((cx, cy), (cx + 1, cy)))
+        if x % size == 0 and x > 0:
+            self._rescan_border(((cx - 1, cy), (cx, cy)))
+        if y % size == size - 1 and y + 1 < self.maze.height:
+            self._rescan_border(((cx, cy), (cx, cy + 1)))
+        if y % size == 0 and y > 0:
+            self._rescan_border(((cx, cy - 1), (cx, cy)))
+
+    def _cluster_nodes(self, cluster: Cluster) -> Set[Position]:
+        """Pola przejść leżące w klastrze"""
+        cx, cy = cluster
+        nodes = set()
+        for border in (((cx - 1, cy), cluster), ((cx, cy - 1), cluster),
+                       (cluster, (cx + 1, cy)), (cluster, (cx, cy + 1))):
+            for a, b in self.transitions.get(border, ()):
+                nodes.add(a if self.cluster_of(a) == cluster else b)
+        return nodes
+
+    def _local_data(self, cluster: Cluster) -> Tuple[int, int, int, List[List[int]]]:
+        """
+        Dane klastra do przeszukiwań lokalnych (ruchy ograniczone do klastra)
+        :return: Krotka (x0, y0, szerokość, przesunięcia do sąsiadów każdego pola)
+        """
+        local = self._local.get(cluster)
+        if local is None:
+            x0, y0 = cluster[0] * self.size, cluster[1] * self.size
+            x1, y1 = min(x0 + self.size, self.maze.width), min(y0 + self.size, self.maze.height)
+            width = x1 - x0
+            offsets = [[dy * width + dx for dx, dy in MASK_OFFSETS[m]] for m in range(16)]
+            mask = compute_neighbor_mask(self._passable(x0, x1, y0, y1))
+            local = self._local[cluster] = (x0, y0, width, [offsets[m] for m in mask.ravel().tolist()])
+        return local
+
+    def _local_bfs(self, cluster: Cluster, source: Position, goal: Optional[Position] = None) -> List[int]:
+        """
+        BFS w obrębie klastra
+        :param goal: pole, po osiągnięciu którego przeszukiwanie się kończy (None - cały klaster)
+        :return: Poprzedniki pól klastra w kolejności płaskich indeksów lokalnych
+                 (-1 dla źródła, -2 dla pól nieosiągniętych)
+        """
+        x0, y0, width, moves = self._local_data(cluster)
+        start = (source[1] - y0) * width + source[0] - x0
+        target = -1 if goal is None else (goal[1] - y0) * width + goal[0] - x0
+        parent = [-2] * len(moves)
+        parent[start] = -1
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+            for offset in moves[current]:
+                neighbor = current + offset
+                if parent[neighbor] == -2:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return parent
+
+    def _distances(self, cluster: Cluster, source: Position, targets) -> Dict[Position, int]:
+        """Odległości BFS w obrębie klastra od source do osiągalnych pól z targets"""
+        x0, y0, width, moves = self._local_data(cluster)
+        start = (source[1] - y0) * width + source[0] - x0
+        dist = [-1] * len(moves)
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            d = dist[current] + 1
+            for offset in moves[current]:
+                neighbor = current + offset
+                if dist[neighbor] < 0:
+                    dist[neighbor] = d
+                    queue.append(neighbor)
+        distances = {}
+        for x, y in targets:
+            d = dist[(y - y0) * width + x - x0]
+            if d > 0:
+                distances[(x, y)] = d
+        return distances
+
+    def _edges(self, cluster: Cluster) -> Dict[Position, Dict[Position, int]]:
+        """Krawędzie wewnętrzne klastra (liczone przy pierwszym użyciu)"""
+        edges = self.intra.get(cluster)
+        if edges is None:
+            nodes = self._cluster_nodes(cluster)
+            edges = self.intra[cluster] = {node: self._distances(cluster, node, nodes) for node in nodes}
+        return edges
+
+    def _links(self, pos: Position, extra: Optional[Position] = None) -> Dict[Position, int]:
+        """Odległości od pola do węzłów jego klastra (i do pola extra, jeśli leży w tym klastrze)"""
+        cluster = self.cluster_of(pos)
+        targets = self._cluster_nodes(cluster)
+        if extra is not None:
+            targets.add(extra)
+        return self._distances(cluster, pos, targets)
+
+    def local_path(self, a: Position, b: Position) -> List[Position]:
+        """Najkrótsza ścieżka od a do b nie wychodząca poza klaster pola a"""
+        cluster = self.cluster_of(a)
+        x0, y0, width, _ = self._local_data(cluster)
+        parent = self._local_bfs(cluster, a, b)
+        index = (b[1] - y0) * width + b[0] - x0
+        path = []
+        while index != -1:
+            y, x = divmod(index, width)
+            path.append((x0 + x, y0 + y))
+            index = parent[index]
+        path.reverse()
+        return path
+
+    def _grid_shape(self) -> Tuple[int, int]:
+        """Liczba kolumn i wierszy klastrów"""
+        return (self.maze.width + self.size - 1) // self.size, (self.maze.height + self.size - 1) // self.size
+
+    @property
+    def precomputed(self) -> bool:
+        """Czy graf jest zbudowany i ma krawędzie wewnętrzne wszystkich klastrów"""
+        columns, rows = self._grid_shape()
+        return self.built and len(self.intra) == columns * rows
+
+    def precompute(self):
+        """Wyznacza krawędzie wewnętrzne wszystkich klastrów (po edycji - tylko unieważnionych)"""
+        if not self.built:
+            self.build()
+        columns, rows = self._grid_shape()
+        for cy in range(rows):
+            for cx in range(columns):
+                self._edges((cx, cy))
+
+    def find_path(self, start: Position, goal: Position) -> Tuple[List[Position], List[Position]]:
+        """
+        Wyszukuje ścieżkę przez graf abstrakcyjny i rozwija ją do pojedynczych pól
+        :return: Ścieżka od start do goal (pusta, jeśli nie istnieje) i lista rozwiniętych węzłów abstrakcyjnych
+        """
+        if not self.built:
+            self.build()
+        if self.maze.is_wall(*start) or self.maze.is_wall(*goal):
+            return [], []
+        start_links = self._links(start, goal if self.cluster_of(start) == self.cluster_of(goal) else None)
+        goal_links = self._links(goal)
+        gx, gy = goal
+
+        g_score = {start: 0}
+        came_from: Dict[Position, Position] = {}
+        open_set = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+        closed: List[Position] = []
+        closed_set = set()
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            closed.append(current)
+            if current == goal:
+                break
+            if current == start:
+                edges = list(start_links.items())
+            else:
+                edges = list(self._edges(self.cluster_of(current)).get(current, {}).items())
+                if current in goal_links:
+                    edges.append((goal, goal_links[current]))
+            edges.extend((partner, 1) for partner in self.inter.get(current, ()))
+            for neighbor, cost in edges:
+                tentative = g + cost
+                if tentative < g_score.get(neighbor, tentative + 1):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    x, y = neighbor
+                    heapq.heappush(open_set, (tentative + abs(x - gx) + abs(y - gy), tentative, neighbor))
+        else:
+            return [], closed
+
+        abstract = [goal]
+        while abstract[-1] != start:
+            abstract.append(came_from[abstract[-1]])
+        abstract.reverse()
+
+        path = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)
+            else:
+                path.extend(self.local_path(a, b)[1:])
+        return path, closed
+
+
+class HPAStarSolver(BaseSolver):
+    """
+    Rozwiązywanie algorytmem HPA* na grafie klastrów.
+    Graf abstrakcyjny jest zachowywany między rozwiązaniami i po edycji
+    przeliczany tylko w zmienionych klastrach.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = CLUSTER_SIZE):
+        super().__init__(maze)
+        self.graph = ClusterGraph(maze, cluster_size)
+
+    def step(self) -> bool:
+        """
+        Pierwszy krok buduje graf abstrakcyjny wraz z krawędziami wewnątrz klastrów
+        (po edycji - tylko unieważnione klastry), drugi wyszukuje ścieżkę
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if not self.endpoints_connected():
+            return False
+        if not self.graph.precomputed:
+            self.graph.precompute()
+            return True
+        path, closed = self.graph.find_path(self.maze.start_pos, self.maze.end_pos)
+        self.visited.update(closed)
+        self.expanded = len(closed)
+        self.path = path
+        self.solved = bool(path)
+        return False
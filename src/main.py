@@ -1,9 +1,19 @@
+import time
+
+# Chwila rozpoczęcia importów - od niej liczony jest czas uruchomienia (--startup-time)
+STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import json
 import logging
+import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple, Optional
 
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 import pygame
 
 # Dodajemy ścieżkę źródłową do PYTHONPATH
@@ -11,17 +21,63 @@ current_dir = Path(__file__).parent
 if str(current_dir) not in sys.path:
     sys.path.append(str(current_dir))
 
-from utils.logger import CustomLogger
-from maze import Maze
-from solver import RandomWalkSolver, AStarSolver
+# Moduły potrzebne dopiero po akcji użytkownika (generatory, pliki, praca w tle,
+# część solverów) importowane są przy pierwszym użyciu, żeby okno pojawiało się szybciej
+from utils.logger import CustomLogger, StrokeLog
+from cache import SolutionCache
+from maze import Maze, MAX_COST
+from renderer import DirtyRectRenderer, SurfarrayRenderer
+from solver import BaseSolver
+from stats import StatsRecorder
 
 # Konfiguracja loggera
 logger = CustomLogger(
     name="maze_solver",
     log_file=str(Path(__file__).parent.parent / "logs" / "app.log"),
-    log_level=logging.DEBUG
+    log_level=logging.DEBUG,
+    background=True
 )
 
+# Nazwy algorytmów wyświetlane w logach, w kolejności przełączania klawiszem A
+ALGORITHM_NAMES = {
+    "random_walk": "Random Walk",
+    "astar": "A*",
+    "distance_field": "Distance Field (BFS)",
+    "lpastar": "LPA* (przyrostowy)",
+    "jps": "Jump Point Search",
+    "bidirectional": "BFS dwukierunkowy",
+    "hpa": "HPA* (hierarchiczny)",
+    "dial": "Dial (kolejka kubełkowa)",
+    "monte_carlo": "Monte Carlo (wielu wędrowców)",
+}
+
+# Klasy solverów jako (moduł, nazwa klasy) - moduł ładowany jest przy pierwszym wyborze algorytmu
+SOLVER_CLASSES = {
+    "random_walk": ("solver", "RandomWalkSolver"),
+    "astar": ("solver", "AStarSolver"),
+    "distance_field": ("solver", "DistanceFieldSolver"),
+    "lpastar": ("solver", "LPAStarSolver"),
+    "jps": ("solver", "JumpPointSolver"),
+    "bidirectional": ("solver", "BidirectionalBFSSolver"),
+    "hpa": ("hpa", "HPAStarSolver"),
+    "dial": ("solver", "DialSolver"),
+    "monte_carlo": ("walkers", "MonteCarloWalkSolver"),
+}
+
+# Tryby rozwiązywania w tle (klucze worker.WORKERS - moduł ładowany przy pierwszym użyciu)
+WORKER_MODES = ("thread", "process")
+
+# Domyślny plik labiryntu dla klawiszy S (zapis) i L (wczytanie)
+DEFAULT_MAZE_FILE = Path(__file__).parent.parent / "mazes" / "maze.maze"
+# Plik, do którego klawisz J zapisuje statystyki solvera
+DEFAULT_STATS_FILE = Path(__file__).parent.parent / "logs" / "solver_stats.json"
+
+# Dostępne tryby rysowania, przełączane klawiszem V
+RENDERERS = {
+    "dirty": DirtyRectRenderer,
+    "surfarray": SurfarrayRenderer,
+}
+
 
 @dataclass
 class Colors:
@@ -35,14 +91,29 @@ class Colors:
     YELLOW: Tuple[int, int, int] = (255, 255, 0)
     VISITED: Tuple[int, int, int] = (200, 200, 255)
     PATH: Tuple[int, int, int] = (255, 200, 200)
+    TERRAIN_LIGHT: Tuple[int, int, int] = (235, 220, 170)  # teren o koszcie 2
+    TERRAIN_DARK: Tuple[int, int, int] = (120, 80, 40)  # teren o koszcie MAX_COST
+    HEAT_COLD: Tuple[int, int, int] = (210, 225, 255)  # pola rzadko odwiedzane przez wędrowców
+    HEAT_HOT: Tuple[int, int, int] = (40, 0, 140)  # pola odwiedzane najczęściej
 
 
 class MazeSolver:
     """Główna klasa aplikacji"""
 
-    def __init__(self, width: int = 800, height: int = 600, cell_size: int = 20):
+    def __init__(self, width: int = 800, height: int = 600, cell_size: int = 20, render_mode: str = "dirty",
+                 steps_per_frame: int = 1, frame_budget_ms: float = 12.0, worker_mode: Optional[str] = None,
+                 maze_file: Optional[str] = None, show_stats: bool = False):
+        """
+        :param steps_per_frame: maksymalna liczba kroków solvera na klatkę
+        :param frame_budget_ms: maksymalny czas kroków solvera w jednej klatce
+        :param worker_mode: None, 'thread' lub 'process' - gdzie uruchamiać solver
+        :param maze_file: plik labiryntu zapisywany klawiszem S i wczytywany klawiszem L
+        :param show_stats: włącza od startu pomiar solvera i nakładkę ze statystykami (klawisz T)
+        """
         logger.info("Inicjalizacja aplikacji MazeSolver")
-        pygame.init()
+        # Tylko potrzebne moduły pygame - bez dźwięku i joysticków
+        pygame.display.init()
+        pygame.font.init()
 
         # Podstawowe ustawienia
         self.width = width
@@ -60,18 +131,47 @@ class MazeSolver:
 
         # Inicjalizacja komponentów
         self.maze = Maze(self.grid_width, self.grid_height)
-        self.random_walk_solver = RandomWalkSolver(self.maze)
-        self.astar_solver = AStarSolver(self.maze)
-        self.current_solver = self.random_walk_solver
+        self.solvers: Dict[str, BaseSolver] = {}  # tworzone przy pierwszym wyborze algorytmu
+        self.current_solver = self.get_solver("random_walk")
+        self.solution_cache = SolutionCache()
+        self.solution_cache.watch(self.maze)
+        self.render_mode = render_mode
+        self.renderer = self.create_renderer(render_mode)
 
         # Stan aplikacji
-        self.current_algorithm = "random_walk"  # lub "astar"
+        self.current_algorithm = "random_walk"  # klucz z ALGORITHM_NAMES
         self.is_solving = False
         self.is_drawing = False
         self.is_erasing = False
         self.last_cell = None  # Ostatnio modyfikowana komórka
+        self.stroke_log = StrokeLog(logger)  # podsumowanie bieżącego pociągnięcia myszą
+        # Pędzel lewego przycisku: None - ściany, 1..MAX_COST - koszt malowanego terenu (klawisze 0-9)
+        self.brush_cost: Optional[int] = None
+
+        # Tempo rozwiązywania - niezależne od liczby klatek na sekundę
+        self.steps_per_frame = steps_per_frame
+        self.frame_budget_ms = frame_budget_ms
+        self.instant_mode = False  # rozwiązanie w całości w jednej klatce
+        self.startup_ms = 0.0  # czas od uruchomienia do pierwszej klatki (ustawiany w run())
+
+        # Rozwiązywanie w tle (wątek lub proces) zamiast w pętli zdarzeń
+        self.worker_mode = worker_mode
+        self.worker = None
+
+        # Pomiar pracy solvera i nakładka ze statystykami (klawisz T); None - bez pomiaru i bez narzutu
+        self.stats: Optional[StatsRecorder] = None
+        self.stats_font: Optional[pygame.font.Font] = None
+        self.stats_rect = pygame.Rect(0, 0, 0, 0)
+        if show_stats:
+            self.stats = StatsRecorder(self.current_solver, self.current_algorithm)
 
-        logger.info(f"Utworzono siatkę o wymiarach {self.grid_width}x{self.grid_height}")
+        # Generowanie labiryntów klawiszem G - kolejne generatory z kolejnymi ziarnami
+        self.generator_index = -1
+        self.generator_seed = 0
+
+        self.maze_file = Path(maze_file) if maze_file else DEFAULT_MAZE_FILE
+
+        logger.info("Utworzono siatkę o wymiarach %dx%d", self.grid_width, self.grid_height)
 
     def handle_events(self) -> bool:
         """Obsługa zdarzeń"""
@@ -100,68 +200,75 @@ class MazeSolver:
         if not self.maze.is_valid_position(x, y):
             return
 
+        # Edycja labiryntu przerywa rozwiązywanie w tle
+        if self.worker is not None:
+            self.stop_worker()
+
         if event.button == 1:  # Lewy przycisk
             self.is_drawing = True
-            self.is_erasing = self.maze.is_wall(x, y)
+            self.is_erasing = self.brush_cost is None and self.maze.is_wall(x, y)
 
-            if self.is_erasing:
+            # Pola zmienione w trakcie pociągnięcia trafiają do logu jako jedna linia przy puszczeniu przycisku
+            if self.brush_cost is not None:
+                self.maze.set_cost(x, y, self.brush_cost)
+                self.stroke_log.start(f"Malowanie terenu o koszcie {self.brush_cost}", (x, y))
+            elif self.is_erasing:
                 self.maze.remove_wall(x, y)
-                logger.info(f"Rozpoczęto usuwanie ścian od komórki ({x}, {y})")
+                self.stroke_log.start("Usuwanie ścian", (x, y))
             else:
                 self.maze.set_wall(x, y)
-                logger.info(f"Rozpoczęto rysowanie ścian od komórki ({x}, {y})")
+                self.stroke_log.start("Rysowanie ścian", (x, y))
 
             self.last_cell = (x, y)
+            self.repair_solution()
 
         elif event.button == 3:  # Prawy przycisk
             if self.maze.start_pos is None:
                 if not self.maze.is_wall(x, y) and (x, y) != self.maze.end_pos:
                     self.maze.set_start(x, y)
-                    logger.info(f"Ustawiono punkt startowy w komórce ({x}, {y})")
+                    logger.info("Ustawiono punkt startowy w komórce (%d, %d)", x, y)
             elif self.maze.end_pos is None:
                 if not self.maze.is_wall(x, y) and (x, y) != self.maze.start_pos:
                     self.maze.set_end(x, y)
-                    logger.info(f"Ustawiono punkt końcowy w komórce ({x}, {y})")
+                    logger.info("Ustawiono punkt końcowy w komórce (%d, %d)", x, y)
             else:
                 old_start = self.maze.start_pos
                 old_end = self.maze.end_pos
                 self.maze.start_pos = None
                 self.maze.end_pos = None
-                logger.info(
-                    f"Zresetowano punkty (start był w ({old_start[0]}, {old_start[1]}), koniec w ({old_end[0]}, {old_end[1]}))")
+                logger.info("Zresetowano punkty (start był w (%d, %d), koniec w (%d, %d))", *old_start, *old_end)
                 if not self.maze.is_wall(x, y):
                     self.maze.set_start(x, y)
-                    logger.info(f"Ustawiono nowy punkt startowy w komórce ({x}, {y})")
+                    logger.info("Ustawiono nowy punkt startowy w komórce (%d, %d)", x, y)
 
     def handle_mouse_motion(self, event: pygame.event.Event):
         """Obsługa ruchu myszy"""
         if self.is_drawing:
             x, y = self.get_grid_pos(event.pos)
             if self.maze.is_valid_position(x, y) and (x, y) != self.last_cell:
-                if self.is_erasing:
+                if self.brush_cost is not None:
+                    self.maze.set_cost(x, y, self.brush_cost)
+                elif self.is_erasing:
                     self.maze.remove_wall(x, y)
-                    logger.debug(f"Usunięto ścianę w komórce ({x}, {y})")
                 else:
                     self.maze.set_wall(x, y)
-                    logger.debug(f"Narysowano ścianę w komórce ({x}, {y})")
+                self.stroke_log.add((x, y))
                 self.last_cell = (x, y)
+                self.repair_solution()
 
     def handle_mouse_up(self, event: pygame.event.Event):
         """Obsługa puszczenia przycisku myszy"""
         if event.button == 1:  # Lewy przycisk
-            x, y = self.get_grid_pos(event.pos)
             self.is_drawing = False
             self.last_cell = None
-            if self.is_erasing:
-                logger.info(f"Zakończono usuwanie ścian na komórce ({x}, {y})")
-            else:
-                logger.info(f"Zakończono rysowanie ścian na komórce ({x}, {y})")
+            self.stroke_log.finish()
             self.is_erasing = False
 
     def handle_keyboard(self, event: pygame.event.Event):
         """Obsługa klawiatury"""
         if event.key == pygame.K_r:  # Reset
             logger.info("Resetowanie labiryntu - wszystkie ściany i punkty zostały usunięte")
+            self.stop_worker()
             self.maze.reset()
             self.current_solver.reset()
             self.is_solving = False
@@ -169,6 +276,57 @@ class MazeSolver:
             self.toggle_solving()
         elif event.key == pygame.K_a:  # Przełączanie algorytmu
             self.toggle_algorithm()
+        elif event.key == pygame.K_v:  # Przełączanie trybu rysowania
+            self.toggle_render_mode()
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):  # Przyspieszenie
+            self.change_speed(2)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):  # Spowolnienie
+            self.change_speed(0.5)
+        elif event.key == pygame.K_i:  # Tryb natychmiastowy
+            self.instant_mode = not self.instant_mode
+            logger.info("Tryb natychmiastowy: %s", 'włączony' if self.instant_mode else 'wyłączony')
+        elif event.key == pygame.K_w:  # Rozwiązywanie w tle
+            self.toggle_worker_mode()
+        elif event.key == pygame.K_g:  # Generowanie labiryntu
+            self.generate_maze()
+        elif event.key == pygame.K_s:  # Zapis labiryntu do pliku
+            self.save_maze_file()
+        elif event.key == pygame.K_l:  # Wczytanie labiryntu z pliku
+            self.load_maze_file()
+        elif event.key == pygame.K_t:  # Statystyki solvera
+            self.toggle_stats()
+        elif event.key == pygame.K_j:  # Zapis statystyk do pliku JSON
+            self.export_stats()
+        elif pygame.K_0 <= event.key <= pygame.K_9:  # Wybór pędzla
+            self.select_brush(event.key - pygame.K_0)
+
+    def select_brush(self, digit: int):
+        """
+        Wybiera pędzel lewego przycisku myszy
+        :param digit: 0 - ściany, 1 - zwykłe pole (usuwa teren), 2..MAX_COST - teren o takim koszcie
+        """
+        if digit > MAX_COST:
+            return
+        self.brush_cost = digit or None
+        if self.brush_cost is None:
+            logger.info("Pędzel: ściany")
+        else:
+            logger.info("Pędzel: teren o koszcie %d", self.brush_cost)
+
+    def repair_solution(self):
+        """Po edycji ścian naprawia rozwiązanie solvera przyrostowego, aby ścieżka była aktualna"""
+        solver = self.current_solver
+        if solver.incremental and not self.is_solving and solver.initialized:
+            solver.solve()
+
+    def get_solver(self, algorithm: str) -> BaseSolver:
+        """Zwraca solver algorytmu, tworząc go (i importując jego moduł) przy pierwszym użyciu"""
+        solver = self.solvers.get(algorithm)
+        if solver is None:
+            module, name = SOLVER_CLASSES[algorithm]
+            solver = getattr(importlib.import_module(module), name)(self.maze)
+            self.solvers[algorithm] = solver
+        return solver
 
     def get_grid_pos(self, pos: Tuple[int, int]) -> Tuple[int, int]:
         """Konwersja pozycji ekranowej na pozycję w siatce"""
@@ -177,104 +335,332 @@ class MazeSolver:
 
     def toggle_algorithm(self):
         """Przełączanie między algorytmami"""
-        if self.current_algorithm == "random_walk":
-            self.current_algorithm = "astar"
-            self.current_solver = self.astar_solver
-            logger.info("Przełączono na algorytm A*")
-        else:
-            self.current_algorithm = "random_walk"
-            self.current_solver = self.random_walk_solver
-            logger.info("Przełączono na algorytm Random Walk")
+        self.stop_worker()
+        algorithms = list(ALGORITHM_NAMES)
+        index = algorithms.index(self.current_algorithm)
+        self.current_algorithm = algorithms[(index + 1) % len(algorithms)]
+        self.current_solver = self.get_solver(self.current_algorithm)
+        logger.info("Przełączono na algorytm %s", ALGORITHM_NAMES[self.current_algorithm])
+
+        self.current_solver.reset()
+        self.is_solving = False
+        if self.stats is not None:
+            self.stats = StatsRecorder(self.current_solver, self.current_algorithm)
+
+    def generate_maze(self):
+        """Zastępuje labirynt wygenerowanym przez następny generator z listy"""
+        from generators import GENERATORS, generate
+
+        self.stop_worker()
+        generators = list(GENERATORS)
+        self.generator_index = (self.generator_index + 1) % len(generators)
+        name = generators[self.generator_index]
+        try:
+            generate(self.maze, name, self.generator_seed)
+        except ValueError as e:
+            logger.warning("Nie udało się wygenerować labiryntu (%s): %s", name, e)
+            return
+        logger.info("Wygenerowano labirynt generatorem %s (ziarno %d)", name, self.generator_seed)
+        self.generator_seed += 1
+        self.current_solver.reset()
+        self.is_solving = False
+
+    def save_maze_file(self):
+        """Zapisuje labirynt do pliku self.maze_file"""
+        from mazefile import save_maze
+
+        # Kodowanie bitowe zapisuje tylko ściany - koszty terenu wymagają bajtu na pole
+        encoding = "raw" if self.maze.has_terrain() else "bits"
+        try:
+            save_maze(self.maze, self.maze_file, encoding)
+        except OSError as e:
+            logger.error("Nie udało się zapisać labiryntu do %s: %s", self.maze_file, e)
+            return
+        logger.info("Zapisano labirynt do %s", self.maze_file)
+
+    def load_maze_file(self):
+        """
+        Wczytuje labirynt z pliku self.maze_file do bieżącej siatki.
+        Labirynt o innych wymiarach niż okno jest przycinany lub dopełniany pustymi polami.
+        """
+        from mazefile import MazeFileError, load_maze
+
+        try:
+            loaded = load_maze(self.maze_file)
+        except (OSError, MazeFileError) as e:
+            logger.error("Nie udało się wczytać labiryntu z %s: %s", self.maze_file, e)
+            return
+        self.stop_worker()
+        if (loaded.width, loaded.height) != (self.maze.width, self.maze.height):
+            logger.warning("Labirynt z pliku ma wymiary %dx%d, siatka okna %dx%d - nadmiar zostanie obcięty",
+                           loaded.width, loaded.height, self.maze.width, self.maze.height)
+
+        width = min(loaded.width, self.maze.width)
+        height = min(loaded.height, self.maze.height)
+        self.maze.start_pos = None
+        self.maze.end_pos = None
+        self.maze.grid.fill(0)
+        self.maze.grid[:height, :width] = loaded.grid[:height, :width]
+        self.maze.refresh()
+        if loaded.start_pos:
+            self.maze.set_start(*loaded.start_pos)
+        if loaded.end_pos:
+            self.maze.set_end(*loaded.end_pos)
+        del loaded
 
         self.current_solver.reset()
         self.is_solving = False
+        logger.info("Wczytano labirynt z %s", self.maze_file)
+
+    def change_speed(self, factor: float):
+        """Zmienia liczbę kroków solvera wykonywanych w jednej klatce"""
+        self.steps_per_frame = max(1, min(1_000_000, int(self.steps_per_frame * factor)))
+        logger.info("Liczba kroków na klatkę: %d", self.steps_per_frame)
+
+    def create_renderer(self, render_mode: str):
+        """Tworzy renderer dla podanego trybu rysowania"""
+        return RENDERERS[render_mode](self.screen, self.maze, self.colors, self.cell_size)
+
+    def toggle_render_mode(self):
+        """Przełączanie między trybami rysowania"""
+        modes = list(RENDERERS)
+        self.render_mode = modes[(modes.index(self.render_mode) + 1) % len(modes)]
+        self.renderer.close()
+        self.renderer = self.create_renderer(self.render_mode)
+        logger.info("Przełączono tryb rysowania na %s", self.render_mode)
+
+    def toggle_stats(self):
+        """Włącza lub wyłącza pomiar pracy solvera i nakładkę ze statystykami"""
+        if self.stats is None:
+            self.stats = StatsRecorder(self.current_solver, self.current_algorithm)
+            logger.info("Statystyki solvera: włączone")
+        else:
+            self.stats = None
+            # Nakładka zasłaniała pola - rysujemy je od nowa
+            self.stats_rect = pygame.Rect(0, 0, 0, 0)
+            self.renderer.invalidate()
+            logger.info("Statystyki solvera: wyłączone")
+
+    def export_stats(self):
+        """Zapisuje bieżące statystyki solvera do pliku JSON"""
+        if self.stats is None:
+            logger.warning("Statystyki solvera są wyłączone - włącz je klawiszem T")
+            return
+        if self.worker is not None:
+            logger.warning("Statystyki są niedostępne podczas rozwiązywania w tle")
+            return
+        try:
+            DEFAULT_STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            DEFAULT_STATS_FILE.write_text(self.stats.snapshot().to_json(), encoding="utf-8")
+        except OSError as e:
+            logger.error("Nie udało się zapisać statystyk do %s: %s", DEFAULT_STATS_FILE, e)
+            return
+        logger.info("Zapisano statystyki solvera do %s", DEFAULT_STATS_FILE)
+
+    def toggle_worker_mode(self):
+        """Przełączanie miejsca wykonywania solvera: pętla zdarzeń / wątek / proces"""
+        modes = [None] + list(WORKER_MODES)
+        self.stop_worker()
+        self.worker_mode = modes[(modes.index(self.worker_mode) + 1) % len(modes)]
+        logger.info("Rozwiązywanie w tle: %s", self.worker_mode or 'wyłączone')
+
+    def start_worker(self):
+        """Uruchamia bieżący solver w tle"""
+        from worker import WORKERS
+
+        self.worker = WORKERS[self.worker_mode](self.current_solver)
+        self.worker.start()
+
+    def stop_worker(self):
+        """Anuluje rozwiązywanie w tle, jeśli trwa"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self.is_solving = False
+            logger.info("Przerwano rozwiązywanie w tle")
 
     def toggle_solving(self):
         """Przełączanie stanu rozwiązywania"""
         if self.maze.is_complete():
             self.is_solving = not self.is_solving
             if self.is_solving:
+                entry = None
+                if self.current_solver.deterministic:
+                    entry = self.solution_cache.get(self.maze, self.current_algorithm)
+                if entry is not None:
+                    self.solution_cache.restore(self.current_solver, entry)
+                    self.is_solving = False
+                    logger.info("Wczytano zapamiętane rozwiązanie algorytmu %s", self.current_algorithm)
+                    return
                 self.current_solver.reset()
-                logger.info(f"Rozpoczęto rozwiązywanie algorytmem {self.current_algorithm}")
+                if self.stats is not None:
+                    self.stats.reset()
+                if not self.maze.are_connected(self.maze.start_pos, self.maze.end_pos):
+                    self.is_solving = False
+                    logger.warning("Punkt końcowy jest nieosiągalny z punktu startowego - brak ścieżki")
+                    return
+                if self.maze.has_terrain() and not self.current_solver.weighted:
+                    logger.warning("Algorytm %s pomija koszty terenu - ścieżka będzie najkrótsza, ale nie najtańsza",
+                                   self.current_algorithm)
+                if self.worker_mode:
+                    self.start_worker()
+                logger.info("Rozpoczęto rozwiązywanie algorytmem %s", self.current_algorithm)
+            elif self.worker is not None:
+                self.stop_worker()
             else:
                 logger.info("Zatrzymano rozwiązywanie")
         else:
             logger.warning("Nie można rozpocząć rozwiązywania - brak punktu startowego lub końcowego")
 
     def update(self):
-        """Aktualizacja stanu aplikacji"""
-        if self.is_solving:
-            if not self.current_solver.step():
-                self.is_solving = False
-                if self.current_solver.solved:
-                    logger.info(f"Znaleziono rozwiązanie używając algorytmu {self.current_algorithm}")
-                else:
-                    logger.info(f"Nie znaleziono rozwiązania używając algorytmu {self.current_algorithm}")
+        """
+        Aktualizacja stanu aplikacji - wykonuje tyle kroków solvera,
+        ile mieści się w limicie kroków i czasu na klatkę
+        """
+        if not self.is_solving:
+            return
+
+        solver = self.current_solver
+        if self.worker is not None:
+            self.worker.poll()
+            if self.worker.finished:
+                self.worker.apply_result(solver)
+                self.worker = None
+                self.finish_solving()
+            return
+
+        # Z włączonymi statystykami kroki wykonuje StatsRecorder, bez nich - bezpośrednio solver
+        runner = self.stats if self.stats is not None else solver
+        if self.instant_mode:
+            runner.solve()
+            self.finish_solving()
+            return
+
+        deadline = time.perf_counter() + self.frame_budget_ms / 1000
+        for _ in range(self.steps_per_frame):
+            if not runner.step():
+                self.finish_solving()
+                return
+            if time.perf_counter() >= deadline:
+                break
+
+    def finish_solving(self):
+        """Kończy rozwiązywanie i zapamiętuje wynik"""
+        self.is_solving = False
+        self.solution_cache.put(self.maze, self.current_algorithm, self.current_solver)
+        if self.current_solver.solved:
+            logger.info("Znaleziono rozwiązanie używając algorytmu %s", self.current_algorithm)
+        else:
+            logger.info("Nie znaleziono rozwiązania używając algorytmu %s", self.current_algorithm)
+        if self.stats is not None:
+            logger.info("Statystyki solvera: %s", json.dumps(self.stats.snapshot().to_dict()))
 
     def draw(self):
-        """Rysowanie interfejsu"""
-        self.screen.fill(self.colors.WHITE)
-
-        # Rysowanie siatki i ścian
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                rect = pygame.Rect(
-                    x * self.cell_size,
-                    y * self.cell_size,
-                    self.cell_size,
-                    self.cell_size
-                )
-                # Rysowanie ścian
-                if self.maze.is_wall(x, y):
-                    pygame.draw.rect(self.screen, self.colors.BLACK, rect)
-                # Rysowanie odwiedzonych pól
-                elif (x, y) in self.current_solver.visited:
-                    pygame.draw.rect(self.screen, self.colors.VISITED, rect)
-                # Rysowanie ścieżki
-                if (x, y) in self.current_solver.path:
-                    pygame.draw.rect(self.screen, self.colors.PATH, rect)
-                # Rysowanie siatki
-                pygame.draw.rect(self.screen, self.colors.GRAY, rect, 1)
-
-        # Rysowanie punktów startowego i końcowego
-        if self.maze.start_pos:
-            self.draw_point(self.maze.start_pos, self.colors.GREEN)
-        if self.maze.end_pos:
-            self.draw_point(self.maze.end_pos, self.colors.RED)
-
-        pygame.display.flip()
-
-    def draw_point(self, pos: Tuple[int, int], color: Tuple[int, int, int]):
-        """Rysowanie punktu (startowego/końcowego)"""
-        x, y = pos
-        rect = pygame.Rect(
-            x * self.cell_size,
-            y * self.cell_size,
-            self.cell_size,
-            self.cell_size
-        )
-        pygame.draw.rect(self.screen, color, rect)
-
-    def run(self):
-        """Główna pętla aplikacji"""
+        """Rysowanie interfejsu (tylko zmienione pola)"""
+        if self.worker is not None:
+            self.renderer.draw(self.worker.view)
+        else:
+            self.renderer.draw(self.current_solver)
+        if self.stats is not None:
+            self.draw_stats()
+
+    def draw_stats(self):
+        """Rysuje nakładkę ze statystykami solvera w lewym górnym rogu okna"""
+        if self.worker is not None:
+            # Solver pracuje w tle - jego struktur nie można bezpiecznie przeglądać
+            lines = [f"{self.current_algorithm}: rozwiązywanie w tle ({self.worker_mode})",
+                     f"rozwinięte: {self.worker.view.expanded}"]
+        else:
+            lines = self.stats.snapshot().lines()
+        if self.stats_font is None:
+            self.stats_font = pygame.font.Font(None, 20)
+        rendered = [self.stats_font.render(line, True, self.colors.WHITE) for line in lines]
+        line_height = self.stats_font.get_linesize()
+        rect = pygame.Rect(0, 0, max(text.get_width() for text in rendered) + 8, line_height * len(rendered) + 8)
+        # Tło nakładki tylko rośnie, żeby nie zostawały resztki dłuższych linii z poprzednich klatek
+        self.stats_rect = self.stats_rect.union(rect).clip(self.screen.get_rect())
+        self.screen.fill(self.colors.BLACK, self.stats_rect)
+        for i, text in enumerate(rendered):
+            self.screen.blit(text, (4, 4 + i * line_height))
+        pygame.display.update(self.stats_rect)
+
+    def run(self, max_frames: Optional[int] = None):
+        """
+        Główna pętla aplikacji
+        :param max_frames: liczba klatek, po której pętla się kończy (None - do zamknięcia okna)
+        """
         logger.info("Rozpoczęcie głównej pętli aplikacji")
         running = True
         clock = pygame.time.Clock()
+        frames = 0
 
         while running:
             running = self.handle_events()
             self.update()
             self.draw()
+            frames += 1
+            if frames == 1:
+                self.startup_ms = (time.perf_counter() - STARTED) * 1000
+                logger.info("Pierwsza klatka po %.0f ms", self.startup_ms)
+                close_splash()
+            if max_frames is not None and frames >= max_frames:
+                break
             clock.tick(60)
 
         logger.info("Zakończenie działania aplikacji")
         pygame.quit()
 
 
+def close_splash():
+    """Zamyka ekran powitalny wersji spakowanej PyInstallerem (poza nią nic nie robi)"""
+    try:
+        import pyi_splash
+    except ImportError:
+        return
+    pyi_splash.close()
+
+
+def parse_args():
+    """Parsowanie argumentów wiersza poleceń"""
+    parser = argparse.ArgumentParser(description="Maze Solver")
+    parser.add_argument("--width", type=int, default=800, help="szerokość okna w pikselach")
+    parser.add_argument("--height", type=int, default=600, help="wysokość okna w pikselach")
+    parser.add_argument("--cell-size", type=int, default=20, help="rozmiar pola w pikselach")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default=None,
+                        help="tryb rysowania (domyślnie surfarray dla pól mniejszych niż 4 px)")
+    parser.add_argument("--steps-per-frame", type=int, default=1, help="kroki solvera na klatkę")
+    parser.add_argument("--frame-budget-ms", type=float, default=12.0,
+                        help="maksymalny czas kroków solvera na klatkę w milisekundach")
+    parser.add_argument("--worker", choices=sorted(WORKER_MODES), default=None,
+                        help="rozwiązywanie w tle: w wątku lub w osobnym procesie")
+    parser.add_argument("--maze-file", default=None,
+                        help="plik labiryntu dla klawiszy S/L (domyślnie mazes/maze.maze)")
+    parser.add_argument("--stats", action="store_true",
+                        help="pomiar solvera i nakładka ze statystykami od startu (klawisz T)")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="wypisuje czas do pierwszej klatki (JSON) i kończy działanie")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    import multiprocessing
+
+    # Wymagane przez procesy robocze w wersji spakowanej PyInstallerem
+    multiprocessing.freeze_support()
     try:
-        app = MazeSolver()
-        app.run()
+        args = parse_args()
+        render_mode = args.renderer or ("surfarray" if args.cell_size < 4 else "dirty")
+        app = MazeSolver(args.width, args.height, args.cell_size, render_mode,
+                         args.steps_per_frame, args.frame_budget_ms, args.worker, args.maze_file,
+                         args.stats)
+        app.run(max_frames=1 if args.startup_time else None)
+        if args.startup_time:
+            # Najpierw zapisujemy logi z kolejki, żeby nie przeplatały się z wynikiem
+            logger.stop()
+            print(json.dumps({"startup_ms": round(app.startup_ms, 1)}))
     except Exception as e:
         logger.exception("Wystąpił nieoczekiwany błąd:")
         sys.exit(1)
+    finally:
+        # Zapisuje rekordy, które zostały w kolejce logowania
+        logger.stop()
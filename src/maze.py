@@ -1,30 +1,241 @@
+import hashlib
 import logging
+from collections import deque
 from pathlib import Path
-from typing import List, Tuple, Optional, Set
+from typing import Iterator, List, Tuple, Optional, Set, Callable, Union
 
 import numpy as np
 
+# Kierunki ruchu w kolejności zwracanej przez get_neighbors; indeks kierunku to numer bitu w masce sąsiadów
+DIRECTIONS: List[Tuple[int, int]] = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+# Dla każdej 4-bitowej maski - przesunięcia (dx, dy) do dostępnych sąsiadów
+MASK_OFFSETS: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(
+    tuple(d for bit, d in enumerate(DIRECTIONS) if mask >> bit & 1)
+    for mask in range(16)
+)
+
+# Dostępne sposoby przechowywania siatki: bajt na pole, bool na pole lub bit na pole
+STORAGES = ("uint8", "bool", "bits")
+
+# Wartości pól siatki: 0 - wolne pole (koszt wejścia 1), 1 - ściana, 2..MAX_COST - teren o takim koszcie wejścia.
+# Koszty terenu mieszczą się tylko w siatce 'uint8'.
+WALL = 1
+MAX_COST = 9
+
+# Limit pól przeglądanych przez lokalne sprawdzenie, czy nowa ściana rozdzieliła składową;
+# po jego przekroczeniu etykiety są przeliczane od nowa przy następnym zapytaniu
+SPLIT_CHECK_LIMIT = 4096
+
+
+def compute_neighbor_mask(passable: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Wyznacza maskę sąsiadów (bity wg DIRECTIONS) dla tablicy przechodniości pól
+    :param passable: tablica bool (lub 0/1) o kształcie siatki - True dla pól bez ściany
+    :param out: opcjonalna tablica uint8 na wynik
+    :return: Maska sąsiadów o kształcie siatki
+    """
+    passable = passable.astype(np.uint8)
+    mask = np.zeros(passable.shape, dtype=np.uint8) if out is None else out
+    mask.fill(0)
+    mask[:-1, :] |= passable[1:, :]
+    mask[:, :-1] |= passable[:, 1:] << 1
+    mask[1:, :] |= passable[:-1, :] << 2
+    mask[:, 1:] |= passable[:, :-1] << 3
+    return mask
+
+
+def label_components(passable: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Etykietuje spójne składowe wolnych pól (sąsiedztwo jak w DIRECTIONS).
+    Union-find wykonywany jest wektorowo: w każdej rundzie dla wszystkich krawędzi
+    między różnymi drzewami większy korzeń podczepiany jest pod mniejszy, a drzewa
+    są spłaszczane skokami wskaźników.
+    :param passable: tablica bool o kształcie siatki - True dla pól bez ściany
+    :return: Tablica etykiet int32 (0 - ściana, 1..n - składowe) i liczba składowych n
+    """
+    height, width = passable.shape
+    index = np.arange(height * width, dtype=np.int32).reshape(height, width)
+    horizontal = passable[:, :-1] & passable[:, 1:]
+    vertical = passable[:-1, :] & passable[1:, :]
+    u = np.concatenate([index[:, :-1][horizontal], index[:-1, :][vertical]])
+    v = np.concatenate([index[:, 1:][horizontal], index[1:, :][vertical]])
+
+    parent = index.ravel().copy()
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        u, v, pu, pv = u[differ], v[differ], pu[differ], pv[differ]
+        if not u.size:
+            break
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    labels = np.zeros((height, width), dtype=np.int32)
+    roots, inverse = np.unique(parent.reshape(height, width)[passable], return_inverse=True)
+    labels[passable] = inverse + 1
+    return labels, roots.size
+
+
+class PackedGrid:
+    """
+    Siatka ścian zapisana po jednym bicie na pole (wiersze dopełnione do pełnego bajtu,
+    kolejność bitów jak w numpy.packbits). Udostępnia podzbiór interfejsu tablicy NumPy
+    używany przez Maze: indeksowanie [y, x], przypisania wierszy i wycinków, porównania.
+    Odczytywane wartości to 0 (wolne pole) i 1 (ściana).
+    """
+
+    def __init__(self, width: int, height: int, bits: Optional[np.ndarray] = None):
+        """
+        :param bits: istniejący bufor uint8 o kształcie (height, (width + 7) // 8) - używany bez kopiowania
+        """
+        self.width = width
+        self.height = height
+        row_bytes = (width + 7) // 8
+        if bits is None:
+            bits = np.zeros((height, row_bytes), dtype=np.uint8)
+        elif bits.shape != (height, row_bytes):
+            raise ValueError(f"Bufor o kształcie {bits.shape} nie pasuje do siatki {width}x{height}")
+        self.bits = bits
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def __len__(self) -> int:
+        return self.height
+
+    def cell(self, x: int, y: int) -> int:
+        """Wartość pola (x, y) bez sprawdzania zakresu: 1 - ściana, 0 - wolne pole"""
+        return self.bits.item(y, x >> 3) >> (7 - (x & 7)) & 1
+
+    def _split_key(self, key) -> Tuple:
+        """Rozdziela indeks na część wierszową i kolumnową"""
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError("PackedGrid obsługuje tylko indeksy [y] lub [y, x]")
+            return key
+        return key, slice(None)
+
+    def __getitem__(self, key):
+        rows, cols = self._split_key(key)
+        if isinstance(rows, (int, np.integer)) and isinstance(cols, (int, np.integer)):
+            if cols < 0:
+                cols += self.width
+            if not 0 <= cols < self.width:
+                raise IndexError(f"Kolumna {cols} poza zakresem siatki")
+            return self.bits.item(rows, cols >> 3) >> (7 - (cols & 7)) & 1
+        return np.unpackbits(self.bits[rows], axis=-1, count=self.width)[..., cols]
+
+    def __setitem__(self, key, value):
+        rows, cols = self._split_key(key)
+        if isinstance(rows, (int, np.integer)) and isinstance(cols, (int, np.integer)):
+            if cols < 0:
+                cols += self.width
+            if not 0 <= cols < self.width:
+                raise IndexError(f"Kolumna {cols} poza zakresem siatki")
+            bit = np.uint8(1 << (7 - (cols & 7)))
+            if value == 1:
+                self.bits[rows, cols >> 3] |= bit
+            else:
+                self.bits[rows, cols >> 3] &= ~bit
+            return
+        # Ogólny przypadek: rozpakowanie dotkniętych wierszy, przypisanie i ponowne spakowanie
+        block = np.unpackbits(self.bits[rows], axis=-1, count=self.width)
+        block[..., cols] = value
+        self.bits[rows] = np.packbits(block == 1, axis=-1)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        grid = np.unpackbits(self.bits, axis=-1, count=self.width)
+        return grid if dtype is None else grid.astype(dtype)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for y in range(self.height):
+            yield self[y]
+
+    def __eq__(self, other):
+        return np.asarray(self) == other
+
+    def __ne__(self, other):
+        return np.asarray(self) != other
+
+    def ravel(self) -> np.ndarray:
+        return np.asarray(self).ravel()
+
+    def fill(self, value: int):
+        """Wypełnia całą siatkę ścianami (1) lub wolnymi polami"""
+        self.bits.fill(0xFF if value == 1 else 0)
+
+    def copy(self) -> "PackedGrid":
+        return PackedGrid(self.width, self.height, self.bits.copy())
+
+
+def allocate_grid(width: int, height: int, storage: str) -> Union[np.ndarray, PackedGrid]:
+    """
+    Tworzy pustą siatkę w wybranym sposobie przechowywania
+    :param storage: 'uint8', 'bool' lub 'bits'
+    """
+    if storage == "bits":
+        return PackedGrid(width, height)
+    if storage not in STORAGES:
+        raise ValueError(f"Nieznany sposób przechowywania siatki: {storage}")
+    return np.zeros((height, width), dtype=storage)
+
 
 class Maze:
     """Klasa reprezentująca labirynt"""
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, storage: str = "uint8",
+                 grid: Union[np.ndarray, PackedGrid, None] = None):
         """
         Inicjalizacja labiryntu
         :param width: szerokość labiryntu w komórkach
         :param height: wysokość labiryntu w komórkach
+        :param storage: sposób przechowywania siatki - 'uint8' (domyślnie), 'bool' lub 'bits'
+                        (bit na pole, bez zapamiętanej maski sąsiadów)
+        :param grid: istniejąca siatka zgodna ze storage (np. zmapowana z pliku), używana bez kopiowania
         """
         self.width = width
         self.height = height
-        self.grid = np.zeros((height, width), dtype=int)
+        self.storage = storage
+        if grid is None:
+            grid = allocate_grid(width, height, storage)
+        elif grid.shape != (height, width):
+            raise ValueError(f"Siatka o kształcie {grid.shape} nie pasuje do labiryntu {width}x{height}")
+        self.grid = grid
+        # Maska dostępnych kierunków dla każdego pola (bity wg DIRECTIONS), liczona przy pierwszym użyciu;
+        # przy siatce bitowej nie jest przechowywana, bo zajmowałaby 8 razy więcej niż sama siatka
+        self._neighbor_mask: Optional[np.ndarray] = None
         self.start_pos: Optional[Tuple[int, int]] = None
         self.end_pos: Optional[Tuple[int, int]] = None
         self.visited: Set[Tuple[int, int]] = set()
         self.path: List[Tuple[int, int]] = []
+        # Obserwatorzy zmian siatki: dostają zmienione pole (x, y) albo None dla całej siatki
+        self._change_listeners: List[Callable[[Optional[Tuple[int, int]]], None]] = []
+        self._content_hash: Optional[bytes] = None
+        # Etykiety spójnych składowych (0 - ściana), liczone przy pierwszym zapytaniu;
+        # usunięcie ściany scala etykiety przez union-find, postawienie ściany sprawdzane jest lokalnie
+        self._components: Optional[np.ndarray] = None
+        self._component_parent: List[int] = []
+        # Liczba pól o każdej wartości siatki (do min_cost i has_terrain), liczona przy pierwszym zapytaniu
+        self._value_counts: Optional[np.ndarray] = None
 
     def reset(self):
         """Resetuje stan labiryntu"""
         self.grid.fill(0)
+        self.refresh()
         self.start_pos = None
         self.end_pos = None
         self.visited.clear()
@@ -40,7 +251,8 @@ class Maze:
         # Nie pozwalamy na stawianie ścian na punktach start/koniec
         if (x, y) in [self.start_pos, self.end_pos]:
             return False
-        self.grid[y][x] = 1
+        if self.grid[y, x] != 1:
+            self._set_value(x, y, WALL)
         return True
 
     def remove_wall(self, x: int, y: int) -> bool:
@@ -50,9 +262,82 @@ class Maze:
         """
         if not self.is_valid_position(x, y):
             return False
-        self.grid[y][x] = 0
+        if self.grid[y, x] == 1:
+            self._set_value(x, y, 0)
         return True
 
+    def set_cost(self, x: int, y: int, cost: int) -> bool:
+        """
+        Ustawia koszt wejścia na pole (usuwa ścianę, jeśli tam była)
+        :param cost: koszt od 1 (zwykłe wolne pole) do MAX_COST
+        :return: True, jeśli udało się ustawić koszt
+        """
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"Koszt pola musi mieścić się w zakresie 1..{MAX_COST}")
+        if cost > 1 and self.storage != "uint8":
+            raise ValueError(f"Siatka '{self.storage}' nie przechowuje kosztów terenu")
+        if not self.is_valid_position(x, y):
+            return False
+        value = 0 if cost == 1 else cost
+        if self.grid[y, x] != value:
+            self._set_value(x, y, value)
+        return True
+
+    def cost(self, x: int, y: int) -> int:
+        """Koszt wejścia na pole (0 dla ściany)"""
+        value = int(self.grid[y, x])
+        if value == WALL:
+            return 0
+        return value or 1
+
+    def step_costs(self) -> np.ndarray:
+        """Koszty wejścia na pola całej siatki jako tablica uint8 (0 dla ścian)"""
+        grid = np.asarray(self.grid, dtype=np.uint8)
+        return np.where(grid == 0, 1, np.where(grid == WALL, 0, grid)).astype(np.uint8)
+
+    def path_cost(self, path: List[Tuple[int, int]]) -> int:
+        """Suma kosztów wejścia na kolejne pola ścieżki (bez pola początkowego)"""
+        if len(path) < 2:
+            return 0
+        if not self.has_terrain():
+            return len(path) - 1
+        xs, ys = np.array(path[1:], dtype=np.int64).T
+        values = np.asarray(self.grid[ys, xs], dtype=np.int64)
+        return int(np.where(values == 0, 1, values).sum())
+
+    def _counts(self) -> np.ndarray:
+        """Liczba pól o każdej wartości siatki"""
+        if self._value_counts is None:
+            self._value_counts = np.bincount(np.asarray(self.grid, dtype=np.uint8).ravel(), minlength=MAX_COST + 1)
+        return self._value_counts
+
+    def min_cost(self) -> int:
+        """Najmniejszy koszt wejścia na wolne pole (mnożnik dopuszczalnej heurystyki)"""
+        # Tylko siatka uint8 przechowuje teren - pozostałych nie kopiujemy do zliczania wartości
+        if self.storage != "uint8":
+            return 1
+        counts = self._counts()
+        if counts[0]:
+            return 1
+        terrain = np.flatnonzero(counts[2:])
+        return int(terrain[0]) + 2 if terrain.size else 1
+
+    def has_terrain(self) -> bool:
+        """Sprawdza, czy jakieś pole ma koszt wejścia większy niż 1"""
+        return self.storage == "uint8" and bool(self._counts()[2:].any())
+
+    def _set_value(self, x: int, y: int, value: int):
+        """Zmienia wartość pola siatki i aktualizuje struktury pomocnicze"""
+        old = int(self.grid[y, x])
+        self.grid[y, x] = value
+        if self._value_counts is not None:
+            self._value_counts[old] -= 1
+            self._value_counts[value] += 1
+        if (old == WALL) != (value == WALL):
+            self._update_neighbor_mask(x, y)
+            self._update_components(x, y)
+        self._notify_change((x, y))
+
     def set_start(self, x: int, y: int) -> bool:
         """
         Ustawia punkt startowy
@@ -81,7 +366,7 @@ class Maze:
         """Sprawdza, czy w danej pozycji jest ściana"""
         if not self.is_valid_position(x, y):
             return True
-        return self.grid[y][x] == 1
+        return self.grid[y, x] == 1
 
     def is_valid_position(self, x: int, y: int) -> bool:
         """Sprawdza, czy pozycja mieści się w granicach labiryntu"""
@@ -92,12 +377,216 @@ class Maze:
         Zwraca listę sąsiednich pozycji, do których można się przemieścić
         :return: Lista krotek (x, y) reprezentujących dostępne pozycje
         """
-        neighbors = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # prawo, dół, lewo, góra
-            new_x, new_y = x + dx, y + dy
-            if self.is_valid_position(new_x, new_y) and not self.is_wall(new_x, new_y):
-                neighbors.append((new_x, new_y))
-        return neighbors
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return []
+        mask = self.neighbor_mask
+        if mask is None:
+            cell = self.grid.cell
+            return [(x + dx, y + dy) for dx, dy in DIRECTIONS
+                    if 0 <= x + dx < self.width and 0 <= y + dy < self.height and not cell(x + dx, y + dy)]
+        return [(x + dx, y + dy) for dx, dy in MASK_OFFSETS[mask[y, x]]]
+
+    def refresh(self):
+        """
+        Przelicza struktury pomocnicze i powiadamia obserwatorów o zmianie całej siatki.
+        Należy ją wywołać po bezpośredniej modyfikacji self.grid.
+        """
+        self.rebuild_neighbor_mask()
+        self._components = None
+        self._value_counts = None
+        self._notify_change(None)
+
+    def add_change_listener(self, listener: Callable[[Optional[Tuple[int, int]]], None]):
+        """
+        Rejestruje obserwatora zmian siatki
+        :param listener: funkcja wywoływana ze zmienionym polem (x, y) lub None, gdy zmieniła się cała siatka
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[Optional[Tuple[int, int]]], None]):
+        """Wyrejestrowuje obserwatora zmian siatki"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self, pos: Optional[Tuple[int, int]]):
+        """Unieważnia skrót zawartości i powiadamia obserwatorów o zmianie"""
+        self._content_hash = None
+        for listener in list(self._change_listeners):
+            listener(pos)
+
+    def content_hash(self) -> bytes:
+        """
+        Zwraca skrót zawartości siatki (wymiary i ściany).
+        Skrót jest zapamiętywany do następnej zmiany siatki.
+        """
+        if self._content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            data = self.grid.bits if isinstance(self.grid, PackedGrid) else self.grid
+            digest.update(f"{self.width}x{self.height}:{self.storage}".encode())
+            digest.update(np.ascontiguousarray(data).data)
+            self._content_hash = digest.digest()
+        return self._content_hash
+
+    @property
+    def neighbor_mask(self) -> Optional[np.ndarray]:
+        """Maska sąsiadów całej siatki, liczona przy pierwszym użyciu (None przy siatce bitowej)"""
+        if self._neighbor_mask is None and self.storage != "bits":
+            self._neighbor_mask = compute_neighbor_mask(self.grid != 1)
+        return self._neighbor_mask
+
+    def rebuild_neighbor_mask(self):
+        """Przelicza od nowa maskę sąsiadów całej siatki (jeśli była już policzona)"""
+        if self._neighbor_mask is not None:
+            compute_neighbor_mask(self.grid != 1, out=self._neighbor_mask)
+
+    def neighbor_mask_array(self) -> np.ndarray:
+        """
+        Zwraca maskę sąsiadów całej siatki. Przy siatce bitowej maska jest liczona
+        na żądanie (nie jest zapamiętywana ani aktualizowana przy zmianach ścian).
+        """
+        mask = self.neighbor_mask
+        if mask is not None:
+            return mask
+        return compute_neighbor_mask(self.grid != 1)
+
+    def _update_neighbor_mask(self, x: int, y: int):
+        """Aktualizuje maski sąsiadów pola (x, y) po zmianie jego przechodniości"""
+        mask = self._neighbor_mask
+        if mask is None:
+            # Maska jeszcze nie policzona - powstanie z aktualnej siatki przy pierwszym użyciu
+            return
+        passable = self.grid[y, x] != 1
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                # Sąsiad widzi pole (x, y) w kierunku przeciwnym
+                opposite = 1 << ((bit + 2) % 4)
+                if passable:
+                    mask[ny, nx] |= opposite
+                else:
+                    mask[ny, nx] &= ~opposite & 0xF
+
+    def component_labels(self) -> np.ndarray:
+        """
+        Zwraca etykiety spójnych składowych o kształcie siatki (0 - ściana).
+        Przy siatce bitowej etykiety liczone są z rozpakowanej siatki i zajmują 32 razy więcej niż ona.
+        """
+        if self._components is None:
+            self._components, count = label_components(self.grid != 1)
+            self._component_parent = list(range(count + 1))
+        elif any(parent != label for label, parent in enumerate(self._component_parent)):
+            # Zastępujemy scalone etykiety ich reprezentantami
+            roots = np.array([self._find_component(label) for label in range(len(self._component_parent))],
+                             dtype=np.int32)
+            self._components = roots[self._components]
+            self._component_parent = list(range(len(self._component_parent)))
+        return self._components
+
+    def component_of(self, x: int, y: int) -> int:
+        """Etykieta spójnej składowej pola (0 - ściana lub pole spoza siatki)"""
+        if self.is_wall(x, y):
+            return 0
+        if self._components is None:
+            self.component_labels()
+        return self._find_component(int(self._components[y, x]))
+
+    def are_connected(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """Sprawdza, czy między polami a i b istnieje ścieżka (po zbudowaniu etykiet - w czasie stałym)"""
+        if self.is_wall(*a) or self.is_wall(*b):
+            return False
+        return self.component_of(*a) == self.component_of(*b)
+
+    def _find_component(self, label: int) -> int:
+        """Reprezentant etykiety w union-find scaleń (z kompresją ścieżki przez połowienie)"""
+        parent = self._component_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def _update_components(self, x: int, y: int):
+        """Aktualizuje etykiety składowych po zmianie przechodniości pola (x, y)"""
+        labels = self._components
+        if labels is None:
+            return
+        neighbors = self.get_neighbors(x, y)
+        if self.grid[y, x] == 1:
+            labels[y, x] = 0
+            # Ściana z co najwyżej jednym wolnym sąsiadem nie może rozdzielić składowej
+            if len(neighbors) < 2:
+                return
+            regions = self._split_regions(neighbors)
+            if regions is None:
+                self._components = None
+                return
+            # Odcięte obszary dostają nowe etykiety, reszta składowej zachowuje dotychczasową
+            for region in regions:
+                label = len(self._component_parent)
+                self._component_parent.append(label)
+                xs, ys = zip(*region)
+                labels[list(ys), list(xs)] = label
+            return
+        roots = {self._find_component(int(labels[ny, nx])) for nx, ny in neighbors}
+        if roots:
+            target = min(roots)
+            for root in roots:
+                self._component_parent[root] = target
+        else:
+            target = len(self._component_parent)
+            self._component_parent.append(target)
+        labels[y, x] = target
+
+    def _split_regions(self, starts: List[Tuple[int, int]]) -> Optional[List[List[Tuple[int, int]]]]:
+        """
+        Sprawdza lokalnie, czy nowa ściana rozdzieliła składową. Przeszukiwania BFS od wszystkich
+        wolnych sąsiadów ściany rosną na przemian po jednym polu i łączą się po spotkaniu;
+        przeszukiwanie, które wyczerpie kolejkę bez spotkania, obeszło cały odcięty obszar.
+        :param starts: wolni sąsiedzi nowej ściany (co najmniej dwóch)
+        :return: Pola odciętych obszarów (pusta lista, jeśli składowa się nie rozpadła)
+                 albo None, gdy limit SPLIT_CHECK_LIMIT wyczerpał się przed rozstrzygnięciem
+        """
+        owner = {pos: i for i, pos in enumerate(starts)}
+        group = list(range(len(starts)))
+        queues = [deque([pos]) for pos in starts]
+        regions: List[List[Tuple[int, int]]] = [[pos] for pos in starts]
+
+        def find(i: int) -> int:
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        budget = SPLIT_CHECK_LIMIT
+        while True:
+            roots = {find(i) for i in range(len(starts))}
+            if len(roots) == 1:
+                return []
+            growing = {find(i) for i, queue in enumerate(queues) if queue}
+            if len(growing) <= 1:
+                break
+            for i, queue in enumerate(queues):
+                if not queue:
+                    continue
+                for neighbor in self.get_neighbors(*queue.popleft()):
+                    j = owner.get(neighbor)
+                    if j is None:
+                        owner[neighbor] = i
+                        regions[i].append(neighbor)
+                        queue.append(neighbor)
+                        budget -= 1
+                    elif find(i) != find(j):
+                        group[find(j)] = find(i)
+            if budget <= 0:
+                return None
+
+        # Zamknięte obszary są odcięte; jeśli zamknęły się wszystkie, największy zachowuje etykietę
+        closed = {root: [] for root in roots - growing}
+        for i, region in enumerate(regions):
+            if find(i) in closed:
+                closed[find(i)].extend(region)
+        result = list(closed.values())
+        if not growing:
+            result.remove(max(result, key=len))
+        return result
 
     def is_complete(self) -> bool:
         """Sprawdza, czy labirynt jest gotowy do rozwiązania"""
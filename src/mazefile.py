@@ -0,0 +1,173 @@
+"""
+Binarny format pliku labiryntu.
+
+Plik składa się z nagłówka (HEADER) i danych siatki zapisanych wiersz po wierszu:
+- ENCODING_BITS: 1 bit na pole (1 - ściana), każdy wiersz dopełniony do pełnego bajtu,
+- ENCODING_RAW: 1 bajt na pole (wartość pola siatki, razem z kosztami terenu).
+
+Wczytywanie mapuje plik do pamięci (numpy.memmap), więc dane czytane są z dysku
+dopiero przy pierwszym dostępie do danej strony pliku.
+"""
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from maze import Maze, PackedGrid
+
+MAGIC = b"MAZE"
+VERSION = 1
+
+ENCODING_BITS = 0
+ENCODING_RAW = 1
+ENCODINGS = {"bits": ENCODING_BITS, "raw": ENCODING_RAW}
+
+# magic, wersja, kodowanie, zarezerwowane, szerokość, wysokość, start (x, y), koniec (x, y)
+HEADER = struct.Struct("<4sHBBIIiiii")
+# Brak punktu start/koniec zapisujemy jako (-1, -1)
+NO_POINT = (-1, -1)
+
+PathLike = Union[str, Path]
+
+
+class MazeFileError(ValueError):
+    """Błąd formatu pliku labiryntu"""
+
+
+@dataclass
+class MazeHeader:
+    """Nagłówek pliku labiryntu"""
+    version: int
+    encoding: int
+    width: int
+    height: int
+    start: Optional[Tuple[int, int]]
+    end: Optional[Tuple[int, int]]
+
+    @property
+    def row_bytes(self) -> int:
+        """Liczba bajtów jednego wiersza siatki w pliku"""
+        if self.encoding == ENCODING_BITS:
+            return (self.width + 7) // 8
+        return self.width
+
+    @property
+    def data_size(self) -> int:
+        """Rozmiar danych siatki w bajtach"""
+        return self.row_bytes * self.height
+
+    def pack(self) -> bytes:
+        """Zwraca nagłówek w postaci binarnej"""
+        start = self.start if self.start is not None else NO_POINT
+        end = self.end if self.end is not None else NO_POINT
+        return HEADER.pack(MAGIC, self.version, self.encoding, 0, self.width, self.height, *start, *end)
+
+
+def read_header(path: PathLike) -> MazeHeader:
+    """
+    Odczytuje i sprawdza nagłówek pliku labiryntu
+    :return: Nagłówek pliku
+    """
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise MazeFileError(f"{path}: plik jest za krótki na nagłówek labiryntu")
+
+    magic, version, encoding, _, width, height, sx, sy, ex, ey = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise MazeFileError(f"{path}: to nie jest plik labiryntu")
+    if version > VERSION:
+        raise MazeFileError(f"{path}: nieobsługiwana wersja formatu {version}")
+    if encoding not in ENCODINGS.values():
+        raise MazeFileError(f"{path}: nieznane kodowanie siatki {encoding}")
+    if width < 1 or height < 1:
+        raise MazeFileError(f"{path}: nieprawidłowe wymiary {width}x{height}")
+
+    header = MazeHeader(
+        version=version,
+        encoding=encoding,
+        width=width,
+        height=height,
+        start=None if (sx, sy) == NO_POINT else (sx, sy),
+        end=None if (ex, ey) == NO_POINT else (ex, ey),
+    )
+    if os.path.getsize(path) < HEADER.size + header.data_size:
+        raise MazeFileError(f"{path}: plik jest ucięty")
+    return header
+
+
+def save_rows(path: PathLike, width: int, height: int, rows: Iterable[np.ndarray],
+              start: Optional[Tuple[int, int]] = None, end: Optional[Tuple[int, int]] = None,
+              encoding: str = "bits"):
+    """
+    Zapisuje labirynt podawany wiersz po wierszu (np. z iter_ellers_rows), bez całej siatki w pamięci
+    :param rows: kolejne wiersze siatki (wartości pól, 1 - ściana)
+    :param encoding: 'bits' (1 bit na pole) lub 'raw' (1 bajt na pole)
+    """
+    path = Path(path)
+    header = MazeHeader(VERSION, ENCODINGS[encoding], width, height, start, end)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Zapis do pliku tymczasowego i podmiana - przerwany zapis nie psuje poprzedniego pliku
+    temp_path = path.with_name(path.name + ".tmp")
+    written = 0
+    with open(temp_path, "wb") as f:
+        f.write(header.pack())
+        for row in rows:
+            row = np.asarray(row)
+            if header.encoding == ENCODING_BITS:
+                f.write(np.packbits(row == 1).tobytes())
+            else:
+                f.write(row.astype(np.uint8).tobytes())
+            written += 1
+    if written != height:
+        temp_path.unlink()
+        raise ValueError(f"Oczekiwano {height} wierszy, otrzymano {written}")
+    os.replace(temp_path, path)
+
+
+def save_maze(maze: Maze, path: PathLike, encoding: str = "bits"):
+    """
+    Zapisuje labirynt do pliku
+    :param encoding: 'bits' (1 bit na pole, bez kosztów terenu) lub 'raw' (1 bajt na pole)
+    """
+    save_rows(path, maze.width, maze.height, iter(maze.grid), maze.start_pos, maze.end_pos, encoding)
+
+
+def load_maze(path: PathLike, mode: str = "c", storage: Optional[str] = None) -> Maze:
+    """
+    Wczytuje labirynt z pliku, mapując dane siatki do pamięci.
+    W domyślnym sposobie przechowywania dane z pliku stają się siatką bez kopiowania:
+    kodowanie 'raw' - tablicą uint8, kodowanie 'bits' - siatką bitową (PackedGrid).
+    Samo wczytanie czyta tylko nagłówek; strony siatki czytane są przy pierwszym dostępie
+    (maska sąsiadów powstaje przy pierwszym rozwiązywaniu).
+    :param mode: tryb numpy.memmap: 'c' - zmiany tylko w pamięci, 'r+' - zmiany zapisywane do pliku
+    :param storage: sposób przechowywania siatki (None - zgodny z kodowaniem pliku, bez kopiowania)
+    :return: Wczytany labirynt
+    """
+    header = read_header(path)
+    native = "bits" if header.encoding == ENCODING_BITS else "uint8"
+    storage = storage or native
+    data = np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER.size,
+                     shape=(header.height, header.row_bytes))
+    grid = PackedGrid(header.width, header.height, data) if header.encoding == ENCODING_BITS else data
+    if storage == native:
+        # Bez alokacji i bez przeglądania siatki - maska sąsiadów i etykiety liczone są przy pierwszym użyciu
+        maze = Maze(header.width, header.height, storage, grid=grid)
+    else:
+        maze = Maze(header.width, header.height, storage)
+        if storage == "uint8":
+            maze.grid[:] = np.asarray(grid)
+        else:
+            # Siatki 'bool' i 'bits' przechowują tylko ściany - koszty terenu przepadają
+            maze.grid[:] = np.asarray(grid) == 1
+        del grid, data
+        maze.refresh()
+
+    if header.start is not None:
+        maze.set_start(*header.start)
+    if header.end is not None:
+        maze.set_end(*header.end)
+    return maze
@@ -0,0 +1,128 @@
+"""
+Zapytania wiele-do-wielu na jednym labiryncie.
+
+Zamiast uruchamiać solver osobno dla każdej pary (start, cel), mapa odległości
+BFS liczona jest raz i odpowiada na dowolną liczbę zapytań o cele. Wszystkie
+zapytania korzystają z tej samej maski sąsiadów labiryntu.
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from maze import Maze
+from solver import descend, distance_layers
+
+
+class DistanceQuery:
+    """
+    Mapa odległości od jednego lub wielu pól źródłowych.
+    Mapa liczona jest przy pierwszym zapytaniu i przeliczana dopiero po zmianie ścian labiryntu.
+    """
+
+    def __init__(self, maze: Maze, sources: Optional[Iterable[Tuple[int, int]]] = None):
+        """
+        :param maze: labirynt
+        :param sources: pola źródłowe (domyślnie punkt startowy labiryntu); przy wielu źródłach
+                        odległość pola to odległość do najbliższego z nich
+        """
+        self.maze = maze
+        self.sources = list(sources) if sources is not None else [maze.start_pos]
+        if not self.sources or any(s is None or maze.is_wall(*s) for s in self.sources):
+            raise ValueError("Pola źródłowe muszą być wolnymi polami labiryntu")
+        self._dist: Optional[np.ndarray] = None
+        self._mask: Optional[np.ndarray] = None
+        maze.add_change_listener(self._on_maze_change)
+
+    def close(self):
+        """Odłącza zapytanie od labiryntu"""
+        self.maze.remove_change_listener(self._on_maze_change)
+
+    def _on_maze_change(self, pos: Optional[Tuple[int, int]]):
+        """Po zmianie ścian mapa odległości jest nieaktualna"""
+        self._dist = None
+        self._mask = None
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Mapa odległości int32 o kształcie siatki (-1 dla pól nieosiągalnych)"""
+        if self._dist is None:
+            self._mask = self.maze.neighbor_mask_array()
+            dist = np.full(self.maze.width * self.maze.height, -1, dtype=np.int32)
+            for _ in distance_layers(self._mask.ravel(), self.maze.width, self.sources, dist):
+                pass
+            self._dist = dist.reshape(self.maze.height, self.maze.width)
+        return self._dist
+
+    def distance(self, pos: Tuple[int, int]) -> int:
+        """
+        Odległość pola od najbliższego źródła
+        :return: Liczba kroków albo -1, jeśli pole jest nieosiągalne
+        """
+        x, y = pos
+        if not self.maze.is_valid_position(x, y):
+            return -1
+        return int(self.distances[y, x])
+
+    def distances_to(self, targets: Sequence[Tuple[int, int]]) -> np.ndarray:
+        """
+        Odległości wielu pól naraz
+        :return: Tablica int32 odległości w kolejności targets (-1 dla pól nieosiągalnych i spoza siatki)
+        """
+        result = np.full(len(targets), -1, dtype=np.int32)
+        if not len(targets):
+            return result
+        xs, ys = np.array(targets, dtype=np.int64).reshape(-1, 2).T
+        # Ujemne indeksy NumPy liczyłby od końca wiersza - pola spoza siatki pomijamy jak w distance()
+        valid = _in_bounds(self.maze, xs, ys)
+        result[valid] = self.distances[ys[valid], xs[valid]]
+        return result
+
+    def path_to(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Najkrótsza ścieżka od najbliższego źródła do pola pos
+        :return: Lista pól od źródła do pos (pusta, jeśli pole jest nieosiągalne)
+        """
+        if self.distance(pos) < 0:
+            return []
+        path = descend(self.distances, self._mask, pos)
+        path.reverse()
+        return path
+
+    def nearest_source(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Najbliższe pole źródłowe (None, jeśli pole jest nieosiągalne)"""
+        path = self.path_to(pos)
+        return path[0] if path else None
+
+
+def landmark_matrix(maze: Maze, landmarks: Sequence[Tuple[int, int]]) -> np.ndarray:
+    """
+    Macierz odległości między K punktami orientacyjnymi.
+    Wykonuje K przeszukiwań BFS na wspólnej masce sąsiadów; każde kończy się,
+    gdy tylko osiągnie wszystkie punkty (nie przegląda reszty labiryntu).
+    :return: Tablica int64 KxK (-1 dla par bez połączenia)
+    """
+    k = len(landmarks)
+    matrix = np.full((k, k), -1, dtype=np.int64)
+    if k == 0:
+        return matrix
+    mask = maze.neighbor_mask_array().ravel()
+    xs, ys = np.array(landmarks, dtype=np.int64).reshape(-1, 2).T
+    # Punkty spoza siatki (jak ściany) nie mają połączenia z żadnym innym
+    valid = _in_bounds(maze, xs, ys)
+    targets = ys[valid] * maze.width + xs[valid]
+    dist = np.empty(maze.width * maze.height, dtype=np.int32)
+
+    for i, source in enumerate(landmarks):
+        if maze.is_wall(*source):
+            continue
+        dist.fill(-1)
+        for _ in distance_layers(mask, maze.width, [source], dist):
+            if (dist[targets] >= 0).all():
+                break
+        matrix[i, valid] = dist[targets]
+    return matrix
+
+
+def _in_bounds(maze: Maze, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Maska pól mieszczących się w siatce (wektorowo, jak Maze.is_valid_position)"""
+    return (xs >= 0) & (xs < maze.width) & (ys >= 0) & (ys < maze.height)
@@ -0,0 +1,330 @@
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+import pygame
+
+from maze import Maze, MAX_COST
+from solver import BaseSolver, CellMask
+
+# Stany wyświetlanych pól
+CELL_EMPTY = 0
+CELL_WALL = 1
+CELL_VISITED = 2
+CELL_PATH = 3
+CELL_START = 4
+CELL_END = 5
+# Teren o koszcie c (2..MAX_COST) ma stan CELL_TERRAIN + c - 2
+CELL_TERRAIN = 6
+# Pola z mapy odwiedzin (solvery Monte Carlo) mają stan CELL_HEAT + poziom (0..HEAT_LEVELS-1)
+CELL_HEAT = CELL_TERRAIN + MAX_COST - 1
+HEAT_LEVELS = 8
+
+
+def heat_levels(visits: np.ndarray) -> np.ndarray:
+    """
+    Zamienia liczby odwiedzin na poziomy mapy ciepła w skali logarytmicznej
+    :param visits: liczby odwiedzin pól
+    :return: Tablica uint8 poziomów 0..HEAT_LEVELS-1 o kształcie visits
+    """
+    peak = int(visits.max()) if visits.size else 0
+    if peak <= 0:
+        return np.zeros(visits.shape, dtype=np.uint8)
+    levels = (np.log1p(visits) * (HEAT_LEVELS / np.log1p(peak))).astype(np.int64)
+    return np.minimum(levels, HEAT_LEVELS - 1).astype(np.uint8)
+
+
+class BaseRenderer:
+    """
+    Bazowa klasa rendererów. Śledzi stan każdego pola (tablica uint8 o kształcie
+    siatki) i wyznacza, które pola zmieniły się od poprzedniej klatki.
+    """
+
+    def __init__(self, screen: pygame.Surface, maze: Maze, colors, cell_size: int):
+        """
+        :param screen: powierzchnia okna
+        :param maze: rysowany labirynt
+        :param colors: paleta kolorów aplikacji (Colors)
+        :param cell_size: rozmiar pola w pikselach
+        """
+        self.screen = screen
+        self.maze = maze
+        self.colors = colors
+        self.cell_size = cell_size
+        self.palette = {
+            CELL_EMPTY: colors.WHITE,
+            CELL_WALL: colors.BLACK,
+            CELL_VISITED: colors.VISITED,
+            CELL_PATH: colors.PATH,
+            CELL_START: colors.GREEN,
+            CELL_END: colors.RED,
+        }
+        # Odcienie terenu od najtańszego do najdroższego
+        light = np.array(colors.TERRAIN_LIGHT, dtype=float)
+        dark = np.array(colors.TERRAIN_DARK, dtype=float)
+        for cost in range(2, MAX_COST + 1):
+            t = (cost - 2) / max(1, MAX_COST - 2)
+            self.palette[CELL_TERRAIN + cost - 2] = tuple(int(v) for v in np.round(light + (dark - light) * t))
+        # Odcienie mapy odwiedzin od rzadko do najczęściej odwiedzanych pól
+        cold = np.array(colors.HEAT_COLD, dtype=float)
+        hot = np.array(colors.HEAT_HOT, dtype=float)
+        for level in range(HEAT_LEVELS):
+            t = level / (HEAT_LEVELS - 1)
+            self.palette[CELL_HEAT + level] = tuple(int(v) for v in np.round(cold + (hot - cold) * t))
+        # Stan pól aktualnie widocznych na ekranie
+        self.state = np.zeros((maze.height, maze.width), dtype=np.uint8)
+
+        self._needs_full_redraw = True
+        self._dirty_cells: Set[Tuple[int, int]] = set()
+        self._solver: Optional[BaseSolver] = None
+        # Narysowane pola odwiedzone: zbiór tylko dla porównywania całych zbiorów (solver bez visit_log)
+        self._drawn_visited: Set[Tuple[int, int]] = set()
+        self._drawn_visited_count = 0
+        self._drawn_path: Set[Tuple[int, int]] = set()
+        self._drawn_path_version: Optional[int] = None
+        self._drawn_points: Tuple = (None, None)
+
+        maze.add_change_listener(self._on_maze_change)
+
+    def close(self):
+        """Odłącza renderer od labiryntu i rysowanego solvera"""
+        self.maze.remove_change_listener(self._on_maze_change)
+        self._attach(None)
+
+    def _attach(self, solver: Optional[BaseSolver]):
+        """Rejestruje renderer jako odbiorcę visit_log rysowanego solvera (i wyrejestrowuje z poprzedniego)"""
+        for owner, change in ((self._solver, -1), (solver, 1)):
+            if owner is not None and hasattr(owner, "record_visits"):
+                owner.record_visits += change
+                if not owner.record_visits:
+                    # Ostatni odbiorca - nieodczytane wpisy nie są już nikomu potrzebne
+                    owner.visit_log.clear()
+        self._solver = solver
+
+    def invalidate(self):
+        """Wymusza pełne przerysowanie w następnej klatce"""
+        self._needs_full_redraw = True
+
+    def _on_maze_change(self, pos: Optional[Tuple[int, int]]):
+        """Oznacza zmienione pole (lub całą siatkę) do przerysowania"""
+        if pos is None:
+            self.invalidate()
+        else:
+            self._dirty_cells.add(pos)
+
+    def cell_state(self, x: int, y: int, solver: BaseSolver) -> int:
+        """Wyznacza stan pola według tych samych priorytetów co pełne rysowanie"""
+        pos = (x, y)
+        if pos == self.maze.start_pos:
+            return CELL_START
+        if pos == self.maze.end_pos:
+            return CELL_END
+        if pos in self._drawn_path:
+            return CELL_PATH
+        if self.maze.is_wall(x, y):
+            return CELL_WALL
+        if pos in solver.visited:
+            return CELL_VISITED
+        value = int(self.maze.grid[y, x])
+        if value > 1:
+            return CELL_TERRAIN + value - 2
+        return CELL_EMPTY
+
+    def _collect_changes(self, solver: BaseSolver) -> Set[Tuple[int, int]]:
+        """
+        Zbiera pola, których stan mógł się zmienić od poprzedniej klatki
+        :return: Zbiór pól do sprawdzenia
+        """
+        changed = self._dirty_cells
+        self._dirty_cells = set()
+
+        # Nowo odwiedzone pola
+        visited = solver.visited
+        log = getattr(solver, "visit_log", None)
+        grown = len(visited) - self._drawn_visited_count
+        if not grown:
+            pass
+        elif log is not None and len(log) == grown:
+            # Wszystkie nowe pola przeszły przez visit() - wystarczą wpisy z tej klatki
+            changed.update(log)
+        elif isinstance(visited, CellMask):
+            # Pola odwiedzone, a wciąż narysowane jako puste lub jako teren
+            drawn_open = (self.state == CELL_EMPTY) | ((self.state >= CELL_TERRAIN) & (self.state < CELL_HEAT))
+            ys, xs = np.nonzero((visited.as_array() != 0) & drawn_open)
+            changed.update(zip(xs.tolist(), ys.tolist()))
+        else:
+            new_cells = visited - self._drawn_visited
+            changed |= new_cells
+            self._drawn_visited |= new_cells
+        self._drawn_visited_count = len(visited)
+        if log:
+            log.clear()
+
+        # Zmiany ścieżki - tylko gdy solver zgłosił nową wersję (obiekty bez licznika porównujemy zawsze)
+        version = getattr(solver, "path_version", None)
+        if version is None or version != self._drawn_path_version:
+            path = set(solver.path)
+            changed |= path ^ self._drawn_path
+            self._drawn_path = path
+            self._drawn_path_version = version
+
+        # Zmiany punktów start/koniec
+        points = (self.maze.start_pos, self.maze.end_pos)
+        if points != self._drawn_points:
+            changed.update(p for p in points + self._drawn_points if p is not None)
+            self._drawn_points = points
+        return changed
+
+    def _needs_reset(self, solver: BaseSolver) -> bool:
+        """Sprawdza, czy stan solvera cofnął się (np. reset) i trzeba rysować od nowa"""
+        return solver is not self._solver or len(solver.visited) < self._drawn_visited_count
+
+    def compute_state(self, solver: BaseSolver) -> np.ndarray:
+        """
+        Wyznacza stan wszystkich pól od nowa i zapamiętuje, co zostało uwzględnione
+        :return: Tablica stanów o kształcie siatki
+        """
+        if solver is not self._solver:
+            self._attach(solver)
+        self._needs_full_redraw = False
+        self._dirty_cells.clear()
+        log = getattr(solver, "visit_log", None)
+        if log is None and not isinstance(solver.visited, CellMask):
+            self._drawn_visited = set(solver.visited)
+        else:
+            self._drawn_visited = set()
+        if log:
+            log.clear()
+        self._drawn_visited_count = len(solver.visited)
+        self._drawn_path = set(solver.path)
+        self._drawn_path_version = getattr(solver, "path_version", None)
+        self._drawn_points = (self.maze.start_pos, self.maze.end_pos)
+
+        # heatmap() dolicza też odłożone odwiedziny (błądzenie Monte Carlo) - przed odczytem visited
+        heat = solver.heatmap()
+        grid = np.asarray(self.maze.grid, dtype=np.uint8)
+        state = np.where(grid == 1, CELL_WALL, np.where(grid > 1, CELL_TERRAIN + grid - 2, CELL_EMPTY)).astype(np.uint8)
+        if isinstance(solver.visited, CellMask):
+            state[(solver.visited.as_array() != 0) & (state != CELL_WALL)] = CELL_VISITED
+        else:
+            for x, y in solver.visited:
+                if state[y, x] != CELL_WALL:
+                    state[y, x] = CELL_VISITED
+        if heat is not None:
+            cells = (heat > 0) & (state != CELL_WALL)
+            state[cells] = CELL_HEAT + heat_levels(heat)[cells]
+        for x, y in self._drawn_path:
+            state[y, x] = CELL_PATH
+        if self.maze.start_pos:
+            state[self.maze.start_pos[1], self.maze.start_pos[0]] = CELL_START
+        if self.maze.end_pos:
+            state[self.maze.end_pos[1], self.maze.end_pos[0]] = CELL_END
+        return state
+
+    def changed_cells(self, solver: BaseSolver) -> List[Tuple[int, int, int]]:
+        """
+        Zwraca pola, których stan faktycznie się zmienił
+        :return: Lista krotek (x, y, nowy stan)
+        """
+        if solver.heatmap() is not None:
+            # Mapa odwiedzin zmienia poziomy wielu pól naraz - porównujemy cały stan
+            state = self.compute_state(solver)
+            ys, xs = np.nonzero(state != self.state)
+            return [(x, y, int(state[y, x])) for x, y in zip(xs.tolist(), ys.tolist())]
+        changes = []
+        for x, y in self._collect_changes(solver):
+            if not self.maze.is_valid_position(x, y):
+                continue
+            state = self.cell_state(x, y, solver)
+            if state != self.state[y, x]:
+                changes.append((x, y, state))
+        return changes
+
+    def draw(self, solver: BaseSolver):
+        """Rysuje klatkę"""
+        raise NotImplementedError("Metoda draw() musi być zaimplementowana w klasie pochodnej")
+
+
+class DirtyRectRenderer(BaseRenderer):
+    """
+    Renderer rysujący tylko pola, których stan zmienił się od poprzedniej klatki.
+    Pełne przerysowanie (z zapamiętanego tła z siatką) wykonywane jest tylko
+    po zmianie solvera, resecie lub zmianie całej siatki.
+    """
+
+    def __init__(self, screen: pygame.Surface, maze: Maze, colors, cell_size: int):
+        super().__init__(screen, maze, colors, cell_size)
+        self.background = self._build_background()
+
+    def _build_background(self) -> pygame.Surface:
+        """Tworzy tło: puste pola z naniesioną siatką"""
+        background = pygame.Surface(self.screen.get_size())
+        background.fill(self.colors.WHITE)
+        for y in range(self.maze.height):
+            for x in range(self.maze.width):
+                pygame.draw.rect(background, self.colors.GRAY, self.cell_rect(x, y), 1)
+        return background
+
+    def cell_rect(self, x: int, y: int) -> pygame.Rect:
+        """Zwraca prostokąt pola na ekranie"""
+        return pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+
+    def draw_cell(self, x: int, y: int, state: int) -> pygame.Rect:
+        """Rysuje pojedyncze pole i zwraca jego prostokąt"""
+        rect = self.cell_rect(x, y)
+        pygame.draw.rect(self.screen, self.palette[state], rect)
+        if state not in (CELL_START, CELL_END):
+            pygame.draw.rect(self.screen, self.colors.GRAY, rect, 1)
+        self.state[y, x] = state
+        return rect
+
+    def full_redraw(self, solver: BaseSolver):
+        """Rysuje cały labirynt od nowa na podstawie tła"""
+        state = self.compute_state(solver)
+        self.screen.blit(self.background, (0, 0))
+        self.state.fill(CELL_EMPTY)
+        ys, xs = np.nonzero(state)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.draw_cell(x, y, int(state[y, x]))
+        pygame.display.flip()
+
+    def draw(self, solver: BaseSolver):
+        """Rysuje klatkę - tylko zmienione pola, chyba że potrzebne jest pełne przerysowanie"""
+        if self._needs_full_redraw or self._needs_reset(solver):
+            self.full_redraw(solver)
+            return
+
+        rects = [self.draw_cell(x, y, state) for x, y, state in self.changed_cells(solver)]
+        if rects:
+            pygame.display.update(rects)
+
+
+class SurfarrayRenderer(BaseRenderer):
+    """
+    Renderer dla bardzo dużych siatek z małymi polami.
+    Stan pól jest mapowany przez paletę na kolory i przenoszony na ekran
+    jednym blitem (pygame.surfarray) ze skalowaniem, zamiast rysowania prostokątów.
+    """
+
+    def __init__(self, screen: pygame.Surface, maze: Maze, colors, cell_size: int):
+        super().__init__(screen, maze, colors, cell_size)
+        self.palette_array = np.array(
+            [self.palette[state] for state in sorted(self.palette)], dtype=np.uint8
+        )
+        self.surface = pygame.Surface((maze.width, maze.height))
+        self.target = screen.subsurface((0, 0, maze.width * cell_size, maze.height * cell_size))
+
+    def draw(self, solver: BaseSolver):
+        """Aktualizuje tablicę stanów i rysuje ją jednym blitem, jeśli coś się zmieniło"""
+        if self._needs_full_redraw or self._needs_reset(solver):
+            self.state[:] = self.compute_state(solver)
+        else:
+            changes = self.changed_cells(solver)
+            if not changes:
+                return
+            for x, y, state in changes:
+                self.state[y, x] = state
+
+        # surfarray oczekuje osi (x, y), a tablica stanów ma (y, x)
+        pygame.surfarray.blit_array(self.surface, self.palette_array[self.state.T])
+        pygame.transform.scale(self.surface, self.target.get_size(), self.target)
+        pygame.display.flip()
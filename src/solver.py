@@ -1,24 +1,129 @@
 import heapq
 import random
-from typing import List, Tuple, Set
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Tuple, Set, Optional, Iterator
 
-from maze import Maze
+import numpy as np
+
+from maze import Maze, MASK_OFFSETS, MAX_COST
+
+
+@dataclass
+class SolveResult:
+    """Wynik rozwiązania labiryntu w trybie bez GUI"""
+    path: List[Tuple[int, int]] = field(default_factory=list)
+    cost: int = 0  # suma kosztów wejścia na pola ścieżki
+    expanded: int = 0
+    solved: bool = False
+
+
+INF = float('inf')
+
+
+class CellMask:
+    """
+    Zbiór pól labiryntu przechowywany jako płaska tablica flag.
+    Zachowuje się jak zbiór krotek (x, y), ale nie alokuje obiektu na każde pole.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.flags = bytearray(width * height)
+        self.count = 0
+
+    def add(self, pos: Tuple[int, int]):
+        """Dodaje pole do zbioru"""
+        x, y = pos
+        self.add_index(y * self.width + x)
+
+    def add_index(self, index: int):
+        """Dodaje pole o płaskim indeksie y * width + x"""
+        if not self.flags[index]:
+            self.flags[index] = 1
+            self.count += 1
+
+    def clear(self):
+        """Czyści zbiór"""
+        self.flags[:] = bytes(len(self.flags))
+        self.count = 0
+
+    def as_array(self) -> np.ndarray:
+        """Zwraca widok flag o kształcie siatki labiryntu (bez kopiowania)"""
+        return np.frombuffer(self.flags, dtype=np.uint8).reshape(self.height, self.width)
+
+    def __contains__(self, pos) -> bool:
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.flags[y * self.width + x])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for index in np.flatnonzero(self.as_array()).tolist():
+            y, x = divmod(index, self.width)
+            yield x, y
 
 
 class BaseSolver:
     """Bazowa klasa dla algorytmów rozwiązujących"""
 
+    # Czy dla tego samego labiryntu algorytm zawsze daje ten sam wynik (np. czy wynik można zapamiętać)
+    deterministic = True
+    # Czy solver sam naprawia rozwiązanie po zmianach ścian (zamiast liczyć od zera)
+    incremental = False
+    # Czy solver uwzględnia koszty terenu (inaczej przy terenie ścieżka jest najkrótsza, ale nie najtańsza)
+    weighted = False
+
     def __init__(self, maze: Maze):
         self.maze = maze
+        self.path_version = 0  # zwiększany przy każdej zmianie ścieżki - renderer przelicza ją tylko wtedy
         self.path: List[Tuple[int, int]] = []
         self.visited: Set[Tuple[int, int]] = set()
+        # Pola dodane przez visit() od ostatniego odczytu - prowadzone tylko, gdy są odbiorcy
+        # (renderer, wątek roboczy); record_visits to ich liczba, a odbiorca opróżnia listę po odczycie
+        self.record_visits = 0
+        self.visit_log: List[Tuple[int, int]] = []
         self.solved = False
+        self.expanded = 0
+        # Kroki (jednostki limitu max_steps) wykonane w ostatnim wywołaniu solve();
+        # mniej niż max_steps oznacza, że solver zakończył pracę przed wyczerpaniem limitu
+        self.steps_used = 0
+
+    @property
+    def path(self) -> List[Tuple[int, int]]:
+        """Znaleziona (lub bieżąca) ścieżka"""
+        return self._path
+
+    @path.setter
+    def path(self, path: List[Tuple[int, int]]):
+        self._path = path
+        self.path_version += 1
 
     def reset(self):
         """Resetuje stan solvera"""
-        self.path.clear()
+        self.path = []
         self.visited.clear()
+        self.visit_log.clear()
         self.solved = False
+        self.expanded = 0
+
+    def visit(self, pos: Tuple[int, int]):
+        """
+        Dodaje pole do odwiedzonych, a przy włączonym record_visits także do visit_log (używane
+        w krokach oglądanych przez GUI; ciasne pętle solve() dodają pola tylko do visited)
+        """
+        if pos not in self.visited:
+            self.visited.add(pos)
+            if self.record_visits:
+                self.visit_log.append(pos)
+
+    def endpoints_connected(self) -> bool:
+        """Sprawdza w indeksie spójnych składowych labiryntu, czy cel jest osiągalny ze startu"""
+        return self.maze.are_connected(self.maze.start_pos, self.maze.end_pos)
 
     def step(self) -> bool:
         """
@@ -27,10 +132,61 @@ class BaseSolver:
         """
         raise NotImplementedError("Metoda step() musi być zaimplementowana w klasie pochodnej")
 
+    def heatmap(self) -> Optional[np.ndarray]:
+        """Mapa częstości odwiedzin pól o kształcie siatki (None, jeśli solver jej nie prowadzi)"""
+        return None
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """
+        Liczniki kolejki wyznaczane z bieżącego stanu solvera (bez dodatkowej pracy w pętli przeszukiwania)
+        :return: Krotka (liczba wstawień, liczba pobrań nieaktualnych wpisów, rozmiar zbioru otwartego)
+        """
+        return 0, 0, 0
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje algorytm do końca, bez oglądania się na zegar klatek
+        :param max_steps: maksymalna liczba kroków (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        step = self.step
+        steps = 0
+        if max_steps is None:
+            steps += 1
+            while step():
+                steps += 1
+        else:
+            for _ in range(max_steps):
+                steps += 1
+                if not step():
+                    break
+        self.steps_used = steps
+        return self.result()
+
+    def _budget_result(self, max_steps: Optional[int], budget: int) -> SolveResult:
+        """
+        Zapisuje, ile kroków z limitu zużyła pętla solve(), i zwraca wynik
+        :param budget: pozostały limit pętli (liczony od -1 przy braku limitu)
+        """
+        self.steps_used = (-1 if max_steps is None else max_steps) - budget
+        return self.result()
+
+    def result(self) -> SolveResult:
+        """Zwraca bieżący wynik solvera"""
+        found = self.solved and bool(self.path)
+        return SolveResult(
+            path=list(self.path) if found else [],
+            cost=self.maze.path_cost(self.path) if found else 0,
+            expanded=self.expanded,
+            solved=found
+        )
+
 
 class RandomWalkSolver(BaseSolver):
     """Implementacja algorytmu Random Walk"""
 
+    deterministic = False
+
     def __init__(self, maze: Maze):
         super().__init__(maze)
         self.max_steps = maze.width * maze.height * 2
@@ -41,6 +197,14 @@ class RandomWalkSolver(BaseSolver):
         super().reset()
         self.current_steps = 0
 
+    def _restart(self):
+        """Rozpoczyna błądzenie od nowa, zachowując licznik rozwiniętych pól"""
+        expanded = self.expanded
+        self.reset()
+        self.expanded = expanded
+        self.path.append(self.maze.start_pos)
+        self.visit(self.maze.start_pos)
+
     def step(self) -> bool:
         """
         Wykonuje jeden krok algorytmu Random Walk
@@ -51,8 +215,12 @@ class RandomWalkSolver(BaseSolver):
 
         # Rozpocznij od punktu startowego jeśli ścieżka jest pusta
         if not self.path:
+            # Bez ścieżki do celu błądzenie nigdy by się nie skończyło
+            if not self.endpoints_connected():
+                return False
             self.path.append(self.maze.start_pos)
-            self.visited.add(self.maze.start_pos)
+            self.path_version += 1
+            self.visit(self.maze.start_pos)
             return True
 
         current = self.path[-1]
@@ -64,34 +232,37 @@ class RandomWalkSolver(BaseSolver):
 
         # Sprawdź czy nie przekroczono maksymalnej liczby kroków
         if self.current_steps >= self.max_steps:
-            self.reset()
-            self.path.append(self.maze.start_pos)
-            self.visited.add(self.maze.start_pos)
+            self._restart()
             return True
 
         # Znajdź dostępne sąsiednie pola
         neighbors = self.maze.get_neighbors(*current)
         unvisited = [n for n in neighbors if n not in self.visited]
 
+        self.expanded += 1
+        # Ścieżka zmienia się w miejscu - zmianę zgłaszamy licznikiem
+        self.path_version += 1
         if unvisited:
             # Wybierz losowo następny krok
             next_pos = random.choice(unvisited)
             self.path.append(next_pos)
-            self.visited.add(next_pos)
+            self.visit(next_pos)
         else:
             # Cofnij się o jeden krok
             self.path.pop()
             if not self.path:
-                self.reset()
-                self.path.append(self.maze.start_pos)
-                self.visited.add(self.maze.start_pos)
+                # Powrót do startu oznacza przejrzenie całej składowej startu - celu w niej nie ma
+                # (dzięki temu błądzenie kończy się także bez indeksu składowych, np. przy siatce bitowej)
+                return False
 
         self.current_steps += 1
         return True
 
 
 class AStarSolver(BaseSolver):
-    """Implementacja algorytmu A*"""
+    """Implementacja algorytmu A* (z kosztami terenu - koszt kroku to koszt wejścia na pole)"""
+
+    weighted = True
 
     def __init__(self, maze: Maze):
         super().__init__(maze)
@@ -100,17 +271,19 @@ class AStarSolver(BaseSolver):
         self.g_score: dict = {}
         self.f_score: dict = {}
         self.counter = 0
+        self.initialized = False
+        self.min_cost = 1  # mnożnik heurystyki - najtańszy krok w labiryncie
 
     def heuristic(self, pos: Tuple[int, int]) -> float:
         """
-        Funkcja heurystyczna (Manhattan distance)
-        :return: Szacowana odległość do celu
+        Funkcja heurystyczna (Manhattan distance razy najmniejszy koszt kroku - nie przeszacowuje)
+        :return: Szacowany koszt dojścia do celu
         """
         if not self.maze.end_pos:
             return float('inf')
         x1, y1 = pos
         x2, y2 = self.maze.end_pos
-        return abs(x1 - x2) + abs(y1 - y2)
+        return self.min_cost * (abs(x1 - x2) + abs(y1 - y2))
 
     def reset(self):
         """Resetuje stan solvera"""
@@ -120,6 +293,7 @@ class AStarSolver(BaseSolver):
         self.g_score.clear()
         self.f_score.clear()
         self.counter = 0
+        self.initialized = False
 
     def reconstruct_path(self, current: Tuple[int, int]):
         """Rekonstruuje ścieżkę od końca do początku"""
@@ -130,6 +304,22 @@ class AStarSolver(BaseSolver):
         total_path.reverse()
         self.path = total_path
 
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Wpisy kolejki numerowane są licznikiem; każde pobranie to rozwinięcie, także ponowne"""
+        return self.counter, self.expanded - len(self.visited), len(self.open_set)
+
+    def initialize(self):
+        """Wstawia punkt startowy do zbioru otwartego (jeśli cel jest w tej samej składowej)"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        self.min_cost = self.maze.min_cost()
+        start = self.maze.start_pos
+        self.g_score = {start: 0}
+        self.f_score = {start: self.heuristic(start)}
+        heapq.heappush(self.open_set, (self.f_score[start], self.counter, start))
+        self.counter += 1
+
     def step(self) -> bool:
         """
         Wykonuje jeden krok algorytmu A*
@@ -139,22 +329,18 @@ class AStarSolver(BaseSolver):
             return False
 
         # Inicjalizacja jeśli to pierwszy krok
-        if not self.open_set:
-            start = self.maze.start_pos
-            self.g_score = {start: 0}
-            self.f_score = {start: self.heuristic(start)}
-            heapq.heappush(self.open_set, (self.f_score[start], self.counter, start))
-            self.counter += 1
+        if not self.initialized:
+            self.initialize()
             return True
 
         # Jeśli open_set jest pusty, nie znaleziono ścieżki
         if not self.open_set:
-            self.solved = True
             return False
 
         # Pobierz węzeł z najniższym f_score
         current = heapq.heappop(self.open_set)[2]
-        self.visited.add(current)
+        self.visit(current)
+        self.expanded += 1
 
         # Jeśli znaleziono cel, zrekonstruuj ścieżkę
         if current == self.maze.end_pos:
@@ -164,7 +350,7 @@ class AStarSolver(BaseSolver):
 
         # Sprawdź wszystkich sąsiadów
         for neighbor in self.maze.get_neighbors(*current):
-            tentative_g_score = self.g_score[current] + 1
+            tentative_g_score = self.g_score[current] + self.maze.cost(*neighbor)
 
             if neighbor not in self.g_score or tentative_g_score < self.g_score[neighbor]:
                 self.came_from[neighbor] = current
@@ -174,3 +360,1073 @@ class AStarSolver(BaseSolver):
                 self.counter += 1
 
         return True
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje A* do końca w ciasnej pętli, bez narzutu wywołań step()
+        :param max_steps: maksymalna liczba rozwiniętych węzłów (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        if not self.initialized:
+            self.initialize()
+
+        # Lokalne referencje - w pętli unikamy wyszukiwania atrybutów
+        open_set = self.open_set
+        came_from = self.came_from
+        g_score = self.g_score
+        visited_add = self.visited.add
+        get_neighbors = self.maze.get_neighbors
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        goal = self.maze.end_pos
+        gx, gy = goal
+        scale = self.min_cost
+        # Bez terenu każdy krok kosztuje 1 - pomijamy odczyt kosztów z siatki
+        cost = self.maze.cost if self.maze.has_terrain() else None
+        counter = self.counter
+        expanded = self.expanded
+        budget = -1 if max_steps is None else max_steps
+
+        while open_set and budget != 0:
+            budget -= 1
+            current = heappop(open_set)[2]
+            visited_add(current)
+            expanded += 1
+
+            if current == goal:
+                self.reconstruct_path(current)
+                self.solved = True
+                break
+
+            g = g_score[current]
+            for neighbor in get_neighbors(*current):
+                tentative_g_score = g + 1 if cost is None else g + cost(*neighbor)
+                if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    nx, ny = neighbor
+                    f = tentative_g_score + scale * (abs(nx - gx) + abs(ny - gy))
+                    heappush(open_set, (f, counter, neighbor))
+                    counter += 1
+
+        self.counter = counter
+        self.expanded = expanded
+        return self._budget_result(max_steps, budget)
+
+
+class BidirectionalBFSSolver(BaseSolver):
+    """
+    Dwukierunkowe przeszukiwanie wszerz: fronty rosną jednocześnie od startu i od celu.
+    W każdym kroku rozwijana jest cała warstwa mniejszego frontu; spotkanie sprawdzane
+    jest na każdej krawędzi, a po warstwie ze spotkaniem wybierane jest najkrótsze połączenie.
+    """
+
+    def __init__(self, maze: Maze):
+        super().__init__(maze)
+        self.visited_forward: Set[Tuple[int, int]] = set()
+        self.visited_backward: Set[Tuple[int, int]] = set()
+        # Rodzic i odległość każdego osiągniętego pola, osobno dla obu kierunków
+        self.came_from: Tuple[dict, dict] = ({}, {})
+        self.distance: Tuple[dict, dict] = ({}, {})
+        self.frontiers: List[List[Tuple[int, int]]] = [[], []]
+        self.initialized = False
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.visited_forward.clear()
+        self.visited_backward.clear()
+        for side in (0, 1):
+            self.came_from[side].clear()
+            self.distance[side].clear()
+            self.frontiers[side] = []
+        self.initialized = False
+
+    def initialize(self):
+        """Ustawia fronty na punkcie startowym i końcowym (puste, jeśli cel jest w innej składowej)"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        for side, pos in enumerate((self.maze.start_pos, self.maze.end_pos)):
+            self.distance[side][pos] = 0
+            self.frontiers[side] = [pos]
+
+    def _expand_layer(self) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Rozwija całą warstwę mniejszego frontu
+        :return: Najkrótsza krawędź spotkania (pole po stronie startu, pole po stronie celu) albo None
+        """
+        side = 0 if len(self.frontiers[0]) <= len(self.frontiers[1]) else 1
+        other = 1 - side
+        came_from, distance = self.came_from[side], self.distance[side]
+        other_distance = self.distance[other]
+        visited = (self.visited_forward, self.visited_backward)[side]
+        get_neighbors = self.maze.get_neighbors
+
+        best = None
+        best_length = -1
+        layer = []
+        for current in self.frontiers[side]:
+            visited.add(current)
+            self.visit(current)
+            self.expanded += 1
+            next_distance = distance[current] + 1
+            for neighbor in get_neighbors(*current):
+                if neighbor in other_distance:
+                    length = next_distance + other_distance[neighbor]
+                    if best is None or length < best_length:
+                        best, best_length = (current, neighbor), length
+                if neighbor not in distance:
+                    distance[neighbor] = next_distance
+                    came_from[neighbor] = current
+                    layer.append(neighbor)
+        self.frontiers[side] = layer
+
+        if best is not None and side == 1:
+            best = best[1], best[0]
+        return best
+
+    def _chain(self, side: int, current: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Ciąg rodziców od pola current do źródła danego kierunku (jak w reconstruct_path)"""
+        came_from = self.came_from[side]
+        chain = [current]
+        while current in came_from:
+            current = came_from[current]
+            chain.append(current)
+        return chain
+
+    def reconstruct_path(self, meeting: Tuple[Tuple[int, int], Tuple[int, int]]):
+        """Skleja ścieżkę z obu połówek wokół krawędzi spotkania"""
+        forward_end, backward_start = meeting
+        path = self._chain(0, forward_end)
+        path.reverse()
+        path.extend(self._chain(1, backward_start))
+        self.path = path
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Każde osiągnięte pole trafia do frontu raz; zbiorem otwartym są oba fronty"""
+        return len(self.distance[0]) + len(self.distance[1]), 0, len(self.frontiers[0]) + len(self.frontiers[1])
+
+    def step(self) -> bool:
+        """
+        Rozwija jedną warstwę BFS
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if not self.initialized:
+            self.initialize()
+            return True
+        if not self.frontiers[0] or not self.frontiers[1]:
+            return False
+
+        meeting = self._expand_layer()
+        if meeting is None:
+            return True
+        self.reconstruct_path(meeting)
+        self.solved = True
+        return False
+
+
+class FlatAStarSolver(BaseSolver):
+    """
+    Implementacja algorytmu A* na płaskich indeksach pól (y * width + x).
+    Zamiast słowników kluczowanych krotkami używa prealokowanych buforów,
+    a wpisy kolejki priorytetowej koduje w jednej liczbie całkowitej.
+    Zwraca te same ścieżki co AStarSolver (także z kosztami terenu).
+    """
+
+    weighted = True
+
+    def __init__(self, maze: Maze):
+        super().__init__(maze)
+        self.height, self.width = maze.grid.shape
+        self.visited = CellMask(self.width, self.height)
+        self.open_set: List[int] = []
+        self.g_score = array('i')
+        self.parent = array('i')
+        self.neighbor_mask = b''
+        self.step_costs = b''
+        self.scale = 1  # mnożnik heurystyki - najtańszy krok w labiryncie
+        self.flat_offsets: Tuple[Tuple[int, ...], ...] = ()
+        self.counter = 0
+        self.initialized = False
+        self._index_bits = 0
+        self._counter_bits = 0
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.open_set.clear()
+        self.counter = 0
+        self.initialized = False
+
+    def _push(self, f: int, index: int):
+        """Wstawia pole do kolejki jako liczbę (f, licznik, indeks)"""
+        key = (((f << self._counter_bits) | self.counter) << self._index_bits) | index
+        heapq.heappush(self.open_set, key)
+        self.counter += 1
+
+    def _allocate(self):
+        """Alokuje bufory przeszukiwania i migawki maski sąsiadów oraz kosztów pól"""
+        size = self.width * self.height
+        self.g_score = array('i', [-1]) * size
+        self.parent = array('i', [-1]) * size
+        self.neighbor_mask = self.maze.neighbor_mask_array().tobytes()
+        self.step_costs = self.maze.step_costs().tobytes()
+        self.flat_offsets = tuple(
+            tuple(dy * self.width + dx for dx, dy in offsets) for offsets in MASK_OFFSETS
+        )
+        self._index_bits = size.bit_length()
+        self._counter_bits = (4 * size + 2).bit_length()
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Pobrania to wstawienia bez wpisów w kolejce; nieaktualne pobrania nie są rozwinięciami"""
+        popped = self.counter - len(self.open_set)
+        return self.counter, popped - self.expanded, len(self.open_set)
+
+    def initialize(self):
+        """Alokuje bufory i wstawia punkt startowy do zbioru otwartego (jeśli cel jest w tej samej składowej)"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        self._allocate()
+        self.scale = self.maze.min_cost()
+
+        sx, sy = self.maze.start_pos
+        ex, ey = self.maze.end_pos
+        start = sy * self.width + sx
+        self.g_score[start] = 0
+        self._push(self.scale * (abs(sx - ex) + abs(sy - ey)), start)
+
+    def reconstruct_path(self, index: int):
+        """Rekonstruuje ścieżkę od końca do początku"""
+        width = self.width
+        parent = self.parent
+        total_path = []
+        while index != -1:
+            y, x = divmod(index, width)
+            total_path.append((x, y))
+            index = parent[index]
+        total_path.reverse()
+        self.path = total_path
+
+    def step(self) -> bool:
+        """
+        Wykonuje jeden krok algorytmu A*
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if not self.initialized:
+            self.initialize()
+            return True
+        self.solve(max_steps=1)
+        return not self.solved and bool(self.open_set)
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje A* do końca w ciasnej pętli
+        :param max_steps: maksymalna liczba pobranych węzłów (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        if not self.initialized:
+            self.initialize()
+        if not self.open_set:
+            return self.result()
+
+        width = self.width
+        open_set = self.open_set
+        g_score = self.g_score
+        parent = self.parent
+        neighbor_mask = self.neighbor_mask
+        step_costs = self.step_costs
+        scale = self.scale
+        flat_offsets = self.flat_offsets
+        closed = self.visited.flags
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        ex, ey = self.maze.end_pos
+        goal = ey * width + ex
+        index_bits = self._index_bits
+        counter_bits = self._counter_bits
+        index_mask = (1 << index_bits) - 1
+        counter = self.counter
+        expanded = self.expanded
+        closed_count = self.visited.count
+        budget = -1 if max_steps is None else max_steps
+
+        while open_set and budget != 0:
+            budget -= 1
+            current = heappop(open_set) & index_mask
+            if closed[current]:
+                continue
+            closed[current] = 1
+            closed_count += 1
+            expanded += 1
+
+            if current == goal:
+                self.reconstruct_path(current)
+                self.solved = True
+                break
+
+            g = g_score[current]
+            # Kolejność sąsiadów taka sama jak w Maze.get_neighbors
+            for offset in flat_offsets[neighbor_mask[current]]:
+                neighbor = current + offset
+                tentative = g + step_costs[neighbor]
+                old = g_score[neighbor]
+                if old == -1 or tentative < old:
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative
+                    ny, nx = divmod(neighbor, width)
+                    f = tentative + scale * (abs(nx - ex) + abs(ny - ey))
+                    heappush(open_set, (((f << counter_bits) | counter) << index_bits) | neighbor)
+                    counter += 1
+
+        self.counter = counter
+        self.expanded = expanded
+        self.visited.count = closed_count
+        return self._budget_result(max_steps, budget)
+
+
+class DialSolver(FlatAStarSolver):
+    """
+    Dijkstra / A* z kolejką kubełkową (algorytm Diala) dla kosztów terenu.
+    Koszty kroków to małe liczby całkowite (1..MAX_COST), więc priorytet wstawianego pola
+    przekracza bieżące minimum o co najwyżej 2 * MAX_COST: wystarcza cykliczna tablica
+    kubełków, w której wstawienie i pobranie pola kosztują O(1) zamiast O(log n) w kopcu.
+    """
+
+    # Liczba kubełków: priorytety w kolejce mieszczą się w [bieżący, bieżący + 2 * MAX_COST]
+    BUCKETS = 2 * MAX_COST + 1
+
+    def __init__(self, maze: Maze, use_heuristic: bool = True):
+        """
+        :param use_heuristic: True - A* (heurystyka Manhattan razy najmniejszy koszt kroku),
+                              False - algorytm Dijkstry
+        """
+        super().__init__(maze)
+        self.use_heuristic = use_heuristic
+        self.buckets: List[List[int]] = [[] for _ in range(self.BUCKETS)]
+        self.current = 0  # priorytet bieżącego kubełka
+        self.queued = 0  # liczba wpisów we wszystkich kubełkach
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        for bucket in self.buckets:
+            bucket.clear()
+        self.current = 0
+        self.queued = 0
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Jak w FlatAStarSolver - licznik zlicza wstawienia do kubełków"""
+        popped = self.counter - self.queued
+        return self.counter, popped - self.expanded, self.queued
+
+    def initialize(self):
+        """Alokuje bufory i wstawia punkt startowy do kubełka jego priorytetu"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        self._allocate()
+        self.scale = self.maze.min_cost() if self.use_heuristic else 0
+
+        sx, sy = self.maze.start_pos
+        ex, ey = self.maze.end_pos
+        start = sy * self.width + sx
+        self.g_score[start] = 0
+        self.current = self.scale * (abs(sx - ex) + abs(sy - ey))
+        self.buckets[self.current % self.BUCKETS].append(start)
+        self.queued = 1
+        self.counter = 1
+
+    def step(self) -> bool:
+        """
+        Pobiera jedno pole z kolejki kubełkowej
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if not self.initialized:
+            self.initialize()
+            return True
+        self.solve(max_steps=1)
+        return not self.solved and self.queued > 0
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje przeszukiwanie do końca w ciasnej pętli
+        :param max_steps: maksymalna liczba pobranych pól (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        if not self.initialized:
+            self.initialize()
+
+        width = self.width
+        buckets = self.buckets
+        count = self.BUCKETS
+        g_score = self.g_score
+        parent = self.parent
+        neighbor_mask = self.neighbor_mask
+        step_costs = self.step_costs
+        scale = self.scale
+        flat_offsets = self.flat_offsets
+        closed = self.visited.flags
+        ex, ey = self.maze.end_pos
+        goal = ey * width + ex
+        current_f = self.current
+        queued = self.queued
+        counter = self.counter
+        expanded = self.expanded
+        closed_count = self.visited.count
+        budget = -1 if max_steps is None else max_steps
+
+        while queued and budget != 0:
+            bucket = buckets[current_f % count]
+            if not bucket:
+                current_f += 1
+                continue
+            budget -= 1
+            current = bucket.pop()
+            queued -= 1
+            if closed[current]:
+                continue
+            closed[current] = 1
+            closed_count += 1
+            expanded += 1
+
+            if current == goal:
+                self.reconstruct_path(current)
+                self.solved = True
+                break
+
+            g = g_score[current]
+            for offset in flat_offsets[neighbor_mask[current]]:
+                neighbor = current + offset
+                tentative = g + step_costs[neighbor]
+                old = g_score[neighbor]
+                if old == -1 or tentative < old:
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative
+                    ny, nx = divmod(neighbor, width)
+                    buckets[(tentative + scale * (abs(nx - ex) + abs(ny - ey))) % count].append(neighbor)
+                    queued += 1
+                    counter += 1
+
+        self.current = current_f
+        self.queued = queued
+        self.counter = counter
+        self.expanded = expanded
+        self.visited.count = closed_count
+        return self._budget_result(max_steps, budget)
+
+
+def distance_field(neighbor_mask: np.ndarray, sources: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Oblicza mapę odległości BFS od zbioru pól źródłowych.
+    Każda iteracja przetwarza całą warstwę frontu naraz operacjami NumPy.
+    :param neighbor_mask: maska sąsiadów labiryntu (Maze.neighbor_mask)
+    :param sources: lista pól (x, y), od których liczona jest odległość
+    :return: Tablica int32 o kształcie siatki, -1 dla pól nieosiągalnych
+    """
+    height, width = neighbor_mask.shape
+    dist = np.full(height * width, -1, dtype=np.int32)
+    for _ in distance_layers(neighbor_mask.ravel(), width, sources, dist):
+        pass
+    return dist.reshape(height, width)
+
+
+def distance_layers(flat_mask: np.ndarray, width: int, sources: List[Tuple[int, int]], dist: np.ndarray):
+    """
+    Generator kolejnych warstw BFS od pól źródłowych; wypełnia dist w miejscu.
+    Przerwanie iteracji kończy przeszukiwanie (dist zawiera wtedy tylko przetworzone warstwy).
+    :param flat_mask: spłaszczona maska sąsiadów labiryntu
+    :param dist: płaska tablica odległości wypełniona -1
+    :return: Kolejne tablice płaskich indeksów pól danej warstwy
+    """
+    offsets = [dy * width + dx for dx, dy in MASK_OFFSETS[0b1111]]
+    frontier = np.unique(np.array([y * width + x for x, y in sources], dtype=np.int64))
+    dist[frontier] = 0
+    distance = 0
+    while frontier.size:
+        yield frontier
+        distance += 1
+        masks = flat_mask[frontier]
+        candidates = np.concatenate([
+            frontier[(masks >> bit) & 1 == 1] + offset for bit, offset in enumerate(offsets)
+        ])
+        candidates = np.unique(candidates[dist[candidates] < 0])
+        dist[candidates] = distance
+        frontier = candidates
+
+
+def descend(dist: np.ndarray, neighbor_mask: np.ndarray, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    Schodzi po gradiencie mapy odległości od pola pos do najbliższego źródła
+    :param dist: mapa odległości o kształcie siatki (np. z distance_field)
+    :param neighbor_mask: maska sąsiadów użyta do obliczenia mapy
+    :return: Lista pól od pos do źródła mapy
+    """
+    x, y = pos
+    path = [pos]
+    current = int(dist[y, x])
+    while current > 0:
+        for dx, dy in MASK_OFFSETS[neighbor_mask[y, x]]:
+            if dist[y + dy, x + dx] == current - 1:
+                x, y = x + dx, y + dy
+                break
+        current -= 1
+        path.append((x, y))
+    return path
+
+
+class DistanceFieldSolver(BaseSolver):
+    """
+    Rozwiązywanie przez mapę odległości (BFS warstwa po warstwie, wektorowo).
+    Każdy ruch w labiryncie kosztuje 1, więc mapa odległości od źródła
+    wyznacza najkrótszą ścieżkę przez schodzenie po gradiencie.
+    """
+
+    def __init__(self, maze: Maze, source: str = "start", full: bool = False):
+        """
+        :param source: 'start' lub 'end' - pole, od którego liczona jest mapa odległości
+        :param full: czy liczyć całą mapę zamiast kończyć po dotarciu do celu
+        """
+        super().__init__(maze)
+        if source not in ("start", "end"):
+            raise ValueError(f"Nieznane źródło mapy odległości: {source}")
+        self.source = source
+        self.full = full
+        self.height, self.width = maze.grid.shape
+        self.visited = CellMask(self.width, self.height)
+        self.dist = np.full(self.width * self.height, -1, dtype=np.int32)
+        self._layers = None
+        self._mask: Optional[np.ndarray] = None
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Mapa odległości o kształcie siatki (-1 dla pól nieosiągniętych)"""
+        return self.dist.reshape(self.height, self.width)
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.dist.fill(-1)
+        self._layers = None
+        self._mask = None
+
+    def _endpoints(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Zwraca parę (źródło mapy, pole docelowe)"""
+        if self.source == "start":
+            return self.maze.start_pos, self.maze.end_pos
+        return self.maze.end_pos, self.maze.start_pos
+
+    def _advance(self) -> bool:
+        """
+        Przetwarza jedną warstwę BFS
+        :return: True, jeśli należy kontynuować
+        """
+        if self._layers is None:
+            # Pełna mapa jest potrzebna także wtedy, gdy cel leży w innej składowej
+            if not self.full and not self.endpoints_connected():
+                return False
+            source, _ = self._endpoints()
+            self._mask = self.maze.neighbor_mask_array()
+            self._layers = distance_layers(self._mask.ravel(), self.width, [source], self.dist)
+
+        layer = next(self._layers, None)
+        if layer is None:
+            return False
+        visited = self.visited.as_array().reshape(-1)
+        visited[layer] = 1
+        self.visited.count += layer.size
+        self.expanded += layer.size
+
+        tx, ty = self._endpoints()[1]
+        if self.dist[ty * self.width + tx] >= 0 and not self.full:
+            return False
+        return True
+
+    def _finish(self):
+        """Wyznacza ścieżkę na podstawie mapy odległości"""
+        _, (tx, ty) = self._endpoints()
+        if self.dist[ty * self.width + tx] >= 0:
+            self.path = self.descend((tx, ty))
+            if self.source == "start":
+                self.path.reverse()
+            self.solved = True
+
+    def descend(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Schodzi po gradiencie mapy odległości od pola pos do źródła
+        :return: Lista pól od pos do źródła mapy
+        """
+        mask = self._mask if self._mask is not None else self.maze.neighbor_mask_array()
+        return descend(self.distances, mask, pos)
+
+    def step(self) -> bool:
+        """
+        Wykonuje jedną warstwę BFS
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if self._advance():
+            return True
+        self._finish()
+        return False
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Oblicza mapę odległości do końca i wyznacza ścieżkę
+        :param max_steps: maksymalna liczba warstw BFS (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        budget = -1 if max_steps is None else max_steps
+        while budget != 0:
+            budget -= 1
+            if not self._advance():
+                self._finish()
+                break
+        return self._budget_result(max_steps, budget)
+
+
+class LPAStarSolver(BaseSolver):
+    """
+    Implementacja algorytmu Lifelong Planning A* (LPA*).
+    Solver obserwuje zmiany ścian labiryntu i po edycji naprawia tylko
+    tę część drzewa przeszukiwania, na którą zmiana miała wpływ.
+    """
+
+    incremental = True
+
+    def __init__(self, maze: Maze):
+        super().__init__(maze)
+        self.g_score: dict = {}
+        self.rhs: dict = {}
+        self.open_set: List[Tuple[float, float, Tuple[int, int]]] = []  # (k1, k2, position)
+        self.queued: dict = {}  # pozycja -> aktualny klucz w open_set
+        self.pushes = 0  # liczba wstawień do open_set
+        self.initialized = False
+        self.start: Optional[Tuple[int, int]] = None
+        self.goal: Optional[Tuple[int, int]] = None
+        maze.add_change_listener(self._on_maze_change)
+
+    def heuristic(self, pos: Tuple[int, int]) -> float:
+        """
+        Funkcja heurystyczna (Manhattan distance)
+        :return: Szacowana odległość do celu
+        """
+        x1, y1 = pos
+        x2, y2 = self.goal
+        return abs(x1 - x2) + abs(y1 - y2)
+
+    def calculate_key(self, pos: Tuple[int, int]) -> Tuple[float, float]:
+        """Oblicza klucz priorytetu pola"""
+        best = min(self.g_score.get(pos, INF), self.rhs.get(pos, INF))
+        return best + self.heuristic(pos), best
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.g_score.clear()
+        self.rhs.clear()
+        self.open_set.clear()
+        self.queued.clear()
+        self.pushes = 0
+        self.initialized = False
+
+    def initialize(self):
+        """Inicjalizuje przeszukiwanie dla bieżących punktów start/koniec"""
+        self.start = self.maze.start_pos
+        self.goal = self.maze.end_pos
+        self.rhs[self.start] = 0
+        self._push(self.start)
+        self.initialized = True
+
+    def _push(self, pos: Tuple[int, int]):
+        """Wstawia pole do kolejki (poprzedni wpis staje się nieaktualny)"""
+        key = self.calculate_key(pos)
+        self.queued[pos] = key
+        heapq.heappush(self.open_set, (key[0], key[1], pos))
+        self.pushes += 1
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Zbiorem otwartym są aktualne wpisy; pozostałe pobrania kopca to wpisy nieaktualne"""
+        popped = self.pushes - len(self.open_set)
+        return self.pushes, popped - self.expanded, len(self.queued)
+
+    def _top_key(self) -> Tuple[float, float]:
+        """Zwraca najmniejszy aktualny klucz, pomijając nieaktualne wpisy"""
+        open_set = self.open_set
+        while open_set and self.queued.get(open_set[0][2]) != open_set[0][:2]:
+            heapq.heappop(open_set)
+        return open_set[0][:2] if open_set else (INF, INF)
+
+    def update_vertex(self, pos: Tuple[int, int]):
+        """Przelicza rhs pola i jego obecność w kolejce"""
+        if pos != self.start:
+            if self.maze.is_wall(*pos):
+                self.rhs.pop(pos, None)
+            else:
+                g_score = self.g_score
+                best = min((g_score.get(p, INF) for p in self.maze.get_neighbors(*pos)), default=INF) + 1
+                if best == INF:
+                    self.rhs.pop(pos, None)
+                else:
+                    self.rhs[pos] = best
+        self.queued.pop(pos, None)
+        if self.g_score.get(pos, INF) != self.rhs.get(pos, INF):
+            self._push(pos)
+
+    def _on_maze_change(self, pos: Optional[Tuple[int, int]]):
+        """Reaguje na zmianę ściany - aktualizuje tylko dotknięte pola"""
+        if not self.initialized:
+            return
+        if pos is None:
+            self.reset()
+            return
+        self.solved = False
+        self.update_vertex(pos)
+        for neighbor in self.maze.get_neighbors(*pos):
+            self.update_vertex(neighbor)
+
+    def _expand(self) -> bool:
+        """
+        Wykonuje jedną iterację ComputeShortestPath
+        :return: True, jeśli przeszukiwanie nie jest jeszcze zakończone
+        """
+        goal = self.goal
+        top = self._top_key()
+        if not self.open_set:
+            return False
+        if top >= self.calculate_key(goal) and self.rhs.get(goal, INF) == self.g_score.get(goal, INF):
+            return False
+
+        _, _, current = heapq.heappop(self.open_set)
+        del self.queued[current]
+        self.visit(current)
+        self.expanded += 1
+
+        if self.g_score.get(current, INF) > self.rhs.get(current, INF):
+            self.g_score[current] = self.rhs[current]
+        else:
+            self.g_score.pop(current, None)
+            self.update_vertex(current)
+        for neighbor in self.maze.get_neighbors(*current):
+            self.update_vertex(neighbor)
+        return True
+
+    def _finish(self):
+        """Wyznacza ścieżkę schodząc od celu po najmniejszych wartościach g"""
+        g_score = self.g_score
+        current = self.goal
+        if g_score.get(current, INF) == INF:
+            self.path = []
+            self.solved = False
+            return
+        total_path = [current]
+        while current != self.start:
+            current = min(self.maze.get_neighbors(*current), key=lambda p: g_score.get(p, INF))
+            total_path.append(current)
+        total_path.reverse()
+        self.path = total_path
+        self.solved = True
+
+    def _prepare(self) -> bool:
+        """
+        Inicjalizuje solver, jeśli trzeba (także po zmianie punktów start/koniec)
+        :return: True, jeśli wykonano inicjalizację
+        """
+        if self.initialized and (self.start, self.goal) == (self.maze.start_pos, self.maze.end_pos):
+            return False
+        self.reset()
+        self.initialize()
+        return True
+
+    def step(self) -> bool:
+        """
+        Wykonuje jeden krok algorytmu LPA*
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if self._prepare():
+            # Składowe sprawdzamy tylko przy nowym przeszukiwaniu: po edycji ścian etykiety mogą wymagać
+            # przeliczenia całej siatki, a naprawa i tak wykrywa brak ścieżki (g(cel) = inf)
+            if not self.endpoints_connected():
+                # Zaległe aktualizacje zostają w kolejce na wypadek ponownego połączenia
+                self.path = []
+                return False
+            return True
+        if self._expand():
+            return True
+        self._finish()
+        return False
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje (lub naprawia po zmianach ścian) przeszukiwanie do końca
+        :param max_steps: maksymalna liczba rozwiniętych węzłów (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        if self._prepare() and not self.endpoints_connected():
+            self.path = []
+            return self.result()
+        budget = -1 if max_steps is None else max_steps
+        while budget != 0:
+            budget -= 1
+            if not self._expand():
+                self._finish()
+                break
+        return self._budget_result(max_steps, budget)
+
+
+class JumpPointSolver(BaseSolver):
+    """
+    Implementacja Jump Point Search dla siatki 4-spójnej (bez ruchów po przekątnej).
+    Zamiast rozwijać każde pole, przeskakuje wzdłuż prostych odcinków aż do pól
+    z wymuszonymi sąsiadami, pomijając symetryczne ścieżki o tej samej długości.
+    Punkty zatrzymania skoków w każdym kierunku są liczone raz (NumPy) przed
+    przeszukiwaniem, więc pojedynczy skok to odczyt z tablicy.
+    Zwraca ścieżki o tej samej (optymalnej) długości co AStarSolver.
+    """
+
+    def __init__(self, maze: Maze):
+        super().__init__(maze)
+        self.open_set: List[Tuple[int, int, int]] = []  # (f_score, counter, indeks pola)
+        self.g_score: dict = {}
+        self.came_from: dict = {}
+        self.direction: dict = {}  # kierunek, z którego dotarto do punktu skoku
+        self.closed: Set[int] = set()
+        self.passable = b''
+        # Dla każdego kierunku: indeks pierwszego pola zatrzymania (ściany lub punktu skoku)
+        self.next_stop: dict = {}
+        self.row = 0
+        self.goal = -1
+        self.counter = 0
+        self.initialized = False
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.open_set.clear()
+        self.g_score.clear()
+        self.came_from.clear()
+        self.direction.clear()
+        self.closed.clear()
+        self.next_stop = {}
+        self.counter = 0
+        self.initialized = False
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        """Indeks pola w siatce z ramką ścian"""
+        return (pos[1] + 1) * self.row + pos[0] + 1
+
+    def _pos(self, index: int) -> Tuple[int, int]:
+        """Pole (x, y) odpowiadające indeksowi w siatce z ramką"""
+        y, x = divmod(index, self.row)
+        return x - 1, y - 1
+
+    def _heuristic(self, index: int) -> int:
+        """Odległość Manhattan do celu"""
+        y, x = divmod(index, self.row)
+        gy, gx = divmod(self.goal, self.row)
+        return abs(x - gx) + abs(y - gy)
+
+    @staticmethod
+    def _next_stops(stop: np.ndarray, forward: bool) -> np.ndarray:
+        """
+        Dla każdego pola (w kolejności płaskiej tablicy) indeks najbliższego pola zatrzymania
+        w przód (forward) lub w tył. Ramka ścian gwarantuje zatrzymanie w tym samym wierszu.
+        """
+        stops = np.flatnonzero(stop.ravel())
+        cells = np.arange(stop.size)
+        if forward:
+            return stops[np.searchsorted(stops, cells)]
+        return stops[np.searchsorted(stops, cells, side="right") - 1]
+
+    def _build_jump_tables(self, passable: np.ndarray):
+        """
+        Wyznacza punkty zatrzymania skoków dla czterech kierunków
+        :param passable: tablica bool przechodniości pól z ramką ścian
+        """
+        height, width = passable.shape
+        row = self.row
+        goal = np.zeros_like(passable)
+        goal.flat[self.goal] = True
+        inner = (slice(1, -1), slice(1, -1))
+        up, down = passable[:-2, 1:-1], passable[2:, 1:-1]
+        left, right = passable[1:-1, :-2], passable[1:-1, 2:]
+
+        def forced(side_a, behind_a, side_b, behind_b) -> np.ndarray:
+            condition = np.zeros_like(passable)
+            condition[inner] = (side_a & ~behind_a) | (side_b & ~behind_b)
+            return condition
+
+        # Ruch poziomy: wolne pole nad/pod, a nad/pod polem poprzednim ściana
+        forced_right = forced(up, passable[:-2, :-2], down, passable[2:, :-2])
+        forced_left = forced(up, passable[:-2, 2:], down, passable[2:, 2:])
+        stop_right = ~passable | forced_right | goal
+        stop_left = ~passable | forced_left | goal
+        next_right = self._next_stops(stop_right, True)
+        next_left = self._next_stops(stop_left, False)
+
+        # Z pola można skoczyć poziomo, jeśli skok w bok kończy się na wolnym polu
+        flat_passable = passable.ravel()
+        cells = np.arange(passable.size)
+        horizontal = np.zeros(passable.size, dtype=bool)
+        horizontal[1:-1] = flat_passable[next_right[cells[2:]]] | flat_passable[next_left[cells[:-2]]]
+        horizontal = horizontal.reshape(height, width) & passable
+
+        # Ruch pionowy: wolne pole z boku, a z boku pola poprzedniego ściana; albo możliwy skok poziomy
+        forced_down = forced(left, passable[:-2, :-2], right, passable[:-2, 2:])
+        forced_up = forced(left, passable[2:, :-2], right, passable[2:, 2:])
+        stop_down = (~passable | forced_down | goal | horizontal).T
+        stop_up = (~passable | forced_up | goal | horizontal).T
+        # Kolejność kolumnowa: indeks w transpozycji -> indeks w siatce
+        to_grid = np.arange(passable.size).reshape(height, width).T.ravel()
+        next_down = np.empty(passable.size, dtype=np.int64)
+        next_up = np.empty(passable.size, dtype=np.int64)
+        next_down[to_grid] = to_grid[self._next_stops(stop_down, True)]
+        next_up[to_grid] = to_grid[self._next_stops(stop_up, False)]
+
+        self.next_stop = {
+            step: array('i', table.astype(np.int32).tobytes())
+            for step, table in ((1, next_right), (-1, next_left), (row, next_down), (-row, next_up))
+        }
+
+    def initialize(self):
+        """Tworzy migawkę przechodniości pól (z ramką ścian), tablice skoków i wstawia start do zbioru otwartego"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        maze = self.maze
+        self.row = maze.width + 2
+        passable = np.zeros((maze.height + 2, self.row), dtype=bool)
+        passable[1:-1, 1:-1] = np.asarray(maze.grid) != 1
+        self.passable = passable.tobytes()
+        self.goal = self._index(maze.end_pos)
+        self._build_jump_tables(passable)
+        start = self._index(maze.start_pos)
+        self.g_score = {start: 0}
+        self.direction = {start: 0}
+        heapq.heappush(self.open_set, (self._heuristic(start), self.counter, start))
+        self.counter += 1
+
+    def jump(self, index: int, step: int) -> int:
+        """
+        Skok od pola index (już przesuniętego o step) w kierunku step
+        :return: Indeks punktu skoku albo -1, jeśli skok kończy się na ścianie
+        """
+        stop = self.next_stop[step][index]
+        return stop if self.passable[stop] else -1
+
+    def _directions(self, index: int) -> Tuple[int, ...]:
+        """Kierunki po przycięciu: dalej prosto i w bok (ze startu - wszystkie cztery)"""
+        row = self.row
+        came = self.direction[index]
+        if came == 0:
+            return 1, -1, row, -row
+        if came in (1, -1):
+            return came, row, -row
+        return came, 1, -1
+
+    def _expand(self) -> bool:
+        """
+        Rozwija jeden punkt skoku
+        :return: True, jeśli należy kontynuować
+        """
+        open_set = self.open_set
+        while open_set and open_set[0][2] in self.closed:
+            heapq.heappop(open_set)
+        if not open_set:
+            return False
+
+        current = heapq.heappop(open_set)[2]
+        self.closed.add(current)
+        self.visit(self._pos(current))
+        self.expanded += 1
+        if current == self.goal:
+            self.reconstruct_path(current)
+            self.solved = True
+            return False
+
+        g_current = self.g_score[current]
+        for step in self._directions(current):
+            jump = self.jump(current + step, step)
+            if jump < 0 or jump in self.closed:
+                continue
+            tentative = g_current + abs(jump - current) // abs(step)
+            if tentative < self.g_score.get(jump, tentative + 1):
+                self.g_score[jump] = tentative
+                self.came_from[jump] = current
+                self.direction[jump] = step
+                heapq.heappush(open_set, (tentative + self._heuristic(jump), self.counter, jump))
+                self.counter += 1
+        return True
+
+    def reconstruct_path(self, current: int):
+        """Rekonstruuje ścieżkę, uzupełniając pola między kolejnymi punktami skoku"""
+        path = [self._pos(current)]
+        while current in self.came_from:
+            previous = self.came_from[current]
+            step = self.direction[current]
+            while current != previous:
+                current -= step
+                path.append(self._pos(current))
+        path.reverse()
+        self.path = path
+
+    def queue_stats(self) -> Tuple[int, int, int]:
+        """Jak w FlatAStarSolver - wpisy kolejki numerowane są licznikiem"""
+        popped = self.counter - len(self.open_set)
+        return self.counter, popped - self.expanded, len(self.open_set)
+
+    def step(self) -> bool:
+        """
+        Rozwija jeden punkt skoku
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete() or self.solved:
+            return False
+        if not self.initialized:
+            self.initialize()
+            return True
+        return self._expand()
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje Jump Point Search do końca
+        :param max_steps: maksymalna liczba rozwiniętych punktów skoku (None - bez limitu)
+        :return: Wynik rozwiązania
+        """
+        self.steps_used = 0
+        if not self.maze.is_complete() or self.solved:
+            return self.result()
+        if not self.initialized:
+            self.initialize()
+        expand = self._expand
+        budget = -1 if max_steps is None else max_steps
+        while budget != 0:
+            budget -= 1
+            if not expand():
+                break
+        return self._budget_result(max_steps, budget)
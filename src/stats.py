@@ -0,0 +1,206 @@
+"""
+Statystyki pracy solverów: rozwinięte węzły, operacje na kolejce, rozmiar
+zbioru otwartego, czasy kroków i przybliżone zużycie pamięci.
+
+Pomiar prowadzi StatsRecorder, który opakowuje solver i zastępuje go przy
+wywołaniach step() i solve(). Gdy statystyki są wyłączone, wywołuje się
+solver bezpośrednio, więc nie ma żadnego narzutu. Liczniki kolejki solvery
+wyznaczają ze swojego stanu (BaseSolver.queue_stats), a nie w pętli przeszukiwania.
+"""
+import json
+import sys
+import time
+from array import array
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from solver import BaseSolver, CellMask, SolveResult
+
+# Co tyle kroków solve() próbkuje rozmiar zbioru otwartego
+SAMPLE_STEPS = 256
+# Liczba elementów kontenera, z których szacowany jest rozmiar pojedynczego elementu
+MEMORY_SAMPLE = 8
+
+
+def _sampled(items) -> list:
+    """Pierwsze MEMORY_SAMPLE elementów kontenera"""
+    sample = []
+    for item in items:
+        if len(sample) == MEMORY_SAMPLE:
+            break
+        sample.append(item)
+    return sample
+
+
+def estimate_size(value, depth: int = 2) -> int:
+    """
+    Szacuje pamięć zajmowaną przez bufor lub kontener solvera
+    :param value: tablica, bufor albo kontener
+    :param depth: do jakiej głębokości liczone są zagnieżdżone kontenery
+    :return: Liczba bajtów (rozmiar elementów kontenera szacowany z próbki)
+    """
+    if isinstance(value, np.ndarray):
+        # Widok na cudzą tablicę (np. siatkę labiryntu) nie jest pamięcią solvera
+        return value.nbytes if value.base is None else 0
+    if isinstance(value, CellMask):
+        return sys.getsizeof(value.flags)
+    if isinstance(value, (bytes, bytearray, array, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset, dict, deque)):
+        size = sys.getsizeof(value)
+        if depth == 0 or not value:
+            return size
+        items = value.items() if isinstance(value, dict) else value
+        sample = _sampled(items)
+        per_item = sum(estimate_size(item, depth - 1) for item in sample) / len(sample)
+        return size + int(per_item * len(value))
+    if isinstance(value, (int, float)):
+        return sys.getsizeof(value)
+    return 0
+
+
+def estimate_memory(solver: BaseSolver) -> int:
+    """
+    Przybliżona pamięć struktur solvera (bez labiryntu i obiektów współdzielonych)
+    :return: Liczba bajtów
+    """
+    return sum(estimate_size(value) for name, value in vars(solver).items() if name != "maze")
+
+
+@dataclass
+class SolverStats:
+    """Statystyki jednego rozwiązywania"""
+    algorithm: str = ""
+    expanded: int = 0
+    pushes: int = 0  # wstawienia do kolejki / zbioru otwartego
+    stale_pops: int = 0  # pobrania nieaktualnych wpisów kolejki
+    open_size: int = 0
+    peak_open_size: int = 0
+    steps: int = 0
+    total_time: float = 0.0  # sekundy
+    max_step_time: float = 0.0  # sekundy (tylko przy wywołaniach step())
+    memory_bytes: int = 0
+    solved: bool = False
+    path_length: int = 0
+    path_cost: int = 0
+
+    @property
+    def mean_step_time(self) -> float:
+        """Średni czas kroku w sekundach"""
+        return self.total_time / self.steps if self.steps else 0.0
+
+    def to_dict(self) -> dict:
+        """Słownik do zapisu w JSON"""
+        data = asdict(self)
+        data["mean_step_time"] = self.mean_step_time
+        return data
+
+    def to_json(self) -> str:
+        """Statystyki jako tekst JSON"""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def lines(self) -> List[str]:
+        """Linie tekstu do wyświetlenia na ekranie"""
+        return [
+            f"{self.algorithm}: {'rozwiązano' if self.solved else 'w toku / brak ścieżki'}",
+            f"rozwinięte: {self.expanded}  kroki: {self.steps}",
+            f"wstawienia: {self.pushes}  nieaktualne: {self.stale_pops}",
+            f"zbiór otwarty: {self.open_size} (maks. {self.peak_open_size})",
+            f"czas: {self.total_time * 1000:.1f} ms  krok: {self.mean_step_time * 1e6:.0f} us"
+            f" (maks. {self.max_step_time * 1e6:.0f} us)",
+            f"pamięć: ~{self.memory_bytes / 1024:.0f} KiB",
+            f"ścieżka: {self.path_length} pól, koszt {self.path_cost}",
+        ]
+
+
+class StatsRecorder:
+    """
+    Mierzy pracę solvera. Ma te same metody step() i solve() co solver,
+    więc może go zastąpić w pętli rozwiązywania.
+    """
+
+    def __init__(self, solver: BaseSolver, algorithm: str = ""):
+        """
+        :param solver: mierzony solver
+        :param algorithm: nazwa algorytmu zapisywana w statystykach
+        """
+        self.solver = solver
+        self.algorithm = algorithm
+        self.steps = 0
+        self.total_time = 0.0
+        self.max_step_time = 0.0
+        self.peak_open_size = 0
+
+    def reset(self):
+        """Zeruje pomiary (np. przed kolejnym rozwiązywaniem)"""
+        self.steps = 0
+        self.total_time = 0.0
+        self.max_step_time = 0.0
+        self.peak_open_size = 0
+
+    def _sample_open(self):
+        """Uwzględnia bieżący rozmiar zbioru otwartego w maksimum"""
+        open_size = self.solver.queue_stats()[2]
+        if open_size > self.peak_open_size:
+            self.peak_open_size = open_size
+
+    def step(self) -> bool:
+        """Wykonuje i mierzy jeden krok solvera"""
+        started = time.perf_counter()
+        running = self.solver.step()
+        elapsed = time.perf_counter() - started
+        self.steps += 1
+        self.total_time += elapsed
+        if elapsed > self.max_step_time:
+            self.max_step_time = elapsed
+        self._sample_open()
+        return running
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """
+        Wykonuje solver do końca paczkami po SAMPLE_STEPS kroków, próbkując między nimi
+        rozmiar zbioru otwartego (szybka ścieżka solve() solvera zostaje zachowana)
+        :param max_steps: maksymalna liczba kroków (None - bez limitu)
+        """
+        solver = self.solver
+        remaining = max_steps
+        while remaining is None or remaining > 0:
+            chunk = SAMPLE_STEPS if remaining is None else min(SAMPLE_STEPS, remaining)
+            started = time.perf_counter()
+            solver.solve(chunk)
+            self.total_time += time.perf_counter() - started
+            used = solver.steps_used
+            self.steps += used
+            self._sample_open()
+            # Solver zakończył pracę, jeśli nie zużył całej paczki (samo znalezienie ścieżki nie wystarcza -
+            # Monte Carlo błądzi dalej; paczka samych nieaktualnych wpisów kolejki zużywa kroki)
+            if used < chunk:
+                break
+            if remaining is not None:
+                remaining -= chunk
+        return solver.result()
+
+    def snapshot(self) -> SolverStats:
+        """Zbiera bieżące statystyki solvera"""
+        solver = self.solver
+        self._sample_open()
+        pushes, stale_pops, open_size = solver.queue_stats()
+        found = solver.solved and bool(solver.path)
+        return SolverStats(
+            algorithm=self.algorithm,
+            expanded=solver.expanded,
+            pushes=pushes,
+            stale_pops=stale_pops,
+            open_size=open_size,
+            peak_open_size=self.peak_open_size,
+            steps=self.steps,
+            total_time=self.total_time,
+            max_step_time=self.max_step_time,
+            memory_bytes=estimate_memory(solver),
+            solved=found,
+            path_length=len(solver.path) if found else 0,
+            path_cost=solver.maze.path_cost(solver.path) if found else 0
+        )
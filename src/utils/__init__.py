@@ -1,3 +1,3 @@
-from .logger import CustomLogger
+from .logger import CustomLogger, StrokeLog
 
-__all__ = ['CustomLogger']
\ No newline at end of file
+__all__ = ['CustomLogger', 'StrokeLog']
\ No newline at end of file
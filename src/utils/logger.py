@@ -1,40 +1,59 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
-
-import colorama
-from colorama import Fore, Back, Style
-
-# Initialize colorama for Windows support
-colorama.init()
+from typing import Dict, Optional, Tuple
 
 
 class ColoredFormatter(logging.Formatter):
     """
     Niestandardowy formatter dodający kolory do logów w konsoli.
+    colorama ładowana jest przy pierwszym komunikacie (w trybie w tle - w wątku zapisującym),
+    żeby nie wydłużać uruchamiania programu.
     """
-    COLORS = {
-        'DEBUG': Fore.CYAN,
-        'INFO': Fore.GREEN,
-        'WARNING': Fore.YELLOW,
-        'ERROR': Fore.RED,
-        'CRITICAL': Fore.RED + Back.WHITE
-    }
+    COLORS: Optional[Dict[str, str]] = None
+    RESET = ''
+
+    @classmethod
+    def load_colors(cls) -> Dict[str, str]:
+        """Importuje colorama (obsługa kolorów w konsoli Windows) i zwraca kolory poziomów"""
+        if cls.COLORS is None:
+            import colorama
+            from colorama import Fore, Back, Style
+
+            colorama.init()
+            cls.RESET = Style.RESET_ALL
+            cls.COLORS = {
+                'DEBUG': Fore.CYAN,
+                'INFO': Fore.GREEN,
+                'WARNING': Fore.YELLOW,
+                'ERROR': Fore.RED,
+                'CRITICAL': Fore.RED + Back.WHITE
+            }
+        return cls.COLORS
 
     def format(self, record):
         # Dodaj kolor do nazwy poziomu logowania
-        if record.levelname in self.COLORS:
-            color = self.COLORS[record.levelname]
-            record.levelname = f"{color}{record.levelname}{Style.RESET_ALL}"
-            record.msg = f"{color}{record.msg}{Style.RESET_ALL}"
+        colors = self.load_colors()
+        if record.levelname in colors:
+            color = colors[record.levelname]
+            # Kolorujemy kopię - ten sam rekord trafia też do handlera plikowego
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = f"{color}{record.getMessage()}{self.RESET}"
+            record.args = None
+            record.levelname = f"{color}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
 class CustomLogger:
     """
     Klasa zarządzająca logowaniem, obsługująca zarówno logi konsolowe, jak i plikowe.
+    Komunikaty przyjmują argumenty w stylu % (logger.info("Pole (%d, %d)", x, y)), formatowane
+    dopiero wtedy, gdy komunikat faktycznie zostanie zapisany.
+    W trybie w tle (background=True) rekordy trafiają do kolejki, a zapisem na konsolę
+    i do pliku zajmuje się osobny wątek (QueueListener), więc wywołujący nie czeka na wejście-wyjście.
     """
 
     def __init__(
@@ -43,10 +62,12 @@ class CustomLogger:
             log_file: Optional[str] = None,
             log_level: int = logging.INFO,
             max_file_size: int = 5_242_880,  # 5MB
-            backup_count: int = 3
+            backup_count: int = 3,
+            background: bool = False
     ):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
+        self.listener: Optional[QueueListener] = None
 
         # Upewnij się, że logger nie ma już handlerów
         if self.logger.handlers:
@@ -66,7 +87,7 @@ class CustomLogger:
         # Handler konsolowy
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
 
         # Handler plikowy (opcjonalny)
         if log_file:
@@ -77,33 +98,111 @@ class CustomLogger:
                 log_file,
                 maxBytes=max_file_size,
                 backupCount=backup_count,
-                encoding='utf-8'
+                encoding='utf-8',
+                delay=True  # plik otwierany przy pierwszym zapisie, a nie przy starcie
             )
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        if background:
+            records = queue.SimpleQueue()
+            self.logger.addHandler(QueueHandler(records))
+            self.listener = QueueListener(records, *handlers, respect_handler_level=True)
+            self.listener.start()
+            # Przy zamykaniu programu zapisujemy rekordy, które zostały w kolejce
+            atexit.register(self.stop)
+        else:
+            for handler in handlers:
+                self.logger.addHandler(handler)
+
+    def stop(self):
+        """Kończy tryb w tle - czeka na zapisanie wszystkich rekordów z kolejki"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
 
     def set_level(self, level: int):
         """Zmienia poziom logowania."""
         self.logger.setLevel(level)
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Sprawdza, czy komunikaty danego poziomu są zapisywane (np. przed kosztownym przygotowaniem danych)"""
+        return self.logger.isEnabledFor(level)
+
     # Metody pomocnicze dla różnych poziomów logowania
-    def debug(self, message: str):
-        self.logger.debug(message)
+    def log(self, level: int, message: str, *args):
+        self.logger.log(level, message, *args)
+
+    def debug(self, message: str, *args):
+        self.logger.debug(message, *args)
+
+    def info(self, message: str, *args):
+        self.logger.info(message, *args)
 
-    def info(self, message: str):
-        self.logger.info(message)
+    def warning(self, message: str, *args):
+        self.logger.warning(message, *args)
 
-    def warning(self, message: str):
-        self.logger.warning(message)
+    def error(self, message: str, *args):
+        self.logger.error(message, *args)
 
-    def error(self, message: str):
-        self.logger.error(message)
+    def critical(self, message: str, *args):
+        self.logger.critical(message, *args)
 
-    def critical(self, message: str):
-        self.logger.critical(message)
+    def exception(self, message: str, *args):
+        self.logger.exception(message, *args)
 
-    def exception(self, message: str):
-        self.logger.exception(message)
+
+class StrokeLog:
+    """
+    Zbiera zdarzenia dotyczące pojedynczych pól w trakcie jednego pociągnięcia myszą
+    i zapisuje je jako jedną linię podsumowania zamiast linii na każde pole.
+    """
+
+    def __init__(self, logger: CustomLogger, level: int = logging.INFO):
+        """
+        :param logger: logger, do którego trafia podsumowanie
+        :param level: poziom linii podsumowania
+        """
+        self.logger = logger
+        self.level = level
+        self.action: Optional[str] = None
+        self.count = 0
+        self.first: Tuple[int, int] = (0, 0)
+        self.last: Tuple[int, int] = (0, 0)
+        self.low: Tuple[int, int] = (0, 0)
+        self.high: Tuple[int, int] = (0, 0)
+
+    def start(self, action: str, pos: Tuple[int, int]):
+        """
+        Rozpoczyna pociągnięcie
+        :param action: opis czynności w podsumowaniu (np. "Rysowanie ścian")
+        :param pos: pierwsze zmienione pole
+        """
+        # Pociągnięcie bez puszczenia przycisku (np. poza oknem) też dostaje swoje podsumowanie
+        self.finish()
+        self.action = action
+        self.count = 1
+        self.first = self.last = self.low = self.high = pos
+
+    def add(self, pos: Tuple[int, int]):
+        """Dolicza kolejne zmienione pole (bez zapisu do logu)"""
+        if self.action is None:
+            return
+        x, y = pos
+        self.count += 1
+        self.last = pos
+        self.low = (min(self.low[0], x), min(self.low[1], y))
+        self.high = (max(self.high[0], x), max(self.high[1], y))
+
+    def finish(self):
+        """Kończy pociągnięcie i zapisuje podsumowanie (jeśli pociągnięcie trwało)"""
+        if self.action is None:
+            return
+        self.logger.log(
+            self.level, "%s: %d pól od (%d, %d) do (%d, %d), obszar (%d, %d)-(%d, %d)",
+            self.action, self.count, *self.first, *self.last, *self.low, *self.high
+        )
+        self.action = None
 
 
 # Przykład użycia:
@@ -0,0 +1,265 @@
+"""
+Błądzenie losowe wielu wędrowców naraz (Monte Carlo).
+
+Wszyscy wędrowcy startują z punktu startowego i w każdym kroku przechodzą na
+losowo wybrane wolne pole sąsiednie. Pozycje są płaską tablicą NumPy, a ruch
+wybierany jest z tablicy przesunięć indeksowanej maską sąsiadów pola, więc
+krok wszystkich wędrowców to kilka operacji wektorowych. Wędrowiec, który
+dotarł do celu, odpada z tablicy, a jego krok zapisywany jest jako czas dojścia.
+
+Losowanie korzysta z numpy.random.Generator o zadanym ziarnie, dlatego przebieg
+da się powtórzyć: ścieżka najszybszego wędrowca odtwarzana jest ponownym
+przebiegiem z tym samym ziarnem, bez zapamiętywania tras wszystkich wędrowców.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from maze import Maze, MASK_OFFSETS
+from solver import BaseSolver, CellMask, SolveResult
+
+# Domyślna liczba wędrowców
+WALKERS = 1000
+# Liczba zbieranych pozycji, po której są one doliczane do mapy odwiedzin
+FLUSH_SIZE = 1 << 20
+# Domyślny limit kroków błądzenia: tyle razy liczba pól labiryntu
+TIME_FACTOR = 20
+
+
+def move_tables(width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tablice ruchów dla każdej 4-bitowej maski sąsiadów
+    :param width: szerokość siatki (przesunięcia są w indeksach płaskich)
+    :return: Liczba dostępnych ruchów (16,) i przesunięcia k-tego ruchu (16, 4)
+    """
+    counts = np.array([len(offsets) for offsets in MASK_OFFSETS], dtype=np.int64)
+    offsets = np.zeros((16, 4), dtype=np.int64)
+    for mask, directions in enumerate(MASK_OFFSETS):
+        for k, (dx, dy) in enumerate(directions):
+            offsets[mask, k] = dy * width + dx
+    return counts, offsets
+
+
+def loop_erase(walk: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Usuwa pętle z trasy błądzenia
+    :return: Ścieżka bez powtórzonych pól, od początku do końca trasy
+    """
+    path: List[Tuple[int, int]] = []
+    index: Dict[Tuple[int, int], int] = {}
+    for pos in walk:
+        if pos in index:
+            # Powrót na pole już na ścieżce - odcinamy pętlę
+            for dropped in path[index[pos] + 1:]:
+                del index[dropped]
+            del path[index[pos] + 1:]
+        else:
+            index[pos] = len(path)
+            path.append(pos)
+    return path
+
+
+class WalkerBatch:
+    """Pozycje wędrowców, którzy jeszcze nie dotarli do celu"""
+
+    def __init__(self, flat_mask: np.ndarray, width: int, start: int, count: int, seed: int):
+        """
+        :param flat_mask: płaska maska sąsiadów siatki
+        :param width: szerokość siatki
+        :param start: płaski indeks pola startowego
+        :param count: liczba wędrowców
+        :param seed: ziarno generatora liczb losowych
+        """
+        self.flat_mask = flat_mask
+        self.counts, self.offsets = move_tables(width)
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.full(count, start, dtype=np.int64)
+        self.ids = np.arange(count, dtype=np.int64)
+        self.time = 0
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def advance(self):
+        """Przesuwa każdego wędrowca na losowe wolne pole sąsiednie"""
+        masks = self.flat_mask[self.pos]
+        # Wędrowiec bez wolnych sąsiadów dostaje ruch 0 o przesunięciu 0 i stoi w miejscu
+        choice = (self.rng.random(len(self.pos)) * self.counts[masks]).astype(np.int64)
+        self.pos += self.offsets[masks, choice]
+        self.time += 1
+
+    def remove_arrived(self, goal: int) -> np.ndarray:
+        """
+        Usuwa wędrowców stojących na polu celu
+        :return: Numery usuniętych wędrowców (rosnąco)
+        """
+        arrived = self.pos == goal
+        if not arrived.any():
+            return self.ids[:0]
+        ids = self.ids[arrived]
+        keep = ~arrived
+        self.pos = self.pos[keep]
+        self.ids = self.ids[keep]
+        return ids
+
+
+class MonteCarloWalkSolver(BaseSolver):
+    """
+    Błądzenie losowe wielu wędrowców naraz. Jeden krok solvera to jeden ruch
+    wszystkich wędrowców, którzy nie dotarli jeszcze do celu.
+    Wynikiem jest ścieżka najszybszego wędrowca (z usuniętymi pętlami), rozkład
+    czasów dojścia do celu i mapa częstości odwiedzin pól.
+    Maska sąsiadów pobierana jest przy starcie - zmiany ścian w trakcie nie są uwzględniane.
+    """
+
+    # Wynik zależy od ziarna, a pamięć rozwiązań nie przechowuje mapy odwiedzin
+    deterministic = False
+
+    def __init__(self, maze: Maze, walkers: int = WALKERS, seed: int = 0, max_time: Optional[int] = None):
+        """
+        :param maze: labirynt
+        :param walkers: liczba wędrowców
+        :param seed: ziarno generatora liczb losowych
+        :param max_time: limit kroków błądzenia (domyślnie TIME_FACTOR razy liczba pól)
+        """
+        super().__init__(maze)
+        self.walkers = walkers
+        self.seed = seed
+        self.max_time = max_time if max_time is not None else maze.width * maze.height * TIME_FACTOR
+        self.visited = CellMask(maze.width, maze.height)
+        self.batch: Optional[WalkerBatch] = None
+        self.hit_times = np.full(walkers, -1, dtype=np.int64)  # -1 - wędrowiec nie dotarł do celu
+        self.visits = np.zeros(maze.width * maze.height, dtype=np.int64)
+        self.fastest_walk: List[Tuple[int, int]] = []
+        self._pending: List[np.ndarray] = []
+        self._pending_size = 0
+        self.initialized = False
+
+    def reset(self):
+        """Resetuje stan solvera"""
+        super().reset()
+        self.batch = None
+        self.hit_times.fill(-1)
+        self.visits.fill(0)
+        self.fastest_walk = []
+        self._pending.clear()
+        self._pending_size = 0
+        self.initialized = False
+
+    def _new_batch(self) -> WalkerBatch:
+        """Tworzy wędrowców na polu startowym (ten sam ciąg losowań przy każdym wywołaniu)"""
+        sx, sy = self.maze.start_pos
+        flat_mask = np.ascontiguousarray(self.maze.neighbor_mask_array()).ravel()
+        return WalkerBatch(flat_mask, self.maze.width, sy * self.maze.width + sx, self.walkers, self.seed)
+
+    def _goal(self) -> int:
+        """Płaski indeks pola celu"""
+        ex, ey = self.maze.end_pos
+        return ey * self.maze.width + ex
+
+    def _record(self, positions: np.ndarray):
+        """Odkłada pozycje do mapy odwiedzin (doliczane paczkami przez np.bincount)"""
+        self._pending.append(positions.copy())
+        self._pending_size += len(positions)
+        if self._pending_size >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        """Dolicza odłożone pozycje do mapy odwiedzin i aktualizuje zbiór odwiedzonych pól"""
+        if not self._pending:
+            return
+        self.visits += np.bincount(np.concatenate(self._pending), minlength=len(self.visits))
+        self._pending.clear()
+        self._pending_size = 0
+        visited = self.visits.reshape(self.maze.height, self.maze.width) > 0
+        self.visited.as_array()[:] = visited
+        self.visited.count = int(np.count_nonzero(visited))
+
+    def initialize(self):
+        """Ustawia wędrowców na polu startowym (jeśli cel jest w tej samej składowej)"""
+        self.initialized = True
+        if not self.endpoints_connected():
+            return
+        self.batch = self._new_batch()
+        self._record(self.batch.pos)
+        self._arrivals()
+
+    def _arrivals(self):
+        """Zapisuje czasy wędrowców, którzy dotarli do celu; przy pierwszym dojściu odtwarza ścieżkę"""
+        arrived = self.batch.remove_arrived(self._goal())
+        if not len(arrived):
+            return
+        self.hit_times[arrived] = self.batch.time
+        if not self.solved:
+            self.fastest_walk = self.replay(int(arrived[0]), self.batch.time)
+            self.path = loop_erase(self.fastest_walk)
+            self.solved = True
+
+    def replay(self, walker: int, until: int) -> List[Tuple[int, int]]:
+        """
+        Odtwarza trasę jednego wędrowca ponownym przebiegiem z tym samym ziarnem.
+        Losowania zależą od wszystkich wędrowców, więc przebieg powtarzany jest w całości:
+        koszt równy dotychczasowemu błądzeniu (until ruchów wszystkich wędrowców), ponoszony
+        jednorazowo w kroku pierwszego dojścia do celu.
+        :param walker: numer wędrowca
+        :param until: liczba kroków do odtworzenia
+        :return: Lista pól odwiedzonych przez wędrowca (z powtórzeniami)
+        """
+        batch = self._new_batch()
+        goal = self._goal()
+        width = self.maze.width
+        trace = [int(batch.pos[walker])]
+        while batch.time < until:
+            batch.advance()
+            # Numery wędrowców pozostają posortowane, więc pozycję wędrowca znajduje wyszukiwanie binarne
+            trace.append(int(batch.pos[np.searchsorted(batch.ids, walker)]))
+            batch.remove_arrived(goal)
+        return [(index % width, index // width) for index in trace]
+
+    def step(self) -> bool:
+        """
+        Wykonuje jeden ruch wszystkich wędrowców
+        :return: True, jeśli należy kontynuować rozwiązywanie, False, jeśli zakończono
+        """
+        if not self.maze.is_complete():
+            return False
+        if not self.initialized:
+            self.initialize()
+            return self.batch is not None and len(self.batch) > 0
+        if self.batch is None or not len(self.batch) or self.batch.time >= self.max_time:
+            self._flush()
+            return False
+
+        self.batch.advance()
+        self.expanded += len(self.batch)
+        self._record(self.batch.pos)
+        self._arrivals()
+        return len(self.batch) > 0 and self.batch.time < self.max_time
+
+    def solve(self, max_steps: Optional[int] = None) -> SolveResult:
+        """Wykonuje błądzenie do końca i dolicza wszystkie odłożone pozycje do mapy odwiedzin"""
+        result = super().solve(max_steps)
+        self._flush()
+        return result
+
+    def heatmap(self) -> Optional[np.ndarray]:
+        """
+        Liczba wejść wędrowców na każde pole (int64 o kształcie siatki).
+        Dolicza odłożone pozycje, więc po wywołaniu aktualny jest także zbiór visited.
+        """
+        self._flush()
+        return self.visits.reshape(self.maze.height, self.maze.width)
+
+    def hitting_time_summary(self) -> Dict[str, Optional[float]]:
+        """
+        Podsumowanie rozkładu czasów dojścia do celu
+        :return: Słownik z liczbą wędrowców, liczbą dojść i statystykami czasów (None bez dojść)
+        """
+        times = self.hit_times[self.hit_times >= 0]
+        summary: Dict[str, Optional[float]] = {"walkers": self.walkers, "arrived": int(len(times))}
+        if len(times):
+            summary.update(min=int(times.min()), median=float(np.median(times)), mean=float(times.mean()),
+                           p90=float(np.percentile(times, 90)), max=int(times.max()))
+        else:
+            summary.update(min=None, median=None, mean=None, p90=None, max=None)
+        return summary
@@ -0,0 +1,347 @@
+"""
+Rozwiązywanie labiryntu w tle (w osobnym wątku lub procesie).
+
+Wątek/proces roboczy okresowo publikuje migawkę stanu solvera, którą pętla
+zdarzeń odczytuje bez blokowania i przepisuje do stałego obiektu SolverView
+przekazywanego rendererowi.
+"""
+import gc
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from cache import CacheEntry, SolutionCache
+from maze import Maze, PackedGrid
+from solver import BaseSolver, CellMask
+
+
+class Snapshot(NamedTuple):
+    """Niezmienna migawka stanu solvera"""
+    # Zbiór pól, pola odwiedzone od poprzedniej migawki (delta=True) albo flagi pól (y * width + x)
+    visited: Union[frozenset, Tuple[Tuple[int, int], ...], bytes, None]
+    visited_count: int
+    path: Tuple[Tuple[int, int], ...]
+    solved: bool
+    expanded: int
+    finished: bool
+    visits: Optional[np.ndarray] = None  # mapa odwiedzin (dla solverów, które ją prowadzą)
+    delta: bool = False
+
+
+class SolverView:
+    """Stan solvera widziany przez GUI - ten sam obiekt przez cały czas pracy w tle"""
+
+    def __init__(self, solver: BaseSolver):
+        maze = solver.maze
+        self.maze = maze
+        self.visited: Union[set, CellMask] = (
+            CellMask(maze.width, maze.height) if isinstance(solver.visited, CellMask) else set()
+        )
+        # Jak w BaseSolver: pola z migawek-delt od ostatniego odczytu, prowadzone dla zarejestrowanego renderera
+        self.record_visits = 0
+        self.visit_log: List[Tuple[int, int]] = []
+        self.path: List[Tuple[int, int]] = []
+        self.path_version = 0  # jak BaseSolver.path_version - zwiększany przy każdej migawce
+        self.solved = False
+        self.expanded = 0
+        self.visits: Optional[np.ndarray] = None
+
+    def heatmap(self) -> Optional[np.ndarray]:
+        """Mapa odwiedzin z ostatniej migawki (jak BaseSolver.heatmap)"""
+        return self.visits
+
+    def apply(self, snapshot: Snapshot):
+        """Przepisuje migawkę do widoku (migawki-delty trzeba przepisywać po kolei, bez pomijania)"""
+        if isinstance(self.visited, CellMask):
+            if snapshot.visited is not None:
+                self.visited.flags[:] = snapshot.visited
+                self.visited.count = snapshot.visited_count
+        elif snapshot.delta:
+            self.visited.update(snapshot.visited)
+            if self.record_visits:
+                self.visit_log.extend(snapshot.visited)
+        else:
+            self.visited = set(snapshot.visited)
+            # Renderer porówna wtedy całe zbiory (liczba pól nie zgadza się z visit_log)
+            self.visit_log.clear()
+        self.path = list(snapshot.path)
+        self.path_version += 1
+        self.solved = snapshot.solved
+        self.expanded = snapshot.expanded
+        self.visits = snapshot.visits
+
+
+def take_snapshot(solver: BaseSolver, finished: bool, published: int = -1) -> Snapshot:
+    """
+    Tworzy migawkę bieżącego stanu solvera
+    :param published: liczba odwiedzonych pól w poprzedniej migawce (-1 - brak); jeśli od tamtej pory
+                      pola przybywały tylko przez visit(), migawka zawiera same nowe pola z visit_log
+    """
+    # heatmap() dolicza też odłożone odwiedziny (błądzenie Monte Carlo) - przed odczytem visited
+    visits = solver.heatmap()
+    visited = solver.visited
+    log = solver.visit_log
+    delta = False
+    if isinstance(visited, CellMask):
+        visited_copy = bytes(visited.flags)
+    elif solver.record_visits and published >= 0 and len(visited) - published == len(log):
+        visited_copy = tuple(log)
+        delta = True
+    else:
+        visited_copy = frozenset(visited)
+    log.clear()
+    return Snapshot(visited_copy, len(visited), tuple(solver.path), solver.solved, solver.expanded, finished,
+                    visits.copy() if visits is not None else None, delta)
+
+
+def _run_solver(solver: BaseSolver, cancel, publish, interval: float) -> bool:
+    """
+    Wykonuje kroki solvera, co interval sekund publikując migawkę.
+    Wywołujący rejestruje się jako odbiorca visit_log solvera (record_visits), jeśli migawki mają być deltami.
+    :return: True, jeśli solver zakończył pracę (False - anulowano)
+    """
+    next_publish = time.perf_counter() + interval
+    steps = 0
+    published = -1
+    solver.visit_log.clear()
+    while not cancel.is_set():
+        if not solver.step():
+            publish(take_snapshot(solver, True, published))
+            return True
+        steps += 1
+        # Zegar sprawdzamy co kilkaset kroków, żeby nie spowalniać pętli
+        if steps & 0xFF == 0 and time.perf_counter() >= next_publish:
+            publish(take_snapshot(solver, False, published))
+            published = len(solver.visited)
+            next_publish = time.perf_counter() + interval
+    return False
+
+
+class ThreadSolverWorker:
+    """Uruchamia solver w wątku w tle"""
+
+    def __init__(self, solver: BaseSolver, publish_interval: float = 1 / 30):
+        self.solver = solver
+        self.view = SolverView(solver)
+        self.publish_interval = publish_interval
+        self.finished = False
+        self._cancel = threading.Event()
+        # Migawki czekające na przepisanie do widoku; deque.append i popleft są bezpieczne między wątkami
+        self._pending: deque = deque()
+        # Wątek roboczy odczytuje visit_log solvera - rejestrujemy się w wątku GUI, przed startem
+        solver.record_visits += 1
+        self._registered = True
+        self._thread = threading.Thread(target=self._run, name="solver-worker", daemon=True)
+
+    def _publish(self, snapshot: Snapshot):
+        self._pending.append(snapshot)
+
+    def _run(self):
+        _run_solver(self.solver, self._cancel, self._publish, self.publish_interval)
+
+    def start(self):
+        """Uruchamia wątek roboczy"""
+        self._thread.start()
+
+    def poll(self) -> SolverView:
+        """Przepisuje najnowszą migawkę do widoku i zwraca widok"""
+        # Stan wątku sprawdzamy przed odczytem migawek - zakończony wątek opublikował już wszystkie
+        alive = self._thread.is_alive()
+        # Delty pól odwiedzonych przepisujemy wszystkie, po kolei
+        while self._pending:
+            snapshot = self._pending.popleft()
+            self.view.apply(snapshot)
+            self.finished = snapshot.finished
+        if not alive and self._thread.ident is not None and not self._cancel.is_set():
+            # Wątek zakończył się bez końcowej migawki (np. po wyjątku w solverze)
+            self.finished = True
+        if self.finished:
+            self._unregister()
+        return self.view
+
+    def cancel(self):
+        """Przerywa pracę i czeka na zakończenie wątku"""
+        self._cancel.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._unregister()
+
+    def _unregister(self):
+        """Wyrejestrowuje wątek roboczy jako odbiorcę visit_log (w wątku GUI, po zakończeniu pracy)"""
+        if self._registered:
+            self._registered = False
+            self.solver.record_visits -= 1
+            if not self.solver.record_visits:
+                self.solver.visit_log.clear()
+
+    def apply_result(self, solver: BaseSolver):
+        """Solver działał w tym samym procesie, więc ma już pełny wynik"""
+
+
+def _grid_buffer(maze: Maze) -> np.ndarray:
+    """Tablica z danymi siatki (dla siatki bitowej - spakowane bity)"""
+    return maze.grid.bits if isinstance(maze.grid, PackedGrid) else np.asarray(maze.grid)
+
+
+class SharedMazeSpec(NamedTuple):
+    """Opis labiryntu w pamięci współdzielonej - wystarcza, by odtworzyć go w innym procesie"""
+    name: str
+    size: Tuple[int, int]
+    storage: str
+    buffer_shape: Tuple[int, ...]
+    dtype: str
+    start: Optional[Tuple[int, int]]
+    end: Optional[Tuple[int, int]]
+
+
+def share_maze(maze: Maze) -> Tuple[shared_memory.SharedMemory, SharedMazeSpec]:
+    """
+    Kopiuje siatkę labiryntu do nowego bloku pamięci współdzielonej.
+    Wywołujący odpowiada za close() i unlink() zwróconego bloku.
+    :return: Para (blok pamięci, opis labiryntu)
+    """
+    grid = _grid_buffer(maze)
+    memory = shared_memory.SharedMemory(create=True, size=max(1, grid.nbytes))
+    shared_grid = np.ndarray(grid.shape, dtype=grid.dtype, buffer=memory.buf)
+    shared_grid[:] = grid
+    del shared_grid
+    spec = SharedMazeSpec(memory.name, (maze.width, maze.height), maze.storage, grid.shape, grid.dtype.str,
+                          maze.start_pos, maze.end_pos)
+    return memory, spec
+
+
+def attach_shared_maze(spec: SharedMazeSpec) -> Tuple[shared_memory.SharedMemory, Maze]:
+    """
+    Tworzy labirynt, którego siatka leży (bez kopiowania) w pamięci współdzielonej
+    :return: Para (blok pamięci, labirynt) - blok należy zamknąć przez close_shared()
+    """
+    memory = shared_memory.SharedMemory(name=spec.name)
+    width, height = spec.size
+    data = np.ndarray(spec.buffer_shape, dtype=spec.dtype, buffer=memory.buf)
+    grid = PackedGrid(width, height, data) if spec.storage == "bits" else data
+    maze = Maze(width, height, spec.storage, grid=grid)
+    if spec.start is not None:
+        maze.set_start(*spec.start)
+    if spec.end is not None:
+        maze.set_end(*spec.end)
+    return memory, maze
+
+
+def close_shared(memory: shared_memory.SharedMemory):
+    """Zamyka blok pamięci współdzielonej po usunięciu ostatnich odwołań do labiryntu"""
+    try:
+        memory.close()
+    except BufferError:
+        # Solver i labirynt mogą tworzyć cykl odwołań (obserwatorzy zmian) - zwalniamy go jawnie
+        gc.collect()
+        memory.close()
+
+
+def _process_main(spec: SharedMazeSpec, solver_cls: Type[BaseSolver], cancel, results, interval: float):
+    """Funkcja procesu roboczego: solver na siatce w pamięci współdzielonej"""
+    grid_memory, maze = attach_shared_maze(spec)
+    try:
+        solver = solver_cls(maze)
+        solver.record_visits += 1
+        _run_solver(solver, cancel, results.put, interval)
+        del maze, solver
+    finally:
+        close_shared(grid_memory)
+
+
+class ProcessSolverWorker:
+    """
+    Uruchamia solver w osobnym procesie. Siatka labiryntu trafia do procesu
+    przez pamięć współdzieloną, a migawki wracają przez kolejkę.
+    """
+
+    def __init__(self, solver: BaseSolver, publish_interval: float = 1 / 30):
+        maze = solver.maze
+        self.solver = solver
+        self.view = SolverView(solver)
+        self.publish_interval = publish_interval
+        self.finished = False
+        self._grid_memory, spec = share_maze(maze)
+
+        context = multiprocessing.get_context("spawn")
+        self._cancel = context.Event()
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=_process_main,
+            args=(spec, type(solver), self._cancel, self._results, publish_interval),
+            name="solver-worker",
+            daemon=True
+        )
+
+    def start(self):
+        """Uruchamia proces roboczy"""
+        self._process.start()
+
+    def poll(self) -> SolverView:
+        """Odbiera (bez blokowania) migawki, przepisuje je po kolei do widoku i zwraca widok"""
+        while not self.finished:
+            try:
+                snapshot = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.view.apply(snapshot)
+            if snapshot.finished:
+                self.finished = True
+                self._cleanup()
+        return self.view
+
+    def cancel(self):
+        """Przerywa pracę procesu i zwalnia pamięć współdzieloną"""
+        self._cancel.set()
+        self._cleanup()
+
+    def _cleanup(self):
+        """Czeka na proces i zwalnia zasoby"""
+        # Proces nie zakończy się, dopóki nie odbierzemy wysłanych migawek
+        deadline = time.monotonic() + 1.0
+        while self._process.is_alive() and time.monotonic() < deadline:
+            try:
+                self._results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        if self._grid_memory is not None:
+            self._grid_memory.close()
+            self._grid_memory.unlink()
+            self._grid_memory = None
+
+    def apply_result(self, solver: BaseSolver):
+        """Przepisuje wynik z procesu roboczego do solvera w GUI"""
+        maze = solver.maze
+        view = self.view
+        if isinstance(view.visited, CellMask):
+            visited = view.visited.as_array().astype(bool)
+        else:
+            visited = np.zeros((maze.height, maze.width), dtype=bool)
+            if view.visited:
+                xs, ys = zip(*view.visited)
+                visited[list(ys), list(xs)] = True
+        entry = CacheEntry(
+            path=list(view.path),
+            solved=view.solved,
+            expanded=view.expanded,
+            visited=np.packbits(visited, axis=None)
+        )
+        SolutionCache.restore(solver, entry)
+        if view.visits is not None:
+            # Mapy odwiedzin nie ma we wpisie pamięci rozwiązań - przepisujemy ją osobno
+            solver.heatmap()[:] = view.visits
+
+
+WORKERS = {
+    "thread": ThreadSolverWorker,
+    "process": ProcessSolverWorker,
+}
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Moduły projektu importowane są płasko (jak w src/main.py)
+src_dir = Path(__file__).parent.parent / "src"
+if str(src_dir) not in sys.path:
+    sys.path.insert(0, str(src_dir))
@@ -0,0 +1,63 @@
+"""Wspólne labirynty i referencyjna Dijkstra dla testów"""
+import heapq
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from maze import Maze, MAX_COST
+
+
+def random_maze(seed: int, storage: str = "uint8", terrain: bool = False,
+                width: int = 31, height: int = 23, density: float = 0.28) -> Maze:
+    """Losowe ściany (i opcjonalnie koszty terenu) oraz start/cel na losowych wolnych polach"""
+    rng = np.random.default_rng(seed)
+    maze = Maze(width, height, storage)
+    walls = rng.random((height, width)) < density
+    if terrain:
+        values = rng.integers(2, MAX_COST + 1, size=(height, width))
+        values[rng.random((height, width)) < 0.5] = 0
+        maze.grid[:] = np.where(walls, 1, values)
+    else:
+        maze.grid[:] = walls
+    maze.refresh()
+    free = np.flatnonzero(~walls)
+    start, end = rng.choice(free, size=2, replace=False).tolist()
+    maze.set_start(start % width, start // width)
+    maze.set_end(end % width, end // width)
+    return maze
+
+
+def dijkstra(maze: Maze) -> Optional[int]:
+    """Referencyjny koszt najtańszej ścieżki (None, gdy cel jest nieosiągalny)"""
+    best = {maze.start_pos: 0}
+    queue: List[Tuple[int, Tuple[int, int]]] = [(0, maze.start_pos)]
+    while queue:
+        cost, pos = heapq.heappop(queue)
+        if pos == maze.end_pos:
+            return cost
+        if cost > best[pos]:
+            continue
+        for neighbor in maze.get_neighbors(*pos):
+            new_cost = cost + maze.cost(*neighbor)
+            if new_cost < best.get(neighbor, new_cost + 1):
+                best[neighbor] = new_cost
+                heapq.heappush(queue, (new_cost, neighbor))
+    return None
+
+
+def assert_valid_path(maze: Maze, path: List[Tuple[int, int]]):
+    """Ścieżka prowadzi od startu do celu po sąsiednich wolnych polach"""
+    assert path[0] == maze.start_pos
+    assert path[-1] == maze.end_pos
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert (nx, ny) in maze.get_neighbors(x, y)
+
+
+def walled_off_maze() -> Maze:
+    """Labirynt 9x7, w którym pionowa ściana odcina cel od startu"""
+    maze = Maze(9, 7)
+    maze.grid[:, 4] = 1
+    maze.refresh()
+    maze.set_start(0, 3)
+    maze.set_end(8, 3)
+    return maze
@@ -0,0 +1,67 @@
+"""Rozwiązywanie wsadowe: zadania, rekordy z błędami i ograniczona liczba zadań w toku"""
+import io
+
+import pytest
+
+import batch
+from batch import BatchJob, parse_job, solve_batch, solve_mazes
+from helpers import random_maze
+
+
+def test_parse_generator_spec():
+    jobs = parse_job("gen:prim:21x11:3..5")
+    assert [job.name for job in jobs] == [f"gen:prim:21x11:{seed}" for seed in (3, 4, 5)]
+    assert jobs[0].source == ("prim", 21, 11, 3)
+
+
+@pytest.mark.parametrize("text", ["gen:prim:21x11", "gen:prim:axb:0", "gen:nope:21x11:0"])
+def test_parse_rejects_bad_generator_spec(text: str):
+    with pytest.raises(ValueError):
+        parse_job(text)
+
+
+def test_bad_stdin_line_becomes_invalid_job(monkeypatch):
+    monkeypatch.setattr(batch.sys, "stdin", io.StringIO("gen:prim:21x11:0\ngen:nope:1x1:0\n\n"))
+    jobs = list(batch._read_jobs(["-"]))
+    assert [job.kind for job in jobs] == ["generate", "invalid"]
+
+
+def test_error_records_do_not_stop_the_batch(tmp_path):
+    jobs = parse_job("gen:prim:21x11:0..1") + [
+        BatchJob("missing", "file", str(tmp_path / "missing.txt")),
+        BatchJob("gen:nope", "invalid", "Nieznany generator: nope"),
+    ]
+    records = sorted(solve_batch(jobs, processes=1, include_path=False), key=lambda r: r["index"])
+    assert [r["index"] for r in records] == [0, 1, 2, 3]
+    assert records[0]["solved"] and records[1]["solved"] and "path" not in records[0]
+    assert "missing.txt" in records[2]["error"]
+    assert records[3]["error"] == "Nieznany generator: nope"
+
+
+def test_unexpected_exception_becomes_error_record():
+    records = list(solve_batch(parse_job("gen:prim:21x11:0..1"), algorithm="nope", processes=1))
+    assert len(records) == 2
+    assert all(record["error"] == "KeyError: 'nope'" for record in records)
+
+
+def test_solve_mazes_shares_a_bounded_number_of_mazes():
+    pulled = []
+    in_flight = []
+
+    def mazes():
+        for seed in range(8):
+            pulled.append(seed)
+            yield random_maze(seed)
+
+    for record in solve_mazes(mazes(), processes=1, include_path=False):
+        in_flight.append(len(pulled) - len(in_flight))
+    assert len(in_flight) == 8
+    # Dwa zadania w toku na proces (+1 pobierane, gdy wynik jest już odbierany)
+    assert max(in_flight) <= 3
+
+
+def test_stopping_early_closes_the_pool():
+    jobs = (job for job in parse_job("gen:prim:21x11:0..50"))
+    results = solve_batch(jobs, processes=1, include_path=False, max_pending=1)
+    assert next(results)["solved"]
+    results.close()
@@ -0,0 +1,91 @@
+"""SolutionCache: klucze po skrócie zawartości, unieważnianie i wypieranie LRU"""
+import pytest
+
+from cache import SolutionCache
+from headless import SOLVERS
+from helpers import random_maze
+
+
+def solved(maze, algorithm: str = "astar"):
+    solver = SOLVERS[algorithm](maze)
+    solver.solve()
+    return solver
+
+
+def test_hit_restores_solution():
+    maze = random_maze(0)
+    cache = SolutionCache()
+    solver = solved(maze)
+    assert cache.put(maze, "astar", solver)
+    entry = cache.get(maze, "astar")
+    assert entry is not None and cache.hits == 1
+
+    restored = SOLVERS["astar"](maze)
+    SolutionCache.restore(restored, entry)
+    assert restored.path == solver.path
+    assert restored.solved and restored.expanded == solver.expanded
+    assert set(restored.visited) == set(solver.visited)
+
+
+def test_content_hash_change_misses_and_invalidates():
+    maze = random_maze(0)
+    cache = SolutionCache()
+    cache.watch(maze)
+    cache.put(maze, "astar", solved(maze))
+    old_hash = maze.content_hash()
+
+    x, y = next((x, y) for x in range(maze.width) for y in range(maze.height)
+                if not maze.is_wall(x, y) and (x, y) not in (maze.start_pos, maze.end_pos))
+    maze.set_wall(x, y)
+    assert maze.content_hash() != old_hash
+    assert cache.get(maze, "astar") is None
+    # Wpis starej zawartości został usunięty przez obserwatora, nie tylko przestał pasować
+    assert not cache.entries and cache.total_bytes == 0
+
+    maze.remove_wall(x, y)
+    assert maze.content_hash() == old_hash
+    assert cache.get(maze, "astar") is None
+
+
+def test_key_includes_endpoints_and_algorithm():
+    maze = random_maze(1)
+    cache = SolutionCache()
+    cache.put(maze, "astar", solved(maze))
+    assert cache.get(maze, "astar_flat") is None
+    start = maze.start_pos
+    other = next((x, y) for x in range(maze.width) for y in range(maze.height)
+                 if not maze.is_wall(x, y) and (x, y) not in (start, maze.end_pos))
+    maze.set_start(*other)
+    assert cache.get(maze, "astar") is None
+    maze.set_start(*start)
+    assert cache.get(maze, "astar") is not None
+
+
+@pytest.mark.parametrize("algorithm", ["random_walk", "monte_carlo"])
+def test_non_deterministic_solvers_are_not_cached(algorithm: str):
+    maze = random_maze(1, width=15, height=11, density=0.2)
+    solver = SOLVERS[algorithm](maze)
+    solver.solve(200_000)
+    cache = SolutionCache()
+    assert not cache.put(maze, algorithm, solver)
+    assert cache.get(maze, algorithm) is None
+
+
+def test_lru_eviction_by_count():
+    cache = SolutionCache(max_entries=2)
+    mazes = [random_maze(seed) for seed in range(3)]
+    for maze in mazes:
+        cache.put(maze, "astar", solved(maze))
+    assert cache.get(mazes[0], "astar") is None
+    assert cache.get(mazes[1], "astar") is not None
+    cache.put(mazes[0], "astar", solved(mazes[0]))
+    # mazes[1] był użyty ostatnio - wypierany jest mazes[2]
+    assert cache.get(mazes[2], "astar") is None
+    assert cache.get(mazes[1], "astar") is not None
+
+
+def test_entry_larger_than_limit_is_rejected():
+    maze = random_maze(0)
+    cache = SolutionCache(max_bytes=16)
+    assert not cache.put(maze, "astar", solved(maze))
+    assert cache.total_bytes == 0
@@ -0,0 +1,72 @@
+"""Indeks spójnych składowych: aktualizacje po edycji ścian zgodne z pełnym etykietowaniem"""
+import numpy as np
+import pytest
+
+import maze as maze_module
+from helpers import random_maze, walled_off_maze
+from maze import Maze, label_components
+
+
+def assert_same_partition(maze: Maze):
+    """Etykiety indeksu dzielą pola tak samo jak etykietowanie od zera"""
+    expected, _ = label_components(np.asarray(maze.grid) != 1)
+    labels = maze.component_labels()
+    assert ((labels == 0) == (expected == 0)).all()
+    pairs = np.unique(np.stack([labels[expected > 0], expected[expected > 0]]), axis=1)
+    # Każda etykieta indeksu odpowiada dokładnie jednej etykiecie wzorcowej i odwrotnie
+    assert len(np.unique(pairs[0])) == len(np.unique(pairs[1])) == pairs.shape[1]
+
+
+@pytest.mark.parametrize("storage", ["uint8", "bits"])
+def test_random_edits_match_full_relabel(storage: str):
+    maze = random_maze(0, storage, width=41, height=31, density=0.35)
+    maze.component_labels()
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        x, y = int(rng.integers(maze.width)), int(rng.integers(maze.height))
+        if maze.is_wall(x, y):
+            maze.remove_wall(x, y)
+        else:
+            maze.set_wall(x, y)
+        assert_same_partition(maze)
+
+
+def test_wall_without_split_keeps_labels():
+    maze = Maze(9, 7)
+    labels = maze.component_labels()
+    maze.set_wall(4, 3)
+    assert maze._components is labels
+    assert maze.are_connected((3, 3), (5, 3))
+
+
+def test_closing_a_gap_splits_locally():
+    maze = walled_off_maze()
+    maze.remove_wall(4, 3)
+    labels = maze.component_labels()
+    assert maze.are_connected(maze.start_pos, maze.end_pos)
+    maze.set_wall(4, 3)
+    assert maze._components is labels
+    assert not maze.are_connected(maze.start_pos, maze.end_pos)
+    assert_same_partition(maze)
+
+
+def test_split_check_over_limit_relabels(monkeypatch):
+    monkeypatch.setattr(maze_module, "SPLIT_CHECK_LIMIT", 8)
+    maze = walled_off_maze()
+    maze.remove_wall(4, 3)
+    maze.component_labels()
+    maze.set_wall(4, 3)
+    assert maze._components is None
+    assert not maze.are_connected(maze.start_pos, maze.end_pos)
+    assert_same_partition(maze)
+
+
+def test_bits_storage_answers_connectivity():
+    maze = walled_off_maze()
+    packed = Maze(maze.width, maze.height, "bits")
+    packed.grid[:] = np.asarray(maze.grid)
+    packed.refresh()
+    assert not packed.are_connected((0, 3), (8, 3))
+    assert packed.are_connected((0, 0), (3, 6))
+    packed.remove_wall(4, 0)
+    assert packed.are_connected((0, 3), (8, 3))
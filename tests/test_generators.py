@@ -0,0 +1,51 @@
+"""Generatory labiryntów: powtarzalność z ziarna, spójność i wybór punktów start/koniec"""
+import numpy as np
+import pytest
+
+from generators import GENERATORS, ellers, generate, iter_ellers_rows
+from maze import Maze, label_components
+
+PERFECT = sorted(name for name in GENERATORS if name != "noise")
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATORS))
+def test_same_seed_same_maze(algorithm: str):
+    a = generate(Maze(41, 31), algorithm, 7)
+    b = generate(Maze(41, 31), algorithm, 7)
+    assert (a.grid == b.grid).all()
+    assert (a.start_pos, a.end_pos) == (b.start_pos, b.end_pos)
+
+
+@pytest.mark.parametrize("size", [(41, 31), (40, 30), (3, 3)])
+@pytest.mark.parametrize("algorithm", PERFECT)
+def test_perfect_maze_is_a_spanning_tree(algorithm: str, size):
+    maze = generate(Maze(*size), algorithm, 3)
+    passable = maze.grid != 1
+    labels, count = label_components(passable)
+    assert count == 1
+    # Drzewo: liczba przejść między wolnymi polami = liczba wolnych pól - 1
+    edges = np.count_nonzero(passable[:, :-1] & passable[:, 1:]) + np.count_nonzero(passable[:-1] & passable[1:])
+    assert edges == np.count_nonzero(passable) - 1
+    assert maze.are_connected(maze.start_pos, maze.end_pos)
+
+
+def test_ellers_rows_stream_the_same_maze():
+    rows = np.array(list(iter_ellers_rows(41, 29, np.random.default_rng(3))))
+    assert (rows == ellers(41, 29, np.random.default_rng(3))[:len(rows)]).all()
+
+
+@pytest.mark.parametrize("storage", ["uint8", "bits"])
+@pytest.mark.parametrize("seed", range(4))
+def test_noise_starts_in_largest_component(storage: str, seed: int):
+    maze = generate(Maze(61, 41, storage), "noise", seed, density=0.45)
+    labels, _ = label_components(np.asarray(maze.grid) != 1)
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    (sx, sy), (ex, ey) = maze.start_pos, maze.end_pos
+    assert labels[sy, sx] == labels[ey, ex] == np.argmax(sizes)
+    assert (sx, sy) != (ex, ey)
+
+
+def test_noise_without_connected_cells_is_rejected():
+    with pytest.raises(ValueError):
+        generate(Maze(5, 5), "noise", 0, density=1.0)
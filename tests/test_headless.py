@@ -0,0 +1,45 @@
+"""Tryb bez GUI: parsowanie labiryntu tekstowego i rekordy wyników"""
+import json
+
+import pytest
+
+import headless
+
+TEXT = """\
+S..#....
+.#.#.##.
+.#...#E.
+"""
+
+
+def test_parse_text_maze():
+    maze = headless.parse_text_maze(TEXT.splitlines())
+    assert (maze.width, maze.height) == (8, 3)
+    assert maze.start_pos == (0, 0)
+    assert maze.end_pos == (6, 2)
+    assert maze.is_wall(3, 0) and not maze.is_wall(2, 0)
+
+
+@pytest.mark.parametrize("text", ["", "....\n", "S...\n"])
+def test_parse_text_maze_rejects_incomplete(text: str):
+    with pytest.raises(ValueError):
+        headless.parse_text_maze(text.splitlines())
+
+
+def test_solve_maze_record():
+    record = headless.solve_maze(headless.parse_text_maze(TEXT.splitlines()))
+    assert record["solved"]
+    assert record["cost"] == len(record["path"]) - 1 == 14
+    assert record["path"][0] == (0, 0) and record["path"][-1] == (6, 2)
+
+
+def test_main_prints_json_lines(tmp_path, capsys):
+    good = tmp_path / "good.txt"
+    good.write_text(TEXT, encoding="utf-8")
+    bad = tmp_path / "bad.txt"
+    bad.write_text("....\n", encoding="utf-8")
+    assert headless.main([str(good), str(bad), "--no-path"]) == 1
+    out, err = capsys.readouterr()
+    record = json.loads(out)
+    assert record["file"] == str(good) and record["solved"] and "path" not in record
+    assert "bad.txt" in err
@@ -0,0 +1,70 @@
+"""HPA*: graf klastrów liczony w kroku budowy i przeliczany lokalnie po edycji ścian"""
+from hpa import ClusterGraph, HPAStarSolver
+from helpers import assert_valid_path, dijkstra, random_maze
+
+
+def built_graph(maze, size: int = 8) -> ClusterGraph:
+    graph = ClusterGraph(maze, size)
+    graph.precompute()
+    return graph
+
+
+def test_first_step_precomputes_every_cluster():
+    maze = random_maze(0, width=40, height=24, density=0.2)
+    solver = HPAStarSolver(maze, 8)
+    assert solver.step()
+    assert solver.graph.precomputed and len(solver.graph.intra) == 5 * 3
+    solver.step()
+    expected = dijkstra(maze)
+    assert solver.solved == (expected is not None)
+    if expected is not None:
+        assert_valid_path(maze, solver.path)
+
+
+def test_interior_wall_invalidates_only_its_cluster():
+    maze = random_maze(1, width=40, height=24, density=0.1)
+    graph = built_graph(maze)
+    intra = dict(graph.intra)
+    transitions = {border: list(pairs) for border, pairs in graph.transitions.items()}
+
+    maze.remove_wall(11, 12)
+    maze.set_wall(11, 12)
+    assert set(intra) - set(graph.intra) == {(1, 1)}
+    assert all(graph.intra[c] is edges for c, edges in intra.items() if c != (1, 1))
+    assert graph.transitions == transitions
+
+
+def test_border_wall_rescans_border_and_both_clusters():
+    maze = random_maze(2, width=40, height=24, density=0.1)
+    graph = built_graph(maze)
+    intra = dict(graph.intra)
+    transitions = {border: list(pairs) for border, pairs in graph.transitions.items()}
+
+    # x = 15 to ostatnia kolumna klastra (1, 1) na granicy z (2, 1)
+    maze.remove_wall(15, 12)
+    maze.remove_wall(16, 12)
+    maze.set_wall(15, 12)
+    border = ((1, 1), (2, 1))
+    assert set(intra) - set(graph.intra) == {(1, 1), (2, 1)}
+    assert all(graph.intra[c] is edges for c, edges in intra.items() if c not in border)
+    assert all(graph.transitions.get(b) == pairs for b, pairs in transitions.items() if b != border)
+    assert all((15, 12) not in pair for pair in graph.transitions.get(border, ()))
+
+    # Krok budowy uzupełnia tylko unieważnione klastry
+    graph.precompute()
+    assert graph.precomputed
+    assert all(graph.intra[c] is edges for c, edges in intra.items() if c not in border)
+
+
+def test_solver_after_edits_matches_fresh_graph():
+    maze = random_maze(3, width=40, height=24, density=0.2)
+    solver = HPAStarSolver(maze, 8)
+    solver.solve()
+    for x, y in [(7, 3), (8, 3), (20, 10), (31, 16)]:
+        if (x, y) not in (maze.start_pos, maze.end_pos):
+            maze.set_wall(x, y)
+    solver.reset()
+    repaired = solver.solve()
+    fresh = HPAStarSolver(maze, 8).solve()
+    assert repaired.solved == fresh.solved == (dijkstra(maze) is not None)
+    assert repaired.path == fresh.path
@@ -0,0 +1,87 @@
+"""LPAStarSolver: naprawa ścieżki po set_wall / remove_wall zamiast przeszukiwania od nowa"""
+import numpy as np
+import pytest
+
+from helpers import assert_valid_path, dijkstra, random_maze
+from solver import LPAStarSolver
+
+
+def edit_cells(maze, seed: int, count: int):
+    """Losowe pola do edycji (bez startu i celu)"""
+    rng = np.random.default_rng(seed)
+    cells = rng.integers(0, (maze.width, maze.height), size=(count * 2, 2)).tolist()
+    return [tuple(cell) for cell in cells if tuple(cell) not in (maze.start_pos, maze.end_pos)][:count]
+
+
+def assert_optimal(maze, solver: LPAStarSolver):
+    expected = dijkstra(maze)
+    assert solver.solved == (expected is not None)
+    if expected is not None:
+        assert_valid_path(maze, solver.path)
+        assert len(solver.path) - 1 == expected
+    else:
+        assert solver.path == []
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_repair_after_wall_edits(seed: int):
+    maze = random_maze(seed, density=0.2)
+    solver = LPAStarSolver(maze)
+    solver.solve()
+    assert_optimal(maze, solver)
+    for x, y in edit_cells(maze, seed, 30):
+        if maze.is_wall(x, y):
+            maze.remove_wall(x, y)
+        else:
+            maze.set_wall(x, y)
+        solver.solve()
+        assert_optimal(maze, solver)
+
+
+def test_repair_expands_less_than_fresh_search():
+    maze = random_maze(7, width=61, height=41, density=0.25)
+    for x, y in ((0, 0), (60, 40)):
+        maze.remove_wall(x, y)
+    maze.set_start(0, 0)
+    maze.set_end(60, 40)
+    solver = LPAStarSolver(maze)
+    solver.solve()
+    assert solver.solved
+    # Ściana na polu odwiedzonym, ale poza ścieżką - naprawa dotyczy tylko jego otoczenia
+    x, y = next(cell for cell in sorted(solver.visited) if cell not in solver.path)
+    maze.set_wall(x, y)
+    expanded = solver.expanded
+    solver.solve()
+    assert_optimal(maze, solver)
+    fresh = LPAStarSolver(maze)
+    fresh.solve()
+    assert solver.expanded - expanded < fresh.expanded // 4
+
+
+def test_cut_and_rejoin():
+    maze = random_maze(0, width=9, height=7, density=0.0)
+    maze.set_start(0, 3)
+    maze.set_end(8, 3)
+    solver = LPAStarSolver(maze)
+    solver.solve()
+    for y in range(maze.height):
+        maze.set_wall(4, y)
+    solver.solve()
+    assert not solver.solved and solver.path == []
+    maze.remove_wall(4, 6)
+    solver.solve()
+    assert_optimal(maze, solver)
+    assert (4, 6) in solver.path
+
+
+def test_stepping_repairs_like_solve():
+    maze = random_maze(2, density=0.2)
+    stepped, solved = LPAStarSolver(maze), LPAStarSolver(maze)
+    for cell in [None] + edit_cells(maze, 2, 10):
+        if cell is not None:
+            maze.remove_wall(*cell) if maze.is_wall(*cell) else maze.set_wall(*cell)
+        while stepped.step():
+            pass
+        solved.solve()
+        assert stepped.solved == solved.solved
+        assert len(stepped.path) == len(solved.path)
@@ -0,0 +1,55 @@
+"""Maze: maska sąsiadów aktualizowana przy edycji ścian"""
+import numpy as np
+import pytest
+
+from helpers import random_maze
+from maze import Maze, compute_neighbor_mask
+
+
+def test_neighbor_mask_follows_wall_edits():
+    maze = random_maze(4)
+    mask = maze.neighbor_mask_array()
+    rng = np.random.default_rng(4)
+    for x, y in rng.integers(0, (maze.width, maze.height), size=(200, 2)).tolist():
+        if maze.is_wall(x, y):
+            maze.remove_wall(x, y)
+        else:
+            maze.set_wall(x, y)
+        assert (mask == compute_neighbor_mask(maze.grid != 1)).all()
+    assert maze.neighbor_mask_array() is mask
+
+
+def test_get_neighbors_respects_walls_and_borders():
+    maze = Maze(3, 3)
+    maze.set_wall(1, 0)
+    assert sorted(maze.get_neighbors(0, 0)) == [(0, 1)]
+    assert sorted(maze.get_neighbors(1, 1)) == [(0, 1), (1, 2), (2, 1)]
+    assert maze.get_neighbors(-1, 0) == []
+
+
+def test_refresh_rebuilds_mask_after_direct_grid_write():
+    maze = Maze(5, 4)
+    maze.neighbor_mask_array()
+    maze.grid[1, :] = 1
+    maze.refresh()
+    assert sorted(maze.get_neighbors(2, 0)) == [(1, 0), (3, 0)]
+
+
+def test_packed_grid_matches_uint8_grid():
+    dense = random_maze(6)
+    packed = random_maze(6, storage="bits")
+    assert packed.grid.nbytes * 8 <= dense.grid.nbytes + 8 * dense.height
+    assert (np.asarray(packed.grid) == dense.grid).all()
+    for x, y in [(0, 0), (5, 7), (30, 22)]:
+        packed.set_wall(x, y)
+        dense.set_wall(x, y)
+    assert (np.asarray(packed.grid) == dense.grid).all()
+    assert sorted(packed.get_neighbors(5, 8)) == sorted(dense.get_neighbors(5, 8))
+
+
+@pytest.mark.parametrize("storage", ["bool", "bits"])
+def test_compact_storage_rejects_terrain(storage: str):
+    maze = Maze(4, 4, storage)
+    assert maze.set_cost(1, 1, 1)
+    with pytest.raises(ValueError):
+        maze.set_cost(1, 1, 3)
@@ -0,0 +1,95 @@
+"""Zapis i odczyt plików labiryntu (save_rows / save_maze / load_maze)"""
+import numpy as np
+import pytest
+
+from generators import generate, iter_ellers_rows
+from maze import Maze, MAX_COST
+from mazefile import MazeFileError, load_maze, read_header, save_maze, save_rows
+
+
+def walls(seed: int, width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(seed).random((height, width)) < 0.3
+
+
+@pytest.mark.parametrize("encoding", ["bits", "raw"])
+@pytest.mark.parametrize("width, height", [(1, 1), (7, 5), (8, 3), (33, 17)])
+def test_save_rows_round_trip(tmp_path, encoding: str, width: int, height: int):
+    grid = walls(width * height, width, height)
+    grid[0, 0] = grid[-1, -1] = False
+    path = tmp_path / "maze.bin"
+    save_rows(path, width, height, iter(grid), (0, 0), (width - 1, height - 1), encoding)
+
+    header = read_header(path)
+    assert (header.width, header.height) == (width, height)
+    maze = load_maze(path)
+    assert maze.storage == ("bits" if encoding == "bits" else "uint8")
+    assert (np.asarray(maze.grid) == grid).all()
+    assert maze.start_pos == (0, 0)
+    assert maze.end_pos == ((width - 1, height - 1) if (width, height) != (1, 1) else None)
+
+
+def test_save_rows_streams_ellers(tmp_path):
+    rng = np.random.default_rng(3)
+    path = tmp_path / "ellers.bin"
+    save_rows(path, 41, 29, iter_ellers_rows(41, 29, rng))
+    expected = generate(Maze(41, 29), "ellers", 3)
+    assert (np.asarray(load_maze(path).grid) == expected.grid).all()
+
+
+def test_raw_keeps_terrain_costs(tmp_path):
+    maze = generate(Maze(25, 19), "noise", 5)
+    rng = np.random.default_rng(5)
+    for x, y in rng.integers(0, (25, 19), size=(40, 2)).tolist():
+        maze.set_cost(x, y, int(rng.integers(1, MAX_COST + 1)))
+    path = tmp_path / "terrain.bin"
+    save_maze(maze, path, "raw")
+    loaded = load_maze(path)
+    assert (np.asarray(loaded.grid) == maze.grid).all()
+    assert (loaded.start_pos, loaded.end_pos) == (maze.start_pos, maze.end_pos)
+
+
+def test_wrong_row_count_keeps_previous_file(tmp_path):
+    path = tmp_path / "maze.bin"
+    save_rows(path, 4, 2, iter(np.zeros((2, 4), dtype=bool)))
+    with pytest.raises(ValueError):
+        save_rows(path, 4, 3, iter(np.ones((2, 4), dtype=bool)))
+    assert not np.asarray(load_maze(path).grid).any()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "maze.bin"
+    save_rows(path, 16, 16, iter(np.zeros((16, 16), dtype=bool)))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(MazeFileError):
+        load_maze(path)
+
+
+def test_load_is_lazy_and_copy_on_write(tmp_path):
+    maze = generate(Maze(31, 21), "prim", 2)
+    path = tmp_path / "maze.maze"
+    save_maze(maze, path, "raw")
+    loaded = load_maze(path)
+    assert loaded._neighbor_mask is None
+    x, y = next((x, y) for x in range(31) for y in range(21) if not loaded.is_wall(x, y)
+                and (x, y) not in (loaded.start_pos, loaded.end_pos))
+    loaded.set_wall(x, y)
+    # Tryb 'c' - zmiana tylko w pamięci, plik bez zmian
+    assert not load_maze(path).is_wall(x, y)
+    # Tryb 'r+' - zmiana trafia do pliku
+    writable = load_maze(path, mode="r+")
+    writable.set_wall(x, y)
+    writable.grid.flush()
+    del writable
+    assert load_maze(path).is_wall(x, y)
+
+
+@pytest.mark.parametrize("storage", ["uint8", "bool", "bits"])
+def test_load_into_other_storage(tmp_path, storage: str):
+    maze = generate(Maze(31, 21), "backtracker", 1)
+    path = tmp_path / "maze.bin"
+    save_maze(maze, path)
+    loaded = load_maze(path, storage=storage)
+    assert loaded.storage == storage
+    assert (np.asarray(loaded.grid) == maze.grid).all()
+    assert loaded.neighbor_mask_array().tolist() == maze.neighbor_mask_array().tolist()
@@ -0,0 +1,120 @@
+"""DistanceQuery i landmark_matrix: odległości BFS, ścieżki, pola spoza siatki i unieważnianie"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from helpers import random_maze
+from queries import DistanceQuery, landmark_matrix
+
+
+def bfs(maze, sources):
+    """Referencyjne odległości od najbliższego źródła"""
+    dist = {s: 0 for s in sources}
+    queue = deque(sources)
+    while queue:
+        pos = queue.popleft()
+        for neighbor in maze.get_neighbors(*pos):
+            if neighbor not in dist:
+                dist[neighbor] = dist[pos] + 1
+                queue.append(neighbor)
+    return dist
+
+
+def free_cells(maze):
+    return [(x, y) for y in range(maze.height) for x in range(maze.width) if not maze.is_wall(x, y)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_distances_match_bfs(seed):
+    maze = random_maze(seed)
+    query = DistanceQuery(maze)
+    reference = bfs(maze, [maze.start_pos])
+    for pos in free_cells(maze):
+        assert query.distance(pos) == reference.get(pos, -1)
+
+
+def test_multiple_sources_use_nearest():
+    maze = random_maze(1)
+    cells = free_cells(maze)
+    sources = [cells[0], cells[len(cells) // 2], cells[-1]]
+    query = DistanceQuery(maze, sources)
+    reference = bfs(maze, sources)
+    targets = cells[::7]
+    expected = [reference.get(pos, -1) for pos in targets]
+    assert query.distances_to(targets).tolist() == expected
+
+
+def test_path_to_and_nearest_source():
+    maze = random_maze(2)
+    cells = free_cells(maze)
+    sources = [cells[0], cells[-1]]
+    query = DistanceQuery(maze, sources)
+    for pos in cells[::5]:
+        path = query.path_to(pos)
+        if query.distance(pos) < 0:
+            assert path == [] and query.nearest_source(pos) is None
+            continue
+        assert len(path) == query.distance(pos) + 1
+        assert path[0] in sources and path[-1] == pos
+        for a, b in zip(path, path[1:]):
+            assert b in maze.get_neighbors(*a)
+        assert query.nearest_source(pos) == path[0]
+
+
+def test_targets_outside_grid_are_unreachable():
+    maze = random_maze(0)
+    query = DistanceQuery(maze)
+    inside = (maze.width - 1, maze.height - 1)
+    targets = [(-1, 0), (0, -1), (maze.width, 0), (0, maze.height), inside]
+    result = query.distances_to(targets)
+    assert result[:4].tolist() == [-1] * 4
+    assert result[4] == query.distance(inside)
+    assert query.distance((-1, -1)) == -1
+    assert query.distances_to([]).shape == (0,)
+
+
+def test_sources_must_be_free_cells():
+    maze = random_maze(0)
+    with pytest.raises(ValueError):
+        DistanceQuery(maze, [(-1, 0)])
+    with pytest.raises(ValueError):
+        DistanceQuery(maze, [])
+
+
+def test_landmark_matrix_matches_bfs():
+    maze = random_maze(3)
+    cells = free_cells(maze)
+    landmarks = cells[::40]
+    matrix = landmark_matrix(maze, landmarks)
+    assert (matrix == matrix.T).all()
+    assert (np.diag(matrix) == 0).all()
+    for i, source in enumerate(landmarks):
+        reference = bfs(maze, [source])
+        assert matrix[i].tolist() == [reference.get(pos, -1) for pos in landmarks]
+
+
+def test_landmarks_outside_grid_and_on_walls_are_disconnected():
+    maze = random_maze(3)
+    cells = free_cells(maze)
+    wall = next((x, y) for y in range(maze.height) for x in range(maze.width) if maze.is_wall(x, y))
+    landmarks = [cells[0], (-1, 0), wall, (0, maze.height), cells[-1]]
+    matrix = landmark_matrix(maze, landmarks)
+    assert (matrix[1:4] == -1).all() and (matrix[:, 1:4] == -1).all()
+    assert matrix[0, 4] == bfs(maze, [cells[0]]).get(cells[-1], -1)
+    assert landmark_matrix(maze, []).shape == (0, 0)
+
+
+def test_wall_change_invalidates_distances():
+    maze = random_maze(0, density=0.0)
+    query = DistanceQuery(maze)
+    x, y = maze.start_pos
+    neighbor = maze.get_neighbors(x, y)[0]
+    assert query.distance(neighbor) == 1
+    maze.set_wall(*neighbor)
+    assert query.distance(neighbor) == -1
+    maze.remove_wall(*neighbor)
+    assert query.distance(neighbor) == 1
+    query.close()
+    maze.set_wall(*neighbor)
+    assert query._dist is not None
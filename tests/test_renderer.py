@@ -0,0 +1,74 @@
+"""Renderery: stan rysowany przyrostowo zgodny z pełnym przeliczeniem"""
+import os
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from headless import SOLVERS
+from helpers import random_maze
+from renderer import BaseRenderer, DirtyRectRenderer, SurfarrayRenderer
+
+CELL_SIZE = 4
+
+
+class Colors:
+    """Paleta jak w main.Colors (bez importu GUI)"""
+    BLACK = (0, 0, 0)
+    WHITE = (255, 255, 255)
+    GRAY = (128, 128, 128)
+    RED = (255, 0, 0)
+    GREEN = (0, 255, 0)
+    VISITED = (200, 200, 255)
+    PATH = (255, 200, 200)
+    TERRAIN_LIGHT = (235, 220, 170)
+    TERRAIN_DARK = (120, 80, 40)
+    HEAT_COLD = (210, 225, 255)
+    HEAT_HOT = (40, 0, 140)
+
+
+@pytest.fixture
+def screen():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    yield pygame.display.set_mode((31 * CELL_SIZE, 23 * CELL_SIZE))
+    pygame.display.quit()
+
+
+def full_state(screen, maze, solver):
+    reference = BaseRenderer(screen, maze, Colors, CELL_SIZE)
+    try:
+        return reference.compute_state(solver)
+    finally:
+        reference.close()
+
+
+@pytest.mark.parametrize("renderer_cls", [DirtyRectRenderer, SurfarrayRenderer])
+@pytest.mark.parametrize("algorithm", ["astar", "bidirectional", "jps", "lpastar", "random_walk", "dial"])
+def test_incremental_state_matches_full_redraw(screen, renderer_cls, algorithm: str):
+    maze = random_maze(3, density=0.2)
+    solver = SOLVERS[algorithm](maze)
+    renderer = renderer_cls(screen, maze, Colors, CELL_SIZE)
+    renderer.draw(solver)
+    assert solver.record_visits
+    running = True
+    while running:
+        for _ in range(5):
+            running = solver.step()
+            if not running:
+                break
+        renderer.draw(solver)
+        # Renderer opróżnia visit_log w każdej klatce
+        assert solver.visit_log == []
+        assert (renderer.state == full_state(screen, maze, solver)).all()
+    renderer.close()
+    assert not solver.record_visits
+
+
+@pytest.mark.parametrize("algorithm", ["bidirectional", "jps", "lpastar", "random_walk"])
+def test_solve_without_renderer_keeps_no_visit_log(algorithm: str):
+    maze = random_maze(3, density=0.2)
+    solver = SOLVERS[algorithm](maze)
+    solver.solve(100_000)
+    assert solver.visited
+    assert solver.visit_log == []
@@ -0,0 +1,171 @@
+"""Poprawność solverów: ścieżki porównywane z referencyjną Dijkstrą na losowych siatkach z ziarna"""
+import numpy as np
+import pytest
+
+from headless import SOLVERS
+from solver import distance_field
+from helpers import assert_valid_path, dijkstra, random_maze, walled_off_maze
+
+# Solvery zwracające najkrótszą ścieżkę
+OPTIMAL = ["astar", "astar_flat", "distance_field", "lpastar", "jps", "bidirectional", "dial"]
+# Solvery bez gwarancji najkrótszej ścieżki - sprawdzamy tylko jej poprawność
+NON_OPTIMAL = ["random_walk", "hpa", "monte_carlo"]
+# Solvery uwzględniające koszty terenu
+WEIGHTED = ["astar", "astar_flat", "dial"]
+SEEDS = range(6)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("algorithm", OPTIMAL)
+def test_optimal_on_unit_grid(algorithm: str, seed: int):
+    maze = random_maze(seed)
+    expected = dijkstra(maze)
+    result = SOLVERS[algorithm](maze).solve()
+    assert result.solved == (expected is not None)
+    if expected is not None:
+        assert_valid_path(maze, result.path)
+        assert result.cost == maze.path_cost(result.path) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("algorithm", WEIGHTED)
+def test_optimal_on_terrain(algorithm: str, seed: int):
+    maze = random_maze(seed, terrain=True)
+    expected = dijkstra(maze)
+    solver = SOLVERS[algorithm](maze)
+    result = solver.solve()
+    assert solver.weighted
+    assert result.solved == (expected is not None)
+    if expected is not None:
+        assert_valid_path(maze, result.path)
+        assert result.cost == maze.path_cost(result.path) == expected
+
+
+@pytest.mark.parametrize("algorithm", WEIGHTED)
+def test_heuristic_scaled_by_min_cost(algorithm: str):
+    # Bez zwykłych pól najtańszy krok kosztuje 2 - heurystyka przemnożona przez 2 nadal jest dopuszczalna
+    maze = random_maze(4, terrain=True)
+    grid = maze.grid
+    grid[grid == 0] = 2
+    maze.refresh()
+    assert maze.min_cost() == 2
+    result = SOLVERS[algorithm](maze).solve()
+    assert result.cost == dijkstra(maze)
+
+
+@pytest.mark.parametrize("storage", ["bool", "bits"])
+@pytest.mark.parametrize("algorithm", OPTIMAL)
+def test_optimal_on_compact_storage(algorithm: str, storage: str):
+    for seed in SEEDS:
+        maze = random_maze(seed, storage)
+        expected = dijkstra(maze)
+        result = SOLVERS[algorithm](maze).solve()
+        assert result.solved == (expected is not None)
+        if expected is not None:
+            assert result.cost == expected
+
+
+@pytest.mark.parametrize("algorithm", NON_OPTIMAL)
+def test_non_optimal_paths_are_valid(algorithm: str):
+    maze = random_maze(1, width=15, height=11, density=0.2)
+    expected = dijkstra(maze)
+    assert expected is not None
+    result = SOLVERS[algorithm](maze).solve(200_000)
+    assert result.solved
+    assert_valid_path(maze, result.path)
+    assert result.cost >= expected
+
+
+@pytest.mark.parametrize("algorithm", OPTIMAL + NON_OPTIMAL)
+def test_walled_off_goal(algorithm: str):
+    result = SOLVERS[algorithm](walled_off_maze()).solve(10_000)
+    assert not result.solved
+    assert result.path == []
+
+
+def test_solve_matches_stepping():
+    maze = random_maze(2)
+    stepped = SOLVERS["astar"](maze)
+    while stepped.step():
+        pass
+    result = SOLVERS["astar"](maze).solve()
+    assert result.path == stepped.path
+    assert result.cost == len(stepped.path) - 1
+
+
+def test_max_steps_stops_early():
+    maze = random_maze(0)
+    result = SOLVERS["astar"](maze).solve(3)
+    assert not result.solved
+    assert result.expanded <= 3
+
+
+def test_flat_astar_stepping_matches_solve():
+    maze = random_maze(3)
+    stepped = SOLVERS["astar_flat"](maze)
+    while stepped.step():
+        pass
+    result = SOLVERS["astar_flat"](maze).solve()
+    assert stepped.solved and result.solved
+    assert len(stepped.path) - 1 == result.cost == dijkstra(maze)
+
+
+def test_distance_field_matches_bfs_from_every_source():
+    maze = random_maze(5)
+    dist = distance_field(maze.neighbor_mask_array(), [maze.start_pos])
+    for end in [(x, y) for y in range(maze.height) for x in range(maze.width) if not maze.is_wall(x, y)][::7]:
+        if end == maze.start_pos:
+            continue
+        maze.set_end(*end)
+        expected = dijkstra(maze)
+        assert dist[end[1], end[0]] == (-1 if expected is None else expected)
+    assert (dist[np.asarray(maze.grid) == 1] == -1).all()
+
+
+def test_jps_expands_fewer_nodes_on_open_grid():
+    maze = random_maze(4, width=61, height=41, density=0.05)
+    maze.remove_wall(0, 0)
+    maze.remove_wall(60, 40)
+    maze.set_start(0, 0)
+    maze.set_end(60, 40)
+    astar = SOLVERS["astar"](maze).solve()
+    jps = SOLVERS["jps"](maze).solve()
+    assert astar.solved and jps.solved
+    assert jps.cost == astar.cost
+    assert jps.expanded * 3 < astar.expanded
+
+
+def test_jps_stepping_matches_solve():
+    maze = random_maze(2)
+    stepped = SOLVERS["jps"](maze)
+    while stepped.step():
+        pass
+    result = SOLVERS["jps"](maze).solve()
+    assert stepped.solved == result.solved
+    assert stepped.path == result.path
+
+
+def test_bidirectional_visits_both_frontiers():
+    maze = random_maze(1, width=61, height=41, density=0.1)
+    maze.remove_wall(0, 0)
+    maze.remove_wall(60, 40)
+    maze.set_start(0, 0)
+    maze.set_end(60, 40)
+    solver = SOLVERS["bidirectional"](maze)
+    result = solver.solve()
+    assert result.solved and result.cost == dijkstra(maze)
+    assert solver.visited_forward and solver.visited_backward
+    assert solver.visited_forward | solver.visited_backward <= set(solver.visited)
+    # Jednostronny BFS odwiedziłby wszystkie pola nie dalsze od celu
+    dist = distance_field(maze.neighbor_mask_array(), [maze.start_pos])
+    assert len(solver.visited) < ((dist >= 0) & (dist <= result.cost)).sum()
+
+
+def test_dial_stepping_matches_solve():
+    maze = random_maze(5, terrain=True)
+    stepped = SOLVERS["dial"](maze)
+    while stepped.step():
+        pass
+    result = SOLVERS["dial"](maze).solve()
+    assert stepped.solved == result.solved
+    assert maze.path_cost(stepped.path) == result.cost == dijkstra(maze)
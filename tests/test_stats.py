@@ -0,0 +1,78 @@
+"""StatsRecorder: liczniki kroków i kolejki zgodne z pracą solvera, także przy nieaktualnych wpisach"""
+import json
+
+import pytest
+
+import stats
+from headless import SOLVERS
+from helpers import dijkstra, random_maze
+from stats import StatsRecorder
+
+# Solvery, których limit kroków liczy każde pobranie z kolejki (także nieaktualnego wpisu)
+POP_BUDGET = ["astar_flat", "dial"]
+
+
+# random_walk losuje bez ziarna - jego wyniki nie powtarzają się
+@pytest.mark.parametrize("algorithm", sorted(set(SOLVERS) - {"random_walk"}))
+def test_recorder_matches_plain_solve(algorithm: str):
+    maze = random_maze(1, width=15, height=11, density=0.2)
+    plain = SOLVERS[algorithm](maze)
+    expected = plain.solve()
+    recorder = StatsRecorder(SOLVERS[algorithm](maze), algorithm)
+    result = recorder.solve()
+    assert result == expected
+    snapshot = recorder.snapshot()
+    assert snapshot.expanded == plain.expanded
+    assert snapshot.solved == expected.solved
+    assert snapshot.path_cost == expected.cost
+    assert snapshot.steps > 0
+
+
+@pytest.mark.parametrize("algorithm", POP_BUDGET)
+@pytest.mark.parametrize("seed", range(4))
+def test_stale_pops_do_not_end_run(monkeypatch, algorithm: str, seed: int):
+    # Paczki po jednym kroku: pobranie nieaktualnego wpisu nie rozwija węzła, ale solver pracuje dalej
+    monkeypatch.setattr(stats, "SAMPLE_STEPS", 1)
+    maze = random_maze(seed, terrain=True)
+    recorder = StatsRecorder(SOLVERS[algorithm](maze), algorithm)
+    result = recorder.solve()
+    expected = dijkstra(maze)
+    assert result.solved == (expected is not None)
+    if expected is not None:
+        assert result.cost == expected
+    snapshot = recorder.snapshot()
+    assert snapshot.steps == snapshot.expanded + snapshot.stale_pops
+    assert snapshot.peak_open_size >= snapshot.open_size
+
+
+def test_steps_count_used_budget():
+    maze = random_maze(2)
+    recorder = StatsRecorder(SOLVERS["astar"](maze), "astar")
+    result = recorder.solve(10)
+    assert not result.solved
+    assert recorder.steps == result.expanded == 10
+    recorder.solve()
+    assert recorder.snapshot().steps == recorder.solver.expanded
+
+
+def test_stepping_counts_calls_and_times():
+    maze = random_maze(3)
+    recorder = StatsRecorder(SOLVERS["astar"](maze), "astar")
+    calls = 1
+    while recorder.step():
+        calls += 1
+    snapshot = recorder.snapshot()
+    assert snapshot.steps == calls
+    assert 0 < snapshot.max_step_time <= snapshot.total_time
+    assert snapshot.mean_step_time == pytest.approx(snapshot.total_time / calls)
+
+
+def test_json_export():
+    maze = random_maze(0)
+    recorder = StatsRecorder(SOLVERS["dial"](maze), "dial")
+    recorder.solve()
+    data = json.loads(recorder.snapshot().to_json())
+    assert data["algorithm"] == "dial"
+    assert data["solved"] == recorder.solver.solved
+    assert data["memory_bytes"] > 0
+    assert "mean_step_time" in data
@@ -0,0 +1,85 @@
+"""Błądzenie Monte Carlo: powtarzalność z ziarna, czasy dojścia i mapa odwiedzin"""
+import numpy as np
+
+from helpers import assert_valid_path, random_maze
+from maze import Maze
+from walkers import MonteCarloWalkSolver, loop_erase
+from worker import take_snapshot
+
+
+def corridor(length: int) -> Maze:
+    """Korytarz 1 x length ze startem i celem na końcach"""
+    maze = Maze(length, 1)
+    maze.set_start(0, 0)
+    maze.set_end(length - 1, 0)
+    return maze
+
+
+def test_same_seed_repeats_run():
+    maze = random_maze(1, width=15, height=11, density=0.2)
+    first = MonteCarloWalkSolver(maze, walkers=200, seed=7)
+    second = MonteCarloWalkSolver(maze, walkers=200, seed=7)
+    first.solve()
+    second.solve()
+    assert first.solved
+    assert first.path == second.path
+    assert (first.hit_times == second.hit_times).all()
+    assert (first.heatmap() == second.heatmap()).all()
+
+    other = MonteCarloWalkSolver(maze, walkers=200, seed=8)
+    other.solve()
+    assert (other.hit_times != first.hit_times).any()
+
+
+def test_hitting_times_on_corridor():
+    # Z pola 0 do celu na polu 1 każdy wędrowiec dochodzi w pierwszym kroku
+    solver = MonteCarloWalkSolver(corridor(2), walkers=50)
+    solver.solve()
+    assert (solver.hit_times == 1).all()
+    assert solver.path == [(0, 0), (1, 0)]
+
+    # W korytarzu 1x5 czas dojścia jest parzysty i co najmniej 4
+    solver = MonteCarloWalkSolver(corridor(5), walkers=300, seed=3)
+    solver.solve()
+    times = solver.hit_times[solver.hit_times >= 0]
+    assert len(times) == 300
+    assert (times >= 4).all() and (times % 2 == 0).all()
+    summary = solver.hitting_time_summary()
+    assert summary["arrived"] == 300 and summary["min"] == times.min()
+    assert summary["mean"] == times.mean()
+
+
+def test_fastest_walk_and_heatmap():
+    maze = random_maze(2, width=15, height=11, density=0.2)
+    solver = MonteCarloWalkSolver(maze, walkers=100, seed=1)
+    solver.solve()
+    assert solver.solved
+    assert_valid_path(maze, solver.path)
+    assert solver.path == loop_erase(solver.fastest_walk)
+    assert len(solver.fastest_walk) - 1 == solver.hit_times[solver.hit_times >= 0].min()
+    # Każdy ruch każdego wędrowca (i pozycja startowa) to jedno wejście na pole
+    heat = solver.heatmap()
+    assert heat.sum() == solver.walkers + solver.expanded
+    assert set(solver.visited) == {(x, y) for y, x in zip(*np.nonzero(heat))}
+
+
+def test_no_arrivals_within_time_limit():
+    solver = MonteCarloWalkSolver(corridor(40), walkers=10, max_time=5)
+    result = solver.solve()
+    assert not result.solved and result.path == []
+    assert solver.hitting_time_summary()["min"] is None
+
+
+def test_snapshot_sees_positions_before_flush():
+    maze = random_maze(3, width=41, height=31, density=0.2)
+    solver = MonteCarloWalkSolver(maze, walkers=50, seed=2)
+    for _ in range(20):
+        solver.step()
+    # 21 paczek po 50 pozycji nie osiąga progu doliczania - migawka musi je doliczyć sama
+    assert solver._pending
+    snapshot = take_snapshot(solver, False)
+    assert not solver._pending
+    flags = np.frombuffer(snapshot.visited, dtype=np.uint8).reshape(maze.height, maze.width)
+    assert ((flags != 0) == (solver.heatmap() > 0)).all()
+    assert snapshot.visited_count == len(solver.visited) > 1
+    assert snapshot.visits.sum() == solver.walkers + solver.expanded
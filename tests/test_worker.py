@@ -0,0 +1,87 @@
+"""Rozwiązywanie w tle: migawki (pełne i delty) przepisywane do SolverView"""
+import time
+
+import pytest
+
+from headless import SOLVERS
+from helpers import random_maze
+from worker import ProcessSolverWorker, SolverView, ThreadSolverWorker, take_snapshot
+
+
+def large_maze():
+    """Labirynt z celem w przeciwnym rogu - przeszukiwanie trwa wiele publikacji migawek"""
+    maze = random_maze(1, width=151, height=121, density=0.2)
+    for x, y in ((0, 0), (150, 120)):
+        maze.remove_wall(x, y)
+    maze.set_start(0, 0)
+    maze.set_end(150, 120)
+    return maze
+
+
+def run_to_end(worker, timeout: float = 60.0) -> SolverView:
+    worker.start()
+    deadline = time.monotonic() + timeout
+    while not worker.finished:
+        assert time.monotonic() < deadline
+        worker.poll()
+        time.sleep(0.001)
+    return worker.view
+
+
+def test_snapshot_sends_only_new_cells():
+    maze = random_maze(0, density=0.1)
+    solver = SOLVERS["bidirectional"](maze)
+    solver.record_visits += 1
+    full = take_snapshot(solver, False)
+    assert not full.delta
+    published = len(solver.visited)
+    for _ in range(3):
+        solver.step()
+    snapshot = take_snapshot(solver, False, published)
+    assert snapshot.delta
+    assert set(snapshot.visited) == solver.visited - full.visited
+    assert solver.visit_log == []
+
+    view = SolverView(solver)
+    view.apply(full)
+    view.apply(snapshot)
+    assert view.visited == solver.visited
+
+
+def test_snapshot_falls_back_to_full_set_for_unlogged_visits():
+    maze = random_maze(0, density=0.1)
+    solver = SOLVERS["bidirectional"](maze)
+    solver.record_visits += 1
+    solver.step()
+    solver.visited.add(maze.end_pos)
+    snapshot = take_snapshot(solver, False, 0)
+    assert not snapshot.delta and snapshot.visited == frozenset(solver.visited)
+
+
+@pytest.mark.parametrize("algorithm", ["bidirectional", "lpastar", "jps", "astar_flat"])
+def test_thread_worker_view_matches_solver(algorithm: str):
+    maze = large_maze()
+    solver = SOLVERS[algorithm](maze)
+    worker = ThreadSolverWorker(solver, publish_interval=0.0)
+    applied = []
+    apply = worker.view.apply
+    worker.view.apply = lambda snapshot: applied.append(snapshot.delta) or apply(snapshot)
+    view = run_to_end(worker)
+    if algorithm != "astar_flat":
+        assert any(applied)
+    assert view.solved == solver.solved
+    assert view.path == solver.path
+    assert set(view.visited) == set(solver.visited)
+    # Po zakończeniu wątek nie jest już odbiorcą visit_log
+    assert solver.record_visits == 0 and solver.visit_log == []
+
+
+def test_process_worker_applies_every_snapshot():
+    maze = large_maze()
+    solver = SOLVERS["bidirectional"](maze)
+    view = run_to_end(ProcessSolverWorker(solver, publish_interval=0.0))
+    reference = SOLVERS["bidirectional"](maze)
+    reference.solve()
+    assert view.solved == reference.solved
+    assert view.path == reference.path
+    assert set(view.visited) == reference.visited